@@ -63,7 +63,6 @@ check_and_install() {
 }
 
 check_and_install python3 python3
-check_and_install unzip unzip
 
 # ==========================================
 # 3. Python 환경 설정
@@ -167,36 +166,7 @@ if [ -n "$GAME_EXE" ] && [ -f "$GAME_EXE" ]; then
         echo "   ✓ 원본 바이너리 백업됨"
     fi
 
-    GAME_EXE="$GAME_EXE" "$PYTHON_BIN" << 'PATCHPY'
-import os
-
-exe_path = os.environ.get('GAME_EXE')
-
-with open(exe_path, 'rb') as f:
-    data = bytearray(f.read())
-
-count = 0
-
-# x86_64 패턴: BA 00 02 00 00 41 B8 00 02 00 00 (mov edx, 0x200; mov r8d, 0x200)
-pattern_x86 = bytes([0xBA, 0x00, 0x02, 0x00, 0x00, 0x41, 0xB8, 0x00, 0x02, 0x00, 0x00])
-replacement_x86 = bytes([0xBA, 0x00, 0x20, 0x00, 0x00, 0x41, 0xB8, 0x00, 0x20, 0x00, 0x00])
-pos = 0
-while True:
-    pos = data.find(pattern_x86, pos)
-    if pos == -1:
-        break
-    data[pos:pos+11] = replacement_x86
-    count += 1
-    pos += 11
-
-with open(exe_path, 'wb') as f:
-    f.write(data)
-
-if count > 0:
-    print(f"   ✓ {count}개 패턴 패치 완료 (512 -> 8192)")
-else:
-    print("   ⚠️ 패치할 패턴을 찾지 못했습니다")
-PATCHPY
+    "$PYTHON_BIN" "$SCRIPT_DIR/scripts/binary_patch.py" "$GAME_EXE"
     echo "   ✓ 바이너리 패치 완료"
 else
     echo "   ⚠️ HytaleClient 실행 파일을 찾을 수 없어 바이너리 패치를 건너뜁니다."
@@ -227,58 +197,18 @@ if [ -d "$LANG_DIR" ] && [ ! -d "${LANG_DIR}_backup" ]; then
     cp -r "$LANG_DIR" "${LANG_DIR}_backup"
 fi
 
-TEMP_WORK="$SCRIPT_DIR/temp_work"
-rm -rf "$TEMP_WORK"
-mkdir -p "$TEMP_WORK"
-
-if [ -f "$ASSETS_ZIP" ]; then
-    unzip -q "$ASSETS_ZIP" "Server/Languages/en-US/*" "Common/Languages/en-US/*" -d "$TEMP_WORK" 2>/dev/null || true
-fi
-
-CLIENT_EN_DIR="$GAME_DIR/Language/en-US"
-if [ -d "$CLIENT_EN_DIR" ]; then
-    mkdir -p "$TEMP_WORK/Client"
-    cp "$CLIENT_EN_DIR/"*.lang "$TEMP_WORK/Client/" 2>/dev/null || true
-fi
-
 mkdir -p "$LANG_DIR/avatarCustomization"
 
-# Client 병합
-mkdir -p "$TEMP_WORK/Client"
-if [ ! -f "$TEMP_WORK/Client/client.lang" ]; then touch "$TEMP_WORK/Client/client.lang"; fi
+# Client, Server, Avatar 병합 (한 프로세스에서 처리, Assets.zip은 풀지 않고 메모리로 읽음)
 "$PYTHON_BIN" "$SCRIPT_DIR/scripts/merge_lang.py" \
-    "$TEMP_WORK/Client/client.lang" \
-    "$SCRIPT_DIR/Language/ko-KR/client.lang" \
-    "$LANG_DIR/client.lang"
-
-cp "$SCRIPT_DIR/Language/ko-KR/meta.lang" "$LANG_DIR/"
-
-# Server 병합
-SERVER_BASE="$TEMP_WORK/Server/Languages/en-US"
-[ ! -d "$SERVER_BASE" ] && mkdir -p "$SERVER_BASE"
-for file in server.lang wordlists.lang; do
-    if [ -f "$SERVER_BASE/$file" ]; then
-        "$PYTHON_BIN" "$SCRIPT_DIR/scripts/merge_lang.py" \
-            "$SERVER_BASE/$file" \
-            "$SCRIPT_DIR/Assets/Server/Languages/ko-KR/$file" \
-            "$LANG_DIR/$file"
-    fi
-done
+    --pair "$GAME_DIR/Language/en-US/client.lang" "$SCRIPT_DIR/Language/ko-KR/client.lang" "$LANG_DIR/client.lang" \
+    --zip-dir "$ASSETS_ZIP" "Server/Languages/en-US/" "$SCRIPT_DIR/Assets/Server/Languages/ko-KR" "$LANG_DIR" \
+    --zip-dir "$ASSETS_ZIP" "Common/Languages/en-US/avatarCustomization/" \
+          "$SCRIPT_DIR/Assets/Common/Languages/ko-KR/avatarCustomization" \
+          "$LANG_DIR/avatarCustomization"
 
-# Avatar 병합
-AVATAR_BASE="$TEMP_WORK/Common/Languages/en-US/avatarCustomization"
-AVATAR_PATCH="$SCRIPT_DIR/Assets/Common/Languages/ko-KR/avatarCustomization"
-if [ -d "$AVATAR_BASE" ] && [ -d "$AVATAR_PATCH" ]; then
-    for file in "$AVATAR_BASE"/*.lang; do
-        filename=$(basename "$file")
-        if [ -f "$AVATAR_PATCH/$filename" ]; then
-            "$PYTHON_BIN" "$SCRIPT_DIR/scripts/merge_lang.py" \
-                "$file" "$AVATAR_PATCH/$filename" "$LANG_DIR/avatarCustomization/$filename"
-        fi
-    done
-fi
+cmp -s "$SCRIPT_DIR/Language/ko-KR/meta.lang" "$LANG_DIR/meta.lang" || cp "$SCRIPT_DIR/Language/ko-KR/meta.lang" "$LANG_DIR/"
 
-rm -rf "$TEMP_WORK"
 echo "   ✓ 언어 파일 설치 완료"
 
 # ==========================================
@@ -0,0 +1,98 @@
+"""
+번역 요청 배치 플래너.
+
+문자열별 토큰 수를 추정해 요청 하나가 토큰 예산(token budget)에 가깝도록
+문자열을 묶습니다. 여러 줄 값의 이어지는 줄("cont")은 항상 키 줄과 같은
+배치에 들어갑니다.
+"""
+import math
+
+# 줄마다 붙는 "[index] " 접두사와 줄바꿈에 해당하는 대략적인 토큰 수
+LINE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text):
+    """
+    토크나이저 없이 쓰는 간단한 추정치.
+    ASCII는 4글자당 1토큰, 한글 등 비ASCII 문자는 글자당 1토큰으로 계산합니다.
+    """
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    other_count = len(text) - ascii_count
+    return math.ceil(ascii_count / 4) + other_count + LINE_OVERHEAD_TOKENS
+
+
+def group_items(to_translate, updates):
+    """
+    같은 키에 속한 줄(key + cont)을 하나의 그룹으로 묶어 순서대로 반환합니다.
+    """
+    groups = []
+    index = {}
+    for idx, text in to_translate.items():
+        meta = updates.get(idx, {})
+        parent = meta.get("parent", idx) if meta.get("type") == "cont" else idx
+        if parent not in index:
+            index[parent] = len(groups)
+            groups.append({})
+        groups[index[parent]][idx] = text
+    return groups
+
+
+class BatchPlan:
+    def __init__(self, batches, tokens, prefix_bytes, cached_prefix, token_budget=0, max_items=0):
+        self.batches = batches
+        self.tokens = tokens
+        self.prefix_bytes = prefix_bytes
+        self.cached_prefix = cached_prefix
+        self.token_budget = token_budget
+        self.max_items = max_items
+
+    @property
+    def prefix_bytes_saved(self):
+        """캐시된 컨텍스트를 쓰면 요청마다 접두사를 다시 보내지 않아도 됩니다."""
+        if not self.cached_prefix:
+            return 0
+        return self.prefix_bytes * len(self.batches)
+
+    def report(self):
+        total = sum(self.tokens)
+        lines = [
+            f"Batch plan: {len(self.batches)} batches, ~{total} tokens "
+            f"(min {min(self.tokens, default=0)}, max {max(self.tokens, default=0)})",
+        ]
+        for number, (batch, tokens) in enumerate(zip(self.batches, self.tokens), 1):
+            lines.append(f"   #{number}: {len(batch)} strings, ~{tokens} tokens")
+        if self.cached_prefix:
+            lines.append(f"   prefix: {self.prefix_bytes} bytes via cached context, "
+                         f"{self.prefix_bytes_saved} bytes saved")
+        else:
+            lines.append(f"   prefix: {self.prefix_bytes} bytes resent with every request")
+        return "\n".join(lines)
+
+
+def plan_batches(to_translate, updates, token_budget, max_items=0, prefix="", cached_prefix=False):
+    """
+    문자열들을 token_budget에 가깝게 채운 배치 목록으로 나눕니다.
+    그룹 하나가 예산보다 크더라도 나누지 않고 단독 배치로 보냅니다.
+    """
+    batches = []
+    tokens = []
+    current = {}
+    current_tokens = 0
+
+    for group in group_items(to_translate, updates):
+        group_tokens = sum(estimate_tokens(text) for text in group.values())
+        over_budget = token_budget > 0 and current_tokens + group_tokens > token_budget
+        over_count = max_items > 0 and len(current) + len(group) > max_items
+        if current and (over_budget or over_count):
+            batches.append(current)
+            tokens.append(current_tokens)
+            current = {}
+            current_tokens = 0
+        current.update(group)
+        current_tokens += group_tokens
+
+    if current:
+        batches.append(current)
+        tokens.append(current_tokens)
+
+    return BatchPlan(batches, tokens, len(prefix.encode('utf-8')), cached_prefix, token_budget, max_items)
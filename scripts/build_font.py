@@ -2,6 +2,10 @@
 """
 한글 폰트 빌드 스크립트
 baseline 조정으로 글자 위치 조절 가능
+
+--subset: 전체 음절 대신 lang 파일에 쓰인 글자 + KS X 1001 완성형만 넣고
+          들어가는 가장 작은 아틀라스로 빌드 (charset_subset.py)
+--incremental: 글리프 타일 캐시(glyph_cache.py)에 없는 글자만 렌더링하고 아틀라스는 캐시로 조립
 """
 import os
 import sys
@@ -12,6 +16,11 @@ import zipfile
 import urllib.request
 from pathlib import Path
 
+import charset_subset
+import font_json
+import glyph_cache
+import glyph_converter
+
 SCRIPT_DIR = Path(__file__).resolve().parent.parent
 FONT_NAME = "Pretendard"
 FONT_URL = "https://github.com/orioncactus/pretendard/releases/download/v1.3.9/Pretendard-1.3.9.zip"
@@ -19,6 +28,7 @@ FONT_DIR = SCRIPT_DIR / "reference"
 FONT_TTF = FONT_DIR / "public/static/alternative/Pretendard-Medium.ttf"
 CHARSET_FILE = SCRIPT_DIR / "src/charset/charset_full.txt"
 OUTPUT_DIR = SCRIPT_DIR / "Fonts"
+ATLAS_SIZE = 8192
 
 # 조절 파라미터
 BASELINE_OFFSET = 0.0  # 일단 0으로 (아티팩트 방지)
@@ -59,27 +69,63 @@ def generate_charset():
         f.write(''.join(chars))
     print(f"✓ {len(chars)}자 생성")
 
-def build_msdf():
-    print("🏗️  MSDF 아틀라스 생성 중 (8192x8192)...")
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    
-    cmd = [
+def generate_subset_charset():
+    print("📝 사용 글자 기준 글자셋 생성 중...")
+    chars, size = charset_subset.subset(output=charset_subset.SUBSET_FILE, padding=TEXTURE_PADDING)
+    if not size:
+        print(f"❌ {len(chars)}자가 {ATLAS_SIZE}x{ATLAS_SIZE} 아틀라스에 들어가지 않습니다")
+        sys.exit(1)
+    return Path(charset_subset.SUBSET_FILE), size
+
+def msdf_command(charset_file, atlas_size, output_name):
+    return [
         "npx", "msdf-bmfont-xml",
         "-f", "json",
-        "-m", "8192,8192",
+        "-m", f"{atlas_size},{atlas_size}",
         "-s", "48",
         "-r", "8",
         "-t", "msdf",
         "-p", str(TEXTURE_PADDING),
         "--pot", "--square",
-        "-i", str(CHARSET_FILE),
-        "-o", FONT_NAME,
+        "-i", str(charset_file),
+        "-o", output_name,
         str(FONT_TTF)
     ]
+
+def build_msdf(charset_file=CHARSET_FILE, atlas_size=ATLAS_SIZE):
+    print(f"🏗️  MSDF 아틀라스 생성 중 ({atlas_size}x{atlas_size})...")
+    OUTPUT_DIR.mkdir(exist_ok=True)
     
-    subprocess.run(cmd, check=True, cwd=SCRIPT_DIR)
+    subprocess.run(msdf_command(charset_file, atlas_size, FONT_NAME), check=True, cwd=SCRIPT_DIR)
     print("✓ MSDF 생성 완료")
 
+def render_tiles(chars, work_dir):
+    """glyph_cache용: chars만 msdf-bmfont-xml로 렌더링해 Hytale 포맷과 페이지 PNG를 반환"""
+    work_dir = Path(work_dir)
+    charset_file = work_dir / "charset.txt"
+    charset_file.write_text(''.join(chars), encoding='utf-8')
+    subprocess.run(msdf_command(charset_file, ATLAS_SIZE, "tiles"), check=True, cwd=work_dir)
+    
+    with open(work_dir / "tiles.json", 'r', encoding='utf-8') as f:
+        bmfont = json.load(f)
+    pages = [str(work_dir / page) for page in bmfont.get('pages', [])]
+    return {
+        "font": glyph_converter.bmfont_to_hytale(bmfont, BASELINE_OFFSET),
+        "pages": pages or [str(next(work_dir.glob("tiles*.png")))],
+        "glyph_pages": {ch['id']: ch.get('page', 0) for ch in bmfont.get('chars', [])},
+    }
+
+def build_incremental(charset_file, atlas_size):
+    print("🏗️  MSDF 아틀라스 증분 빌드 중...")
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    params = {"generator": "msdf-bmfont-xml", "size": 48, "pxrange": 8, "type": "msdf",
+              "padding": TEXTURE_PADDING, "baseline_offset": BASELINE_OFFSET}
+    size = glyph_cache.build(FONT_TTF, charset_subset.read_charset(charset_file), params, render_tiles,
+                             OUTPUT_DIR / f"{FONT_NAME}.json", OUTPUT_DIR / f"{FONT_NAME}.png", atlas_size,
+                             padding=TEXTURE_PADDING)
+    if not size:
+        sys.exit(1)
+
 def convert_to_hytale():
     print(f"🔄 Hytale 포맷 변환 (baseline offset: {BASELINE_OFFSET})...")
     
@@ -105,73 +151,16 @@ def convert_to_hytale():
     with open(bmfont_json, 'r', encoding='utf-8') as f:
         bmfont = json.load(f)
     
-    info = bmfont.get('info', {})
-    common = bmfont.get('common', {})
-    df = bmfont.get('distanceField', {})
-    chars = bmfont.get('chars', [])
-    
-    size = info.get('size', 48)
-    tex_w = common.get('scaleW', 8192)
-    tex_h = common.get('scaleH', 8192)
-    base = common.get('base', size)
-    
-    hytale = {
-        "atlas": {
-            "type": df.get('fieldType', 'msdf'),
-            "distanceRange": df.get('distanceRange', 8),
-            "distanceRangeMiddle": 0,
-            "size": size,
-            "width": tex_w,
-            "height": tex_h,
-            "yOrigin": "top"
-        },
-        "metrics": {
-            "emSize": 1,
-            "lineHeight": 1.364,
-            "ascender": -1.011,
-            "descender": 0.353,
-            "underlineY": 0.101,
-            "underlineThickness": 0.037
-        },
-        "glyphs": [],
-        "kerning": []
-    }
+    # Hytale 폰트는 아틀라스 한 장만 쓰므로 페이지가 넘치면 글리프가 깨짐
+    pages = bmfont.get('pages', [])
+    if len(pages) > 1:
+        print(f"❌ 글리프가 아틀라스 {len(pages)}장으로 나뉘었습니다. 아틀라스 크기를 늘려 주세요.")
+        sys.exit(1)
+    
+    hytale = glyph_converter.bmfont_to_hytale(bmfont, BASELINE_OFFSET)
     
-    for ch in chars:
-        char_id = ch['id']
-        w = ch['width']
-        h = ch['height']
-        x = ch['x']
-        y = ch['y']
-        xoff = ch['xoffset']
-        yoff = ch['yoffset']
-        xadv = ch['xadvance']
-        
-        advance = xadv / size
-        left = xoff / size
-        # BASELINE_OFFSET 적용: 양수면 위로
-        top = -(base - yoff) / size - BASELINE_OFFSET
-        right = (xoff + w) / size
-        bottom = -(base - yoff - h) / size - BASELINE_OFFSET
-        
-        glyph = {
-            "unicode": char_id,
-            "advance": advance,
-            "planeBounds": {"left": left, "top": top, "right": right, "bottom": bottom},
-            "atlasBounds": {"left": x + 0.5, "top": y + 0.5, "right": x + w - 0.5, "bottom": y + h - 0.5}
-        }
-        hytale["glyphs"].append(glyph)
-    
-    for kern in bmfont.get('kernings', []):
-        hytale["kerning"].append({
-            "unicode1": kern['first'],
-            "unicode2": kern['second'],
-            "advance": kern['amount'] / size
-        })
-    
-    # 저장
-    with open(OUTPUT_DIR / f"{FONT_NAME}.json", 'w', encoding='utf-8') as f:
-        json.dump(hytale, f, separators=(',', ': '))
+    # 저장 (소수 자릿수를 줄인 압축 형식)
+    font_json.write(hytale, OUTPUT_DIR / f"{FONT_NAME}.json")
     
     shutil.move(str(bmfont_png), str(OUTPUT_DIR / f"{FONT_NAME}.png"))
     bmfont_json.unlink()
@@ -187,9 +176,18 @@ def convert_to_hytale():
 def main():
     print(f"=== 폰트 빌드 (baseline offset: {BASELINE_OFFSET}) ===\n")
     download_font()
-    generate_charset()
-    build_msdf()
-    convert_to_hytale()
+    subset = "--subset" in sys.argv[1:]
+    if subset:
+        charset_file, atlas_size = generate_subset_charset()
+    else:
+        generate_charset()
+        charset_file, atlas_size = CHARSET_FILE, ATLAS_SIZE
+    if "--incremental" in sys.argv[1:]:
+        # --subset이면 조립할 때 들어가는 가장 작은 크기를 다시 고름
+        build_incremental(charset_file, None if subset else atlas_size)
+    else:
+        build_msdf(charset_file, atlas_size)
+        convert_to_hytale()
     print("\n✨ 빌드 완료!")
     print(f"   {OUTPUT_DIR / FONT_NAME}.json")
     print(f"   {OUTPUT_DIR / FONT_NAME}.png")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+실제로 쓰이는 글자만 담은 글자셋을 만들고, 그 글자셋이 들어가는 가장 작은 아틀라스 크기를 고릅니다.
+
+전체 한글 음절(11,172자)을 넣으면 8192x8192 아틀라스가 필요하지만,
+배포하는 lang 파일(ko-KR/en-US)의 값에 나오는 글자 + 안전 여유분(KS X 1001 완성형 2,350자)
++ 기본 글자(ASCII, 기호, 자모)만 넣으면 훨씬 작은 아틀라스로 충분합니다.
+
+글리프 타일 크기는 현재 폰트 JSON(Fonts/WantedSans.json)의 atlasBounds로 추정하고,
+생성기가 쓰는 글리프 간격(--padding)을 두고 선반(shelf) 방식으로 채워 보아
+들어가는 가장 작은 정사각 2의 거듭제곱 크기를 선택합니다.
+
+사용법:
+  python3 scripts/charset_subset.py [--margin ksx1001|none] [--output 파일] [--hex] [--padding 4]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+import lang_file
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_JSON = os.path.join(PROJECT_DIR, "Fonts", "WantedSans.json")
+FONT_PNG = os.path.join(PROJECT_DIR, "Fonts", "WantedSans.png")
+SUBSET_FILE = os.path.join(PROJECT_DIR, "src", "charset", "charset_subset.txt")
+LANG_GLOBS = (
+    "Language/*/*.lang",
+    "Assets/**/Languages/*/**/*.lang",
+)
+ATLAS_SIZES = (512, 1024, 2048, 4096, 8192)
+# RGBA8 텍스처 기준
+BYTES_PER_PIXEL = 4
+
+# 항상 넣는 글자 (generate_charset과 같은 기본 집합)
+BASE_CHARS = (
+    [chr(i) for i in range(0x20, 0x7F)]
+    + list("°–—''\"\"•…€£¥©®™±×÷←→↑↓")
+    + [chr(i) for i in range(0x3131, 0x3164)]
+)
+
+
+def lang_paths(root=PROJECT_DIR):
+    paths = set()
+    for pattern in LANG_GLOBS:
+        paths.update(glob.glob(os.path.join(root, pattern), recursive=True))
+    return sorted(paths)
+
+
+def used_chars(paths):
+    """lang 파일 값(키 제외)에 나오는 글자 집합"""
+    chars = set()
+    for path in paths:
+        for value in lang_file.LangFile.load(path).values().values():
+            chars.update(value)
+    chars.discard("\n")
+    return chars
+
+
+def ksx1001_syllables():
+    """KS X 1001 완성형(euc-kr로 표현 가능한) 한글 음절 2,350자"""
+    result = []
+    for code in range(0xAC00, 0xD7A4):
+        # 완성형에 없는 음절은 euc-kr 코덱이 8바이트 조합형 시퀀스로 인코딩하므로 길이로 구분
+        if len(chr(code).encode('euc-kr')) == 2:
+            result.append(chr(code))
+    return result
+
+
+def build_charset(paths, margin="ksx1001"):
+    chars = set(BASE_CHARS) | used_chars(paths)
+    if margin == "ksx1001":
+        chars.update(ksx1001_syllables())
+    # 제어 문자는 글리프가 없으므로 제외
+    return sorted(c for c in chars if ord(c) >= 0x20)
+
+
+def glyph_tiles(font_json=FONT_JSON):
+    """
+    ({코드포인트: (폭, 높이)}, 현재 아틀라스 폭)을 반환합니다.
+    타일 크기는 현재 아틀라스의 atlasBounds 기준입니다.
+    """
+    if not os.path.exists(font_json):
+        return {}, ATLAS_SIZES[-1]
+    with open(font_json, 'r', encoding='utf-8') as f:
+        font = json.load(f)
+    tiles = {}
+    for glyph in font.get("glyphs", []):
+        bounds = glyph.get("atlasBounds")
+        if bounds:
+            tiles[glyph["unicode"]] = (int(round(bounds["right"] - bounds["left"] + 1)),
+                                       int(round(bounds["bottom"] - bounds["top"] + 1)))
+    return tiles, font.get("atlas", {}).get("width", ATLAS_SIZES[-1])
+
+
+def shelf_pack(tiles, size, padding=1):
+    """
+    (폭, 높이) 타일들을 높이 순으로 선반에 채워 size x size 안의 위치 [(x, y)]를 입력 순서대로 반환합니다.
+    들어가지 않으면 None입니다.
+    """
+    positions = [None] * len(tiles)
+    x = y = shelf = 0
+    for i in sorted(range(len(tiles)), key=lambda i: (-tiles[i][1], -tiles[i][0])):
+        w, h = tiles[i][0] + padding, tiles[i][1] + padding
+        if w > size:
+            return None
+        if x + w > size:
+            x, y, shelf = 0, y + shelf, 0
+        if y + h > size:
+            return None
+        positions[i] = (x, y)
+        x += w
+        shelf = max(shelf, h)
+    return positions
+
+
+def shelf_fits(tiles, size, padding=1):
+    """타일들이 size x size 안에 들어가는지 확인합니다 (보수적 추정)."""
+    return shelf_pack(tiles, size, padding) is not None
+
+
+def plan(chars, tiles, padding=1):
+    """글리프 사이를 padding 픽셀씩 띄웠을 때 글자셋이 들어가는 가장 작은 아틀라스 크기 (없으면 None)"""
+    known = [tiles[ord(c)] for c in chars if ord(c) in tiles]
+    # 현재 폰트 JSON에 없는 글자는 한글 음절 평균 크기로 가정
+    hangul = [tiles[code] for code in range(0xAC00, 0xD7A4) if code in tiles] or [(48, 48)]
+    average = (sum(w for w, _ in hangul) // len(hangul), sum(h for _, h in hangul) // len(hangul))
+    sized = known + [average] * (len(chars) - len(known))
+    for size in ATLAS_SIZES:
+        if shelf_fits(sized, size, padding):
+            return size
+    return None
+
+
+def read_charset(path):
+    """write_charset 형식(평문 또는 0xXXXX 목록) 글자셋 파일을 중복 없이 순서대로 읽습니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.startswith('0x'):
+        chars = [chr(int(code, 16)) for code in text.split()]
+    else:
+        chars = [c for c in text if c != '\n']
+    return list(dict.fromkeys(chars))
+
+
+def write_charset(chars, path=SUBSET_FILE, hex_codes=False):
+    """build_font용 평문 또는 msdf-atlas-gen용 16진수(--hex) 글자셋 파일을 씁니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        if hex_codes:
+            f.write(" ".join(f"0x{ord(c):X}" for c in chars))
+        else:
+            f.write(''.join(chars))
+
+
+def report(chars, size, tiles, full_size=8192):
+    full_vram = full_size * full_size * BYTES_PER_PIXEL
+    vram = size * size * BYTES_PER_PIXEL
+    print(f"   글자 수: {len(chars)}자 (현재 폰트 {len(tiles)}자)")
+    print(f"   아틀라스: {size}x{size} (현재 {full_size}x{full_size})")
+    print(f"   VRAM: {vram / 2**20:.0f} MB (현재 {full_vram / 2**20:.0f} MB, "
+          f"{(full_vram - vram) / 2**20:.0f} MB 절약)")
+    if os.path.exists(FONT_PNG):
+        # PNG 크기는 빈 영역보다 글리프 수에 비례한다고 보고 추정
+        png_size = os.path.getsize(FONT_PNG)
+        estimate = png_size * len(chars) / max(len(tiles), 1)
+        print(f"   PNG: 약 {estimate / 2**20:.1f} MB (현재 {png_size / 2**20:.1f} MB, "
+              f"약 {(png_size - estimate) / 2**20:.1f} MB 절약)")
+
+
+def subset(margin="ksx1001", output=SUBSET_FILE, hex_codes=False, font_json=FONT_JSON, padding=1):
+    """
+    글자셋을 만들어 output에 쓰고 (글자 목록, 아틀라스 크기)를 반환합니다.
+    padding은 아틀라스 생성기의 글리프 간격(픽셀)입니다. 들어가는 크기가 없으면 크기는 None입니다.
+    """
+    chars = build_charset(lang_paths(), margin)
+    tiles, full_size = glyph_tiles(font_json)
+    size = plan(chars, tiles, padding)
+    write_charset(chars, output, hex_codes)
+    if size:
+        report(chars, size, tiles, full_size)
+    return chars, size
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Build a usage-driven font charset and pick the atlas size")
+    parser.add_argument("--margin", choices=("ksx1001", "none"), default="ksx1001",
+                        help="extra syllables to include besides the ones used in lang files")
+    parser.add_argument("--output", default=SUBSET_FILE)
+    parser.add_argument("--hex", action="store_true", help="write 0xXXXX codes (msdf-atlas-gen)")
+    parser.add_argument("--padding", type=int, default=1, help="pixels between glyphs used by the atlas generator")
+    args = parser.parse_args(argv)
+
+    chars, size = subset(args.margin, args.output, args.hex, padding=args.padding)
+    if not size:
+        print(f"❌ {len(chars)}자가 {ATLAS_SIZES[-1]}x{ATLAS_SIZES[-1]} 아틀라스에 들어가지 않습니다")
+        return 1
+    print(f"   ✓ 글자셋 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+PE / ELF / Mach-O (fat 포함) 헤더를 읽어 실행 코드 영역의 파일 위치를 찾습니다.
+
+바이너리 패치가 리소스나 데이터 영역까지 훑지 않도록 스캔 범위를 코드 섹션으로 좁히고,
+찾은 파일 오프셋을 가상 주소로 바꿔 보여주는 데 씁니다.
+(patcher/macos/src/fontpatch.c가 load command에서 __TEXT를 찾는 것과 같은 역할)
+
+사용법:
+  python3 scripts/executable_sections.py <바이너리>
+"""
+import struct
+import sys
+
+# PE
+IMAGE_SCN_CNT_CODE = 0x00000020
+IMAGE_SCN_MEM_EXECUTE = 0x20000000
+PE_MACHINES = {0x8664: "x86_64", 0xAA64: "arm64", 0x14C: "x86"}
+
+# ELF
+SHT_NOBITS = 8
+SHF_EXECINSTR = 0x4
+PT_LOAD = 1
+PF_X = 0x1
+ELF_MACHINES = {62: "x86_64", 183: "arm64", 3: "x86"}
+
+# Mach-O
+MH_MAGIC = 0xFEEDFACE
+MH_MAGIC_64 = 0xFEEDFACF
+FAT_MAGIC = 0xCAFEBABE
+FAT_MAGIC_64 = 0xCAFEBABF
+LC_SEGMENT = 0x1
+LC_SEGMENT_64 = 0x19
+VM_PROT_EXECUTE = 0x4
+S_ATTR_PURE_INSTRUCTIONS = 0x80000000
+S_ATTR_SOME_INSTRUCTIONS = 0x00000400
+MACHO_CPUS = {0x01000007: "x86_64", 0x0100000C: "arm64", 0x7: "x86"}
+
+
+class FormatError(ValueError):
+    pass
+
+
+class Region:
+    """파일 안의 실행 코드 영역 [offset, offset + size)와 그 시작 가상 주소"""
+    __slots__ = ("name", "offset", "size", "vaddr", "arch")
+
+    def __init__(self, name, offset, size, vaddr, arch):
+        self.name = name
+        self.offset = offset
+        self.size = size
+        self.vaddr = vaddr
+        self.arch = arch
+
+    @property
+    def end(self):
+        return self.offset + self.size
+
+    def contains(self, offset):
+        return self.offset <= offset < self.end
+
+    def to_vaddr(self, offset):
+        return self.vaddr + (offset - self.offset)
+
+    def __repr__(self):
+        return (f"Region({self.name!r}, offset=0x{self.offset:x}, size=0x{self.size:x}, "
+                f"vaddr=0x{self.vaddr:x}, arch={self.arch})")
+
+
+def _unpack(buf, fmt, offset):
+    size = struct.calcsize(fmt)
+    if offset < 0 or offset + size > len(buf):
+        raise FormatError(f"header out of range at 0x{offset:x}")
+    return struct.unpack_from(fmt, buf, offset)
+
+
+def _cstr(raw):
+    return raw.split(b'\0', 1)[0].decode('ascii', 'replace')
+
+
+def _clip(buf, regions):
+    """파일 크기를 넘거나 비어 있는 영역을 정리합니다."""
+    result = []
+    for region in regions:
+        size = min(region.size, len(buf) - region.offset)
+        if region.offset < len(buf) and size > 0:
+            region.size = size
+            result.append(region)
+    return result
+
+
+def pe_regions(buf):
+    (pe_offset,) = _unpack(buf, "<I", 0x3C)
+    if _unpack(buf, "4s", pe_offset)[0] != b"PE\0\0":
+        raise FormatError("missing PE signature")
+    machine, nsections, _, _, _, opt_size, _ = _unpack(buf, "<HHIIIHH", pe_offset + 4)
+    opt_offset = pe_offset + 24
+    (magic,) = _unpack(buf, "<H", opt_offset)
+    if magic == 0x20B:
+        (image_base,) = _unpack(buf, "<Q", opt_offset + 24)
+    elif magic == 0x10B:
+        (image_base,) = _unpack(buf, "<I", opt_offset + 28)
+    else:
+        raise FormatError(f"unknown PE optional header magic 0x{magic:x}")
+
+    arch = PE_MACHINES.get(machine, f"pe-0x{machine:x}")
+    regions = []
+    table = opt_offset + opt_size
+    for i in range(nsections):
+        name, vsize, vaddr, raw_size, raw_offset, _, _, _, _, flags = _unpack(
+            buf, "<8sIIIIIIHHI", table + i * 40)
+        if not flags & (IMAGE_SCN_MEM_EXECUTE | IMAGE_SCN_CNT_CODE) or not raw_size:
+            continue
+        size = min(vsize, raw_size) if vsize else raw_size
+        regions.append(Region(_cstr(name), raw_offset, size, image_base + vaddr, arch))
+    return regions
+
+
+def elf_regions(buf):
+    ei_class, ei_data = buf[4], buf[5]
+    if ei_class not in (1, 2) or ei_data not in (1, 2):
+        raise FormatError("bad ELF ident")
+    end = "<" if ei_data == 1 else ">"
+    is64 = ei_class == 2
+    if is64:
+        _, machine, _, _, phoff, shoff, _, _, phentsize, phnum, shentsize, shnum, shstrndx = _unpack(
+            buf, end + "HHIQQQIHHHHHH", 16)
+    else:
+        _, machine, _, _, phoff, shoff, _, _, phentsize, phnum, shentsize, shnum, shstrndx = _unpack(
+            buf, end + "HHIIIIIHHHHHH", 16)
+    arch = ELF_MACHINES.get(machine, f"elf-{machine}")
+
+    # 섹션 헤더가 있으면 섹션 단위 (.text, .plt 등), 없으면 실행 가능한 PT_LOAD 세그먼트
+    sections = []
+    for i in range(shnum if shoff else 0):
+        if is64:
+            name, sh_type, flags, addr, offset, size = _unpack(buf, end + "IIQQQQ", shoff + i * shentsize)
+        else:
+            name, sh_type, flags, addr, offset, size = _unpack(buf, end + "IIIIII", shoff + i * shentsize)
+        sections.append((name, sh_type, flags, addr, offset, size))
+    if sections:
+        names_offset = sections[shstrndx][4] if shstrndx < len(sections) else None
+        regions = []
+        for name, sh_type, flags, addr, offset, size in sections:
+            if not flags & SHF_EXECINSTR or sh_type == SHT_NOBITS or not size:
+                continue
+            label = _cstr(buf[names_offset + name:names_offset + name + 64]) if names_offset is not None else ""
+            regions.append(Region(label or f"section{len(regions)}", offset, size, addr, arch))
+        return regions
+
+    regions = []
+    for i in range(phnum):
+        if is64:
+            p_type, p_flags, offset, vaddr, _, filesz, _, _ = _unpack(buf, end + "IIQQQQQQ", phoff + i * phentsize)
+        else:
+            p_type, offset, vaddr, _, filesz, _, p_flags, _ = _unpack(buf, end + "IIIIIIII", phoff + i * phentsize)
+        if p_type == PT_LOAD and p_flags & PF_X and filesz:
+            regions.append(Region(f"LOAD{i}", offset, filesz, vaddr, arch))
+    return regions
+
+
+def macho_regions(buf, base=0):
+    """base 위치의 Mach-O 하나 (fat의 한 슬라이스일 수 있음)를 읽습니다. 오프셋은 파일 기준입니다."""
+    (magic,) = _unpack(buf, "<I", base)
+    if magic not in (MH_MAGIC, MH_MAGIC_64):
+        raise FormatError("big-endian Mach-O is not supported")
+    is64 = magic == MH_MAGIC_64
+    _, cputype, _, _, ncmds, _, _ = _unpack(buf, "<IiiIIII", base)
+    arch = MACHO_CPUS.get(cputype & 0xFFFFFFFF, f"macho-0x{cputype & 0xFFFFFFFF:x}")
+
+    regions = []
+    cmd_offset = base + (32 if is64 else 28)
+    for _ in range(ncmds):
+        cmd, cmdsize = _unpack(buf, "<II", cmd_offset)
+        if cmdsize < 8:
+            raise FormatError("bad load command size")
+        if cmd in (LC_SEGMENT, LC_SEGMENT_64):
+            if is64:
+                segname, vmaddr, _, fileoff, filesize, _, initprot, nsects, _ = _unpack(
+                    buf, "<16sQQQQiiII", cmd_offset + 8)
+                sect_offset, sect_size, sect_fmt = cmd_offset + 72, 80, "<16s16sQQIIIIII"
+            else:
+                segname, vmaddr, _, fileoff, filesize, _, initprot, nsects, _ = _unpack(
+                    buf, "<16sIIIIiiII", cmd_offset + 8)
+                sect_offset, sect_size, sect_fmt = cmd_offset + 56, 68, "<16s16sIIIIIIII"
+
+            code_sections = []
+            for i in range(nsects):
+                sectname, _, addr, size, offset, _, _, _, flags, _ = _unpack(
+                    buf, sect_fmt, sect_offset + i * sect_size)[:10]
+                if flags & (S_ATTR_PURE_INSTRUCTIONS | S_ATTR_SOME_INSTRUCTIONS) and size and offset:
+                    code_sections.append(Region(f"{_cstr(segname)},{_cstr(sectname)}",
+                                                base + offset, size, addr, arch))
+            if code_sections:
+                regions.extend(code_sections)
+            elif initprot & VM_PROT_EXECUTE and filesize:
+                regions.append(Region(_cstr(segname), base + fileoff, filesize, vmaddr, arch))
+        cmd_offset += cmdsize
+    return regions
+
+
+def fat_regions(buf):
+    (magic, nfat) = _unpack(buf, ">II", 0)
+    # 0xCAFEBABE는 Java 클래스 파일 매직이기도 하므로 아키텍처 수로 구분
+    if nfat == 0 or nfat > 32:
+        raise FormatError("not a fat Mach-O")
+    regions = []
+    for i in range(nfat):
+        if magic == FAT_MAGIC_64:
+            _, _, offset, _, _, _ = _unpack(buf, ">iiQQII", 8 + i * 32)
+        else:
+            _, _, offset, _, _ = _unpack(buf, ">iiIII", 8 + i * 20)
+        regions.extend(macho_regions(buf, offset))
+    return regions
+
+
+def code_regions(buf):
+    """
+    buf(bytes/mmap)의 실행 코드 영역 목록을 반환합니다.
+    지원하지 않는 형식이면 None (호출하는 쪽에서 파일 전체를 스캔).
+    """
+    head = bytes(buf[:4])
+    if len(head) < 4:
+        return None
+    try:
+        if head[:2] == b"MZ":
+            regions = pe_regions(buf)
+        elif head == b"\x7fELF":
+            regions = elf_regions(buf)
+        elif struct.unpack("<I", head)[0] in (MH_MAGIC, MH_MAGIC_64):
+            regions = macho_regions(buf)
+        elif struct.unpack(">I", head)[0] in (FAT_MAGIC, FAT_MAGIC_64):
+            regions = fat_regions(buf)
+        else:
+            return None
+    except (FormatError, struct.error, IndexError):
+        return None
+    return _clip(buf, regions)
+
+
+def main(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    regions = code_regions(data)
+    if regions is None:
+        print(f"{path}: unknown format")
+        return 1
+    total = sum(region.size for region in regions)
+    print(f"{path}: {len(regions)} code regions, {total} of {len(data)} bytes "
+          f"({total / len(data) * 100 if data else 0:.1f}%)")
+    for region in regions:
+        print(f"   {region.arch:<7} {region.name:<24} file 0x{region.offset:08x}-0x{region.end:08x}  "
+              f"vaddr 0x{region.vaddr:x}")
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 executable_sections.py <binary>")
+        sys.exit(1)
+    sys.exit(main(sys.argv[1]))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Hytale 폰트 JSON 공용 출력기.
+
+json.dump는 0.9583333333333334 같은 전체 정밀도 실수를 그대로 써서 글리프 1만여 개면 파일이 커집니다.
+여기서는 em 단위 값을 소수점 PRECISION 자리로 반올림해 공백 없이 쓰고 (글리프마다 한 줄),
+쓴 파일을 다시 읽어 픽셀 단위(atlas.size 기준)로 되돌렸을 때 어떤 글리프도
+MAX_DRIFT 픽셀보다 많이 움직이지 않았는지 확인합니다.
+변환 스크립트는 em 값을 반올림하지 않고 넘기므로 반올림은 여기서 한 번만 일어나고 검사 대상이 됩니다.
+
+사용법 (기존 폰트 JSON 다시 쓰기):
+  python3 scripts/font_json.py <입력.json> [출력.json] [--precision N] [--max-drift PX]
+"""
+import argparse
+import json
+import os
+import sys
+
+# em 단위 소수 자릿수 (48px 기준 오차 0.0003px 이하)
+PRECISION = 5
+# 허용하는 최대 위치 오차 (atlas.size 픽셀 기준)
+MAX_DRIFT = 0.01
+
+
+def _number(value, precision):
+    if isinstance(value, float):
+        value = round(value, precision)
+        # -0.0 대신 0.0
+        return repr(value + 0.0)
+    return json.dumps(value)
+
+
+def _encode(value, precision):
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{json.dumps(key)}:{_encode(item, precision)}"
+                              for key, item in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_encode(item, precision) for item in value) + "]"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _number(value, precision)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def iter_chunks(font, precision=PRECISION):
+    """폰트 dict를 JSON 조각으로 나눠 냅니다. glyphs/kerning은 항목마다 한 줄입니다."""
+    yield "{"
+    first = True
+    for key, value in font.items():
+        yield ("" if first else ",\n") + json.dumps(key) + ":"
+        first = False
+        if key in ("glyphs", "kerning") and value:
+            yield "[\n"
+            for i, item in enumerate(value):
+                yield ("" if i == 0 else ",\n") + _encode(item, precision)
+            yield "\n]"
+        else:
+            yield _encode(value, precision)
+    yield "}\n"
+
+
+def drift(expected, actual):
+    """
+    두 폰트의 글리프를 픽셀 단위로 되돌려 비교하고 (최대 오차 px, 해당 글리프 unicode)를 반환합니다.
+    planeBounds/advance/kerning은 atlas.size를 곱하고 atlasBounds는 그대로 비교합니다.
+    """
+    size = expected.get("atlas", {}).get("size", 1)
+    worst, worst_glyph = 0.0, None
+    actual_glyphs = {glyph["unicode"]: glyph for glyph in actual.get("glyphs", [])}
+    for glyph in expected.get("glyphs", []):
+        other = actual_glyphs.get(glyph["unicode"])
+        if other is None:
+            return float("inf"), glyph["unicode"]
+        pairs = [(glyph.get("advance", 0) * size, other.get("advance", 0) * size)]
+        for field, scale in (("planeBounds", size), ("atlasBounds", 1)):
+            bounds, other_bounds = glyph.get(field, {}), other.get(field, {})
+            pairs.extend((bounds[side] * scale, other_bounds.get(side, float("inf")) * scale)
+                         for side in bounds)
+        diff = max(abs(a - b) for a, b in pairs)
+        if diff > worst:
+            worst, worst_glyph = diff, glyph["unicode"]
+    for kern, other in zip(expected.get("kerning", []), actual.get("kerning", [])):
+        diff = abs(kern["advance"] - other["advance"]) * size
+        if diff > worst:
+            worst, worst_glyph = diff, kern["unicode1"]
+    return worst, worst_glyph
+
+
+def write(font, path, precision=PRECISION, max_drift=MAX_DRIFT):
+    """
+    폰트 dict를 압축 형식으로 path에 쓰고 (임시 파일 교체) 최대 오차(px)를 반환합니다.
+    다시 읽은 결과가 max_drift 픽셀보다 많이 움직이면 ValueError (원래 파일은 그대로).
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for chunk in iter_chunks(font, precision):
+            f.write(chunk)
+    with open(tmp_path, 'r', encoding='utf-8') as f:
+        worst, glyph = drift(font, json.load(f))
+    if worst > max_drift:
+        os.remove(tmp_path)
+        raise ValueError(f"glyph U+{glyph:04X} moved {worst:.4f}px (limit {max_drift}px)")
+    os.replace(tmp_path, path)
+    return worst
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Rewrite a Hytale font JSON with compact, rounded numbers")
+    parser.add_argument("input")
+    parser.add_argument("output", nargs="?")
+    parser.add_argument("--precision", type=int, default=PRECISION)
+    parser.add_argument("--max-drift", type=float, default=MAX_DRIFT, help="pixels at atlas.size")
+    args = parser.parse_args(argv)
+
+    output = args.output or args.input
+    before = os.path.getsize(args.input)
+    with open(args.input, 'r', encoding='utf-8') as f:
+        font = json.load(f)
+    try:
+        worst = write(font, output, args.precision, args.max_drift)
+    except ValueError as e:
+        print(f"❌ 오차 초과: {e}")
+        return 1
+    after = os.path.getsize(output)
+    print(f"   ✓ {os.path.basename(output)}: {before / 1024:.0f} KB -> {after / 1024:.0f} KB "
+          f"({len(font.get('glyphs', []))}자, 최대 오차 {worst:.5f}px)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -8,8 +8,11 @@
   - Windows: GitHub releases에서 바이너리 다운로드
 
 사용법:
-  python generate_hires_font.py [font.ttf] [output_name]
+  python generate_hires_font.py [--subset] [--incremental] [font.ttf] [output_name]
   python generate_hires_font.py WantedSans-Medium.ttf WantedSans
+
+--subset: lang 파일에 쓰인 글자 + KS X 1001 완성형만 넣고 들어가는 가장 작은 아틀라스로 생성
+--incremental: 글리프 타일 캐시(glyph_cache.py)에 없는 글자만 렌더링하고 아틀라스는 캐시로 조립
 """
 import os
 import sys
@@ -18,6 +21,11 @@ import shutil
 import json
 from pathlib import Path
 
+import charset_subset
+import font_json
+import glyph_cache
+import glyph_converter
+
 # 설정
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_DIR = SCRIPT_DIR.parent
@@ -27,6 +35,7 @@ CHARSET_FILE = PROJECT_DIR / "src/charset/charset_full.txt"
 ATLAS_DIMENSIONS = (4096, 4096)
 FONT_SIZE = 48
 PIXEL_RANGE = 8  # MSDF distance range
+GLYPH_SPACING = 0  # 글리프 사이 간격 (msdf-atlas-gen -spacing 기본값)
 
 
 def find_msdf_atlas_gen():
@@ -88,101 +97,52 @@ def generate_charset():
     print(f"   ✓ 글자셋 생성 완료: {len(chars)}자")
 
 
+def generate_subset_charset():
+    """사용 글자 기준 글자셋(16진수 형식)을 만들고 (파일, 아틀라스 크기)를 반환"""
+    charset_file = PROJECT_DIR / "src/charset/charset_subset_hex.txt"
+    chars, size = charset_subset.subset(output=str(charset_file), hex_codes=True, padding=GLYPH_SPACING)
+    if not size:
+        print(f"❌ {len(chars)}자가 들어가는 아틀라스 크기가 없습니다.")
+        return None, None
+    print(f"   ✓ 글자셋 생성 완료: {len(chars)}자, {size}x{size}")
+    return charset_file, (size, size)
+
+
 def convert_to_hytale_format(atlas_json_path: Path, output_json_path: Path):
     """msdf-atlas-gen JSON 출력을 Hytale 포맷으로 변환"""
     with open(atlas_json_path, 'r', encoding='utf-8') as f:
         atlas_data = json.load(f)
 
-    atlas_info = atlas_data.get('atlas', {})
-    metrics = atlas_data.get('metrics', {})
-    glyphs = atlas_data.get('glyphs', [])
-
-    # Hytale format
-    hytale = {
-        "atlas": {
-            "type": atlas_info.get('type', 'msdf'),
-            "distanceRange": atlas_info.get('distanceRange', PIXEL_RANGE),
-            "distanceRangeMiddle": atlas_info.get('distanceRangeMiddle', 0),
-            "size": atlas_info.get('size', FONT_SIZE),
-            "width": atlas_info.get('width', ATLAS_DIMENSIONS[0]),
-            "height": atlas_info.get('height', ATLAS_DIMENSIONS[1]),
-            "yOrigin": "top"
-        },
-        "metrics": {
-            "emSize": metrics.get('emSize', 1),
-            "lineHeight": metrics.get('lineHeight', 1.2),
-            "ascender": metrics.get('ascender', -0.8),
-            "descender": metrics.get('descender', 0.2),
-            "underlineY": metrics.get('underlineY', 0.1),
-            "underlineThickness": metrics.get('underlineThickness', 0.05)
-        },
-        "glyphs": [],
-        "kerning": atlas_data.get('kerning', [])
-    }
-
-    # Convert glyphs
-    for g in glyphs:
-        glyph = {
-            "unicode": g.get('unicode'),
-            "advance": g.get('advance', 0)
-        }
-
-        # planeBounds (normalized coordinates)
-        if 'planeBounds' in g:
-            pb = g['planeBounds']
-            glyph['planeBounds'] = {
-                "left": pb.get('left', 0),
-                "top": -pb.get('top', 0),  # Flip for top-origin
-                "right": pb.get('right', 0),
-                "bottom": -pb.get('bottom', 0)
-            }
-
-        # atlasBounds (pixel coordinates)
-        if 'atlasBounds' in g:
-            ab = g['atlasBounds']
-            glyph['atlasBounds'] = {
-                "left": ab.get('left', 0),
-                "top": ab.get('top', 0),
-                "right": ab.get('right', 0),
-                "bottom": ab.get('bottom', 0)
-            }
-
-        hytale['glyphs'].append(glyph)
-
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(hytale, f, separators=(',', ': '))
+    hytale = glyph_converter.msdf_atlas_to_hytale(atlas_data, FONT_SIZE, dimensions, PIXEL_RANGE)
+
+    # 소수 자릿수를 줄인 압축 형식으로 저장 (글리프 위치 오차 검사 포함)
+    font_json.write(hytale, output_json_path)
 
     print(f"   ✓ Hytale 포맷 변환 완료: {len(hytale['glyphs'])}자")
 
 
-def generate_atlas(font_path: Path, output_name: str):
-    """msdf-atlas-gen으로 고해상도 MSDF 아틀라스 생성"""
+def find_msdf_atlas_gen_or_report():
     msdf_exe = find_msdf_atlas_gen()
     if not msdf_exe:
         print("❌ msdf-atlas-gen을 찾을 수 없습니다.")
         print("   macOS: brew install msdf-atlas-gen")
         print("   Windows: https://github.com/Chlumsky/msdf-atlas-gen/releases 에서 다운로드")
-        return False
+    return msdf_exe
 
-    output_dir = PROJECT_DIR / "Fonts"
-    output_dir.mkdir(exist_ok=True)
 
-    temp_json = PROJECT_DIR / f"{output_name}_temp.json"
-    output_png = output_dir / f"{output_name}.png"
-    output_json = output_dir / f"{output_name}.json"
-
-    # msdf-atlas-gen 실행
+def run_msdf_atlas_gen(msdf_exe, font_path, charset_file, dimensions, output_png, output_json):
+    """msdf-atlas-gen 실행 (성공 여부 반환)"""
     cmd = [
         msdf_exe,
         "-font", str(font_path),
-        "-charset", str(CHARSET_FILE),
+        "-charset", str(charset_file),
         "-type", "msdf",
         "-pxrange", str(PIXEL_RANGE),
         "-size", str(FONT_SIZE),
-        "-dimensions", f"{ATLAS_DIMENSIONS[0]}", f"{ATLAS_DIMENSIONS[1]}",
+        "-dimensions", f"{dimensions[0]}", f"{dimensions[1]}",
         "-yorigin", "top",
         "-imageout", str(output_png),
-        "-json", str(temp_json)
+        "-json", str(output_json)
     ]
 
     print(f"   실행 중: {' '.join(cmd[:4])}...")
@@ -196,6 +156,25 @@ def generate_atlas(font_path: Path, output_name: str):
         if e.stderr:
             print(f"   오류: {e.stderr[:500]}")
         return False
+    return True
+
+
+def generate_atlas(font_path: Path, output_name: str, charset_file: Path = CHARSET_FILE,
+                   dimensions=ATLAS_DIMENSIONS):
+    """msdf-atlas-gen으로 고해상도 MSDF 아틀라스 생성"""
+    msdf_exe = find_msdf_atlas_gen_or_report()
+    if not msdf_exe:
+        return False
+
+    output_dir = PROJECT_DIR / "Fonts"
+    output_dir.mkdir(exist_ok=True)
+
+    temp_json = PROJECT_DIR / f"{output_name}_temp.json"
+    output_png = output_dir / f"{output_name}.png"
+    output_json = output_dir / f"{output_name}.json"
+
+    if not run_msdf_atlas_gen(msdf_exe, font_path, charset_file, dimensions, output_png, temp_json):
+        return False
 
     # Hytale 포맷으로 변환
     if temp_json.exists():
@@ -206,18 +185,56 @@ def generate_atlas(font_path: Path, output_name: str):
     return True
 
 
+def generate_atlas_incremental(font_path: Path, output_name: str, charset_file: Path = CHARSET_FILE,
+                               atlas_size=None, dimensions=ATLAS_DIMENSIONS):
+    """
+    글리프 타일 캐시에 없는 글자만 msdf-atlas-gen으로 렌더링하고 아틀라스를 조립.
+    dimensions는 전체 빌드와 같은 (서브셋 또는 고정) 아틀라스 크기로, 타일 렌더링에 씁니다.
+    """
+    msdf_exe = find_msdf_atlas_gen_or_report()
+    if not msdf_exe:
+        return False
+
+    def render(chars, work_dir):
+        work_dir = Path(work_dir)
+        tiles_charset = work_dir / "charset.txt"
+        tiles_charset.write_text(" ".join(f"0x{ord(c):X}" for c in chars), encoding='utf-8')
+        tiles_png, tiles_json = work_dir / "tiles.png", work_dir / "tiles.json"
+        if not run_msdf_atlas_gen(msdf_exe, font_path, tiles_charset, dimensions, tiles_png, tiles_json):
+            raise RuntimeError("msdf-atlas-gen failed")
+        with open(tiles_json, 'r', encoding='utf-8') as f:
+            atlas_data = json.load(f)
+        return {"font": glyph_converter.msdf_atlas_to_hytale(atlas_data, FONT_SIZE, ATLAS_DIMENSIONS, PIXEL_RANGE),
+                "pages": [str(tiles_png)]}
+
+    output_dir = PROJECT_DIR / "Fonts"
+    output_dir.mkdir(exist_ok=True)
+    params = {"generator": "msdf-atlas-gen", "size": FONT_SIZE, "pxrange": PIXEL_RANGE, "type": "msdf"}
+    try:
+        size = glyph_cache.build(font_path, charset_subset.read_charset(charset_file), params, render,
+                                 output_dir / f"{output_name}.json", output_dir / f"{output_name}.png",
+                                 atlas_size, padding=GLYPH_SPACING)
+    except RuntimeError:
+        return False
+    return size is not None
+
+
 def main():
+    flags = {arg for arg in sys.argv[1:] if arg.startswith("--")}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    use_subset = "--subset" in flags
+
     print("=== 고해상도 MSDF 폰트 아틀라스 생성기 ===")
-    print(f"    해상도: {ATLAS_DIMENSIONS[0]}x{ATLAS_DIMENSIONS[1]}")
+    print(f"    해상도: {'사용 글자 기준 자동' if use_subset else f'{ATLAS_DIMENSIONS[0]}x{ATLAS_DIMENSIONS[1]}'}")
     print(f"    폰트 크기: {FONT_SIZE}px")
     print("")
 
     # 인자 처리
-    if len(sys.argv) >= 3:
-        font_path = Path(sys.argv[1])
-        output_name = sys.argv[2]
-    elif len(sys.argv) >= 2:
-        font_path = Path(sys.argv[1])
+    if len(args) >= 2:
+        font_path = Path(args[0])
+        output_name = args[1]
+    elif len(args) >= 1:
+        font_path = Path(args[0])
         output_name = font_path.stem
     else:
         # 기본값: WantedSans-Medium
@@ -234,12 +251,24 @@ def main():
 
     # 1. 글자셋 확인/생성
     print("1️⃣  글자셋 준비...")
-    generate_charset()
+    if use_subset:
+        charset_file, dimensions = generate_subset_charset()
+        if not charset_file:
+            sys.exit(1)
+    else:
+        generate_charset()
+        charset_file, dimensions = CHARSET_FILE, ATLAS_DIMENSIONS
 
     # 2. 아틀라스 생성
     print("")
     print("2️⃣  MSDF 아틀라스 생성...")
-    if not generate_atlas(font_path, output_name):
+    if "--incremental" in flags:
+        # --subset이면 조립할 때 들어가는 가장 작은 크기를 다시 고름
+        ok = generate_atlas_incremental(font_path, output_name, charset_file,
+                                        None if use_subset else dimensions[0], dimensions)
+    else:
+        ok = generate_atlas(font_path, output_name, charset_file, dimensions)
+    if not ok:
         sys.exit(1)
 
     print("")
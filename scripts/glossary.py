@@ -0,0 +1,101 @@
+"""
+용어집(src/glossary/glossary.json) 로더와 로컬 사전 번역기.
+
+같은 데이터로 번역 프롬프트의 용어집 섹션을 만들고,
+용어와 정확히 일치하는 문자열은 (대소문자 무시 사전 조회로) API 없이 바로 번역합니다.
+"""
+import json
+import os
+import re
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GLOSSARY_FILE = os.path.join(PROJECT_DIR, "src", "glossary", "glossary.json")
+
+# 번역하지 않고 그대로 두는 토큰: ICU 인자, 태그, [TMP], 이스케이프, printf 형식
+TEMPLATE_TOKEN_RE = re.compile(
+    r'\{[^{}]*\}|</?[A-Za-z][^<>]*>|\[[A-Z][A-Z0-9_]*\]|\\[nrt]|%(?:\d+\$)?[-+ 0#]*\d*(?:\.\d+)?[sdf%]'
+)
+EDGE_PUNCT = " \t.,:;!?…()-–—\"'"
+
+
+def load(path=GLOSSARY_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def render_prompt(data=None):
+    """프롬프트의 "용어 및 고유명사 통일" 항목 본문을 생성합니다."""
+    data = data or load()
+    lines = []
+    for section in data["sections"]:
+        rendered = []
+        for term in section["terms"]:
+            names = "/".join(term.get("aliases", []) + [term["en"]])
+            text = names
+            if term.get("context"):
+                text += f" ({term['context']})"
+            text += f" → {term['ko']}"
+            if term.get("note"):
+                text += f" ({term['note']})"
+            if term.get("emphasis"):
+                text = f"**{text}**"
+            rendered.append(text)
+        if section.get("inline"):
+            lines.append(f"*   **{section['title']}:** " + ", ".join(rendered))
+        else:
+            lines.append(f"*   **{section['title']}:**")
+            lines.extend(f"    *   {text}" for text in rendered)
+    return "\n".join(lines)
+
+
+class Pretranslator:
+    def __init__(self, data=None):
+        data = data or load()
+        # 용어 이름/별칭(소문자) -> 뜻 목록
+        self.senses = {}
+        for section in data["sections"]:
+            for term in section["terms"]:
+                for name in [term["en"]] + term.get("aliases", []):
+                    self.senses.setdefault(name.lower(), []).append(term)
+
+    def _choose(self, senses, key):
+        """키 문맥으로 뜻을 고르고, 고를 수 없으면 None을 반환합니다."""
+        if key:
+            for sense in senses:
+                if any(re.search(pattern, key) for pattern in sense.get("keys", [])):
+                    return sense
+        if len(senses) == 1 and not senses[0].get("keys"):
+            return senses[0]
+        return None
+
+    def translate(self, text, key=None):
+        """
+        플레이스홀더/태그만 있거나, 그 사이의 텍스트가 용어 하나와 정확히 일치하면
+        번역 결과를 반환하고, 아니면 None을 반환합니다.
+        """
+        parts = TEMPLATE_TOKEN_RE.split(text)
+        words = [i for i, part in enumerate(parts) if any(ch.isalpha() for ch in part)]
+        if not words:
+            return text if text.strip() else None
+        if len(words) > 1:
+            return None
+
+        segment = parts[words[0]]
+        core = segment.strip(EDGE_PUNCT)
+        start = segment.index(core)
+        senses = self.senses.get(core.lower())
+        if not senses:
+            return None
+        sense = self._choose(senses, key)
+        if sense is None:
+            return None
+        target = sense.get("resolve", sense["ko"])
+        if " / " in target:
+            return None
+
+        parts[words[0]] = segment[:start] + target + segment[start + len(core):]
+        tokens = TEMPLATE_TOKEN_RE.findall(text)
+        result = parts[0]
+        for token, part in zip(tokens, parts[1:]):
+            result += token + part
+        return result
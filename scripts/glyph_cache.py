@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+글리프 단위 MSDF 타일 캐시와 아틀라스 조립기.
+
+글리프마다 렌더링된 MSDF 타일(PNG)과 Hytale 글리프 값(advance, planeBounds, 타일 기준 atlasBounds)을
+(폰트 파일 해시, 크기, pxrange, 타입, 기타 변환 값) 디렉토리 아래 코드포인트별로 저장합니다.
+빌드할 때는 캐시에 없는 글자만 생성기(msdf-bmfont-xml / msdf-atlas-gen)로 렌더링해 캐시에 넣고,
+전체 아틀라스는 캐시된 타일을 전체 빌드와 같은 간격(padding)으로 Pillow로 붙여 만듭니다.
+게임 업데이트로 음절 몇 개가 늘면 그 글자만 렌더링합니다.
+생성기는 함께 렌더링한 글자끼리의 커닝만 내주므로, 폰트의 kern/GPOS 표에서 새 글자와 실제로 쌍을 이루는
+캐시 글자(커닝 상대)만 함께 렌더링해 그 사이의 커닝도 얻습니다 (타일은 새 글자 것만 저장, fontTools 필요).
+
+render(chars, work_dir) 콜백은 다음을 담은 dict를 반환해야 합니다.
+  "font": Hytale 폰트 dict (glyph_converter 출력, atlasBounds는 페이지 기준 픽셀)
+  "pages": [페이지 PNG 경로], "glyph_pages": {unicode: 페이지 번호} (없으면 모두 0)
+
+사용법 (캐시 상태 확인):
+  python3 scripts/glyph_cache.py
+"""
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:
+    TTFont = None
+
+import charset_subset
+import font_json
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.getenv("GLYPH_CACHE_DIR", os.path.join(PROJECT_DIR, ".cache", "glyphs"))
+# 타일 저장 형식이 바뀌면 올려서 기존 캐시를 무효화 (2: 새 글자와 캐시 글자 사이 커닝 보존)
+CACHE_VERSION = 2
+
+
+def font_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(font_path, params, cache_dir=None):
+    """
+    폰트 파일과 렌더링 값(params: size, pxrange, type 등 dict)에 해당하는 캐시 디렉토리.
+    코드포인트는 그 아래 파일 이름으로 구분합니다.
+    """
+    raw = json.dumps({"font": font_hash(font_path), "params": params, "version": CACHE_VERSION},
+                     sort_keys=True)
+    return os.path.join(cache_dir or CACHE_DIR, hashlib.sha256(raw.encode('utf-8')).hexdigest()[:24])
+
+
+def _has_value(record):
+    """PairValueRecord / Class2Record에 0이 아닌 위치 조정 값이 있는지"""
+    for value in (getattr(record, "Value1", None), getattr(record, "Value2", None)):
+        if value and any(getattr(value, field, 0) for field in
+                         ("XAdvance", "XPlacement", "YAdvance", "YPlacement")):
+            return True
+    return False
+
+
+def _pair_subtables(font):
+    """GPOS 쌍 위치 조정(lookup type 2, 확장 lookup 9 포함) 서브테이블들"""
+    if "GPOS" not in font or not font["GPOS"].table.LookupList:
+        return
+    for lookup in font["GPOS"].table.LookupList.Lookup:
+        for subtable in lookup.SubTable:
+            if lookup.LookupType == 9:
+                if subtable.ExtensionLookupType != 2:
+                    continue
+                subtable = subtable.ExtSubTable
+            elif lookup.LookupType != 2:
+                continue
+            yield subtable
+
+
+def _paired_glyphs(font, names):
+    """글리프 이름 names와 어느 순서로든 커닝 쌍을 이루는 글리프 이름 집합"""
+    partners = set()
+    if "kern" in font:
+        for table in font["kern"].kernTables:
+            for (left, right), value in getattr(table, "kernTable", {}).items():
+                if value and left in names:
+                    partners.add(right)
+                if value and right in names:
+                    partners.add(left)
+    for subtable in _pair_subtables(font):
+        coverage = subtable.Coverage.glyphs
+        if subtable.Format == 1:
+            for first, pair_set in zip(coverage, subtable.PairSet):
+                for record in pair_set.PairValueRecord:
+                    if not _has_value(record):
+                        continue
+                    if first in names:
+                        partners.add(record.SecondGlyph)
+                    if record.SecondGlyph in names:
+                        partners.add(first)
+        elif subtable.Format == 2:
+            class1 = subtable.ClassDef1.classDefs
+            class2 = subtable.ClassDef2.classDefs
+            pairs = {(c1, c2) for c1, record in enumerate(subtable.Class1Record)
+                     for c2, value in enumerate(record.Class2Record) if _has_value(value)}
+            # 클래스 0은 ClassDef에 없는 글리프 (첫 글자는 Coverage 안에서만)
+            firsts = {class1.get(name, 0) for name in names if name in coverage}
+            seconds = {class2.get(name, 0) for name in names}
+            wanted1 = {c1 for c1, c2 in pairs if c2 in seconds}
+            wanted2 = {c2 for c1, c2 in pairs if c1 in firsts}
+            partners.update(name for name in coverage if class1.get(name, 0) in wanted1)
+            if 0 in wanted2:
+                partners.update(name for name in font.getGlyphOrder() if class2.get(name, 0) in wanted2)
+            else:
+                partners.update(name for name, cls in class2.items() if cls in wanted2)
+    return partners
+
+
+def font_kerning_partners(font_path, codes):
+    """
+    폰트의 kern/GPOS 표에서 코드포인트 codes와 (어느 순서로든) 커닝 쌍을 이루는 코드포인트 집합.
+    fontTools가 없으면 None을 반환합니다.
+    """
+    if TTFont is None:
+        return None
+    with TTFont(font_path, lazy=True) as font:
+        cmap = font.getBestCmap() or {}
+        names = {cmap[code] for code in codes if code in cmap}
+        partners = _paired_glyphs(font, names) if names else set()
+        return {code for code, name in cmap.items() if name in partners}
+
+
+class GlyphCache:
+    """캐시 디렉토리 하나: index.json(폰트 공통 값 + 글리프별 값)과 글리프별 타일 PNG"""
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = os.path.join(path, "index.json")
+        self.atlas = None
+        self.metrics = None
+        self.kerning = {}
+        self.glyphs = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.atlas = data["atlas"]
+            self.metrics = data["metrics"]
+            self.kerning = {(k["unicode1"], k["unicode2"]): k for k in data["kerning"]}
+            # 폰트에 없어 렌더링되지 않은 글자는 None으로 기록 (다시 렌더링하지 않음)
+            self.glyphs = {int(code): glyph for code, glyph in data["glyphs"].items()}
+
+    def tile_path(self, code):
+        return os.path.join(self.path, f"{code:04X}.png")
+
+    def missing(self, chars):
+        return [c for c in chars if ord(c) not in self.glyphs]
+
+    def store(self, chars, rendered):
+        """
+        render 결과에서 chars의 타일을 잘라 저장하고, 결과에 없는 글자는 None으로 기록합니다.
+        커닝은 함께 렌더링한 커닝 상대와의 쌍까지 모두 저장합니다.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        font = rendered["font"]
+        glyph_pages = rendered.get("glyph_pages", {})
+        pages = [Image.open(page) for page in rendered["pages"]]
+        self.atlas = {key: value for key, value in font["atlas"].items() if key not in ("width", "height")}
+        self.metrics = font["metrics"]
+        for kern in font.get("kerning", []):
+            self.kerning[(kern["unicode1"], kern["unicode2"])] = kern
+
+        wanted = {ord(c) for c in chars}
+        for code in wanted:
+            self.glyphs[code] = None
+        for glyph in font["glyphs"]:
+            code = glyph["unicode"]
+            if code not in wanted:
+                continue
+            record = {key: value for key, value in glyph.items() if key != "atlasBounds"}
+            bounds = glyph.get("atlasBounds")
+            if bounds:
+                # atlasBounds는 픽셀 경계에서 안쪽으로 들어온 값이므로 바깥 정수 경계로 타일을 자름
+                box = (math.floor(bounds["left"]), math.floor(bounds["top"]),
+                       math.ceil(bounds["right"]), math.ceil(bounds["bottom"]))
+                pages[glyph_pages.get(code, 0)].crop(box).save(self.tile_path(code))
+                record["atlasBounds"] = {
+                    "left": bounds["left"] - box[0], "top": bounds["top"] - box[1],
+                    "right": bounds["right"] - box[0], "bottom": bounds["bottom"] - box[1],
+                }
+                record["tile"] = [box[2] - box[0], box[3] - box[1]]
+            self.glyphs[code] = record
+        for page in pages:
+            page.close()
+        self.save()
+
+    def save(self):
+        data = {
+            "atlas": self.atlas,
+            "metrics": self.metrics,
+            "kerning": list(self.kerning.values()),
+            "glyphs": {str(code): glyph for code, glyph in sorted(self.glyphs.items())},
+        }
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+
+def assemble(cache, chars, output_json, output_png, atlas_size=None, padding=0):
+    """
+    캐시된 타일로 아틀라스 PNG와 Hytale 폰트 JSON을 만듭니다. padding은 타일 사이 간격(픽셀)입니다.
+    atlas_size가 없으면 들어가는 가장 작은 정사각 크기를 고릅니다. 반환값은 아틀라스 크기 (실패 시 None).
+    """
+    codes = sorted({ord(c) for c in chars if cache.glyphs.get(ord(c)) is not None})
+    tiled = [code for code in codes if "tile" in cache.glyphs[code]]
+    sizes = [tuple(cache.glyphs[code]["tile"]) for code in tiled]
+
+    candidates = [atlas_size] if atlas_size else charset_subset.ATLAS_SIZES
+    for size in candidates:
+        positions = charset_subset.shelf_pack(sizes, size, padding)
+        if positions is not None:
+            break
+    else:
+        return None
+
+    atlas_image = None
+    placed = dict(zip(tiled, positions))
+    for code, (x, y) in placed.items():
+        with Image.open(cache.tile_path(code)) as tile:
+            if atlas_image is None:
+                atlas_image = Image.new(tile.mode, (size, size))
+            atlas_image.paste(tile, (x, y))
+    if atlas_image is None:
+        atlas_image = Image.new("RGB", (size, size))
+
+    glyphs = []
+    for code in codes:
+        record = cache.glyphs[code]
+        glyph = {"unicode": code, "advance": record["advance"]}
+        if "planeBounds" in record:
+            glyph["planeBounds"] = record["planeBounds"]
+        if code in placed:
+            x, y = placed[code]
+            bounds = record["atlasBounds"]
+            glyph["atlasBounds"] = {"left": bounds["left"] + x, "top": bounds["top"] + y,
+                                    "right": bounds["right"] + x, "bottom": bounds["bottom"] + y}
+        glyphs.append(glyph)
+
+    code_set = set(codes)
+    font = {
+        "atlas": dict(cache.atlas, width=size, height=size),
+        "metrics": cache.metrics,
+        "glyphs": glyphs,
+        "kerning": [kern for (first, second), kern in sorted(cache.kerning.items())
+                    if first in code_set and second in code_set],
+    }
+    # 아틀라스 키 순서를 원래 포맷과 맞춤 (width/height가 yOrigin 앞)
+    order = ("type", "distanceRange", "distanceRangeMiddle", "size", "width", "height", "yOrigin")
+    font["atlas"] = {key: font["atlas"][key] for key in order if key in font["atlas"]}
+
+    atlas_image.save(output_png)
+    font_json.write(font, output_json)
+    return size
+
+
+def build(font_path, chars, params, render, output_json, output_png, atlas_size=None, cache_dir=None,
+          padding=0):
+    """
+    캐시에 없는 글자만 (폰트에서 쌍을 이루는 캐시 글자와 함께) render로 렌더링해 캐시에 넣은 뒤
+    전체 아틀라스를 조립합니다.
+    padding은 전체 빌드에서 생성기가 쓰는 글리프 간격(픽셀)입니다. 반환값은 아틀라스 크기 (실패 시 None).
+    """
+    if Image is None:
+        print("❌ 증분 빌드에는 Pillow가 필요합니다: pip install pillow")
+        return None
+
+    started = time.perf_counter()
+    cache = GlyphCache(cache_path(font_path, params, cache_dir))
+    missing = cache.missing(chars)
+    partners = []
+    if missing and any(cache.glyphs.values()):
+        # 새 글자와 폰트에서 실제로 쌍을 이루는 캐시 글자만 다시 렌더링 (커닝 값은 생성기 출력을 씀)
+        paired = font_kerning_partners(font_path, {ord(c) for c in missing})
+        if paired is None:
+            print("❌ 증분 빌드에는 fontTools가 필요합니다: pip install fonttools")
+            return None
+        partners = [chr(code) for code in sorted(paired) if cache.glyphs.get(code)]
+    print(f"   글리프 캐시: {len(chars) - len(missing)}자 재사용, {len(missing)}자 렌더링"
+          + (f" (커닝 상대 {len(partners)}자 함께)" if partners else ""))
+    if missing:
+        with tempfile.TemporaryDirectory() as work_dir:
+            cache.store(missing, render(missing + partners, work_dir))
+
+    size = assemble(cache, chars, output_json, output_png, atlas_size, padding)
+    if size:
+        print(f"   ✓ 아틀라스 조립 완료: {size}x{size} ({time.perf_counter() - started:.1f}s)")
+    else:
+        print("❌ 글리프가 아틀라스에 들어가지 않습니다")
+    return size
+
+
+def main():
+    if not os.path.isdir(CACHE_DIR):
+        print(f"   캐시 없음: {CACHE_DIR}")
+        return 0
+    for name in sorted(os.listdir(CACHE_DIR)):
+        index_path = os.path.join(CACHE_DIR, name, "index.json")
+        if not os.path.exists(index_path):
+            continue
+        with open(index_path, 'r', encoding='utf-8') as f:
+            glyphs = json.load(f)["glyphs"]
+        rendered = sum(1 for glyph in glyphs.values() if glyph)
+        print(f"   {name}: {rendered}자 캐시됨 ({len(glyphs) - rendered}자 폰트에 없음)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
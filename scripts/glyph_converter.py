@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+BMFont(msdf-bmfont-xml) / msdf-atlas-gen JSON을 Hytale 폰트 포맷으로 바꾸는 공용 변환기.
+
+convert_font.py, build_font.py, generate_hires_font.py가 함께 씁니다.
+BMFont 변환은 글리프 값을 필드별 배열로 모아 planeBounds/atlasBounds/advance를 한꺼번에 계산합니다.
+NumPy가 있으면 배열 연산으로, 없으면 같은 계산을 순수 파이썬으로 합니다 (결과는 비트 단위로 같음).
+msdf-atlas-gen 변환은 planeBounds 부호만 뒤집는 복사라 순수 파이썬으로 합니다
+(배열로 옮기고 되돌리는 비용이 계산보다 커서 NumPy가 더 느림).
+
+사용법 (합성 CJK 크기 입력으로 벤치마크):
+  python3 scripts/glyph_converter.py [--glyphs 50000]
+"""
+import argparse
+import random
+import sys
+import time
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 원본 게임 폰트의 메트릭 (BMFont에는 없는 값)
+HYTALE_METRICS = {
+    "emSize": 1,
+    "lineHeight": 1.364,
+    "ascender": -1.011,
+    "descender": 0.353,
+    "underlineY": 0.101,
+    "underlineThickness": 0.037
+}
+BMFONT_FIELDS = ("x", "y", "width", "height", "xoffset", "yoffset", "xadvance")
+PLANE_SIDES = ("left", "top", "right", "bottom")
+
+
+def _bmfont_columns_numpy(rows, size, base, baseline_offset, padding):
+    x, y, w, h, xoff, yoff, xadv = np.array(rows, dtype=np.float64).reshape(-1, len(BMFONT_FIELDS)).T
+    return [column.tolist() for column in (
+        xadv / size,
+        xoff / size,
+        -(base - yoff) / size - baseline_offset,
+        (xoff + w) / size,
+        -(base - yoff - h) / size - baseline_offset,
+        x + padding,
+        y + padding,
+        x + w - padding,
+        y + h - padding,
+    )]
+
+
+def _bmfont_columns_python(rows, size, base, baseline_offset, padding):
+    columns = [[] for _ in range(9)]
+    for x, y, w, h, xoff, yoff, xadv in rows:
+        x, y, w, h, xoff, yoff, xadv = (float(v) for v in (x, y, w, h, xoff, yoff, xadv))
+        for column, value in zip(columns, (
+                xadv / size,
+                xoff / size,
+                -(base - yoff) / size - baseline_offset,
+                (xoff + w) / size,
+                -(base - yoff - h) / size - baseline_offset,
+                x + padding,
+                y + padding,
+                x + w - padding,
+                y + h - padding)):
+            column.append(value)
+    return columns
+
+
+def bmfont_glyphs(chars, size, base, baseline_offset=0.0, padding=0.5, use_numpy=None):
+    """
+    BMFont chars 목록을 Hytale 글리프 목록으로 바꿉니다.
+    baseline_offset은 em 단위(양수면 위로), padding은 atlasBounds를 셀 안쪽으로 줄이는 픽셀 수입니다.
+    """
+    if not chars:
+        return []
+    use_numpy = np is not None if use_numpy is None else use_numpy
+    rows = list(map(itemgetter(*BMFONT_FIELDS), chars))
+    compute = _bmfont_columns_numpy if use_numpy else _bmfont_columns_python
+    (advance, left, top, right, bottom,
+     atlas_left, atlas_top, atlas_right, atlas_bottom) = compute(rows, float(size), float(base),
+                                                                 baseline_offset, padding)
+    return [
+        {
+            "unicode": ch["id"],
+            "advance": advance[i],
+            "planeBounds": {"left": left[i], "top": top[i], "right": right[i], "bottom": bottom[i]},
+            "atlasBounds": {"left": atlas_left[i], "top": atlas_top[i],
+                            "right": atlas_right[i], "bottom": atlas_bottom[i]}
+        }
+        for i, ch in enumerate(chars)
+    ]
+
+
+def bmfont_to_hytale(bmfont, baseline_offset=0.0, padding=0.5, default_size=48,
+                     default_texture=8192, default_range=8, use_numpy=None):
+    """msdf-bmfont-xml JSON(dict)을 Hytale 폰트 dict로 바꿉니다. 메트릭은 원본 게임 값을 씁니다."""
+    info = bmfont.get('info', {})
+    common = bmfont.get('common', {})
+    df = bmfont.get('distanceField', {})
+
+    size = info.get('size', default_size)
+    base = common.get('base', size)
+    return {
+        "atlas": {
+            "type": df.get('fieldType', 'msdf'),
+            "distanceRange": df.get('distanceRange', default_range),
+            "distanceRangeMiddle": 0,
+            "size": size,
+            "width": common.get('scaleW', default_texture),
+            "height": common.get('scaleH', default_texture),
+            "yOrigin": "top"
+        },
+        "metrics": dict(HYTALE_METRICS),
+        "glyphs": bmfont_glyphs(bmfont.get('chars', []), size, base, baseline_offset, padding, use_numpy),
+        "kerning": [
+            {"unicode1": kern['first'], "unicode2": kern['second'], "advance": kern['amount'] / size}
+            for kern in bmfont.get('kernings', [])
+        ]
+    }
+
+
+def msdf_atlas_to_hytale(atlas_data, default_size=48, default_dimensions=(4096, 4096), default_range=8):
+    """msdf-atlas-gen JSON(dict, -yorigin top)을 Hytale 폰트 dict로 바꿉니다."""
+    atlas_info = atlas_data.get('atlas', {})
+    metrics = atlas_data.get('metrics', {})
+    glyphs = atlas_data.get('glyphs', [])
+
+    result = []
+    for g in glyphs:
+        glyph = {"unicode": g.get('unicode'), "advance": g.get('advance', 0)}
+        if 'planeBounds' in g:
+            # planeBounds는 y 위쪽이 양수이므로 top/bottom 부호를 뒤집음 (+ 0.0은 -0.0 정리)
+            pb = g['planeBounds']
+            glyph['planeBounds'] = {"left": pb.get('left', 0) + 0.0, "top": -pb.get('top', 0) + 0.0,
+                                    "right": pb.get('right', 0) + 0.0, "bottom": -pb.get('bottom', 0) + 0.0}
+        if 'atlasBounds' in g:
+            ab = g['atlasBounds']
+            glyph['atlasBounds'] = {side: ab.get(side, 0) for side in PLANE_SIDES}
+        result.append(glyph)
+
+    return {
+        "atlas": {
+            "type": atlas_info.get('type', 'msdf'),
+            "distanceRange": atlas_info.get('distanceRange', default_range),
+            "distanceRangeMiddle": atlas_info.get('distanceRangeMiddle', 0),
+            "size": atlas_info.get('size', default_size),
+            "width": atlas_info.get('width', default_dimensions[0]),
+            "height": atlas_info.get('height', default_dimensions[1]),
+            "yOrigin": "top"
+        },
+        "metrics": {
+            "emSize": metrics.get('emSize', 1),
+            "lineHeight": metrics.get('lineHeight', 1.2),
+            "ascender": metrics.get('ascender', -0.8),
+            "descender": metrics.get('descender', 0.2),
+            "underlineY": metrics.get('underlineY', 0.1),
+            "underlineThickness": metrics.get('underlineThickness', 0.05)
+        },
+        "glyphs": result,
+        "kerning": atlas_data.get('kerning', [])
+    }
+
+
+def synthetic_bmfont(count, size=48, texture=8192, seed=1):
+    """CJK 크기 글자셋을 흉내 낸 BMFont dict (셀을 줄 단위로 배치)"""
+    rng = random.Random(seed)
+    chars = []
+    x = y = 0
+    for i in range(count):
+        w, h = rng.randint(20, 56), rng.randint(40, 56)
+        if x + w > texture:
+            x, y = 0, y + 60
+        chars.append({"id": 0x4E00 + i, "x": x, "y": y, "width": w, "height": h,
+                      "xoffset": rng.randint(-4, 4), "yoffset": rng.randint(0, 12),
+                      "xadvance": rng.randint(30, 50), "page": 0, "chnl": 15})
+        x += w + 2
+    return {"info": {"size": size}, "common": {"scaleW": texture, "scaleH": texture, "base": 38},
+            "distanceField": {"fieldType": "msdf", "distanceRange": 8}, "chars": chars,
+            "kernings": []}
+
+
+def bench(count):
+    bmfont = synthetic_bmfont(count)
+    modes = [("python", False)] + ([("numpy", True)] if np is not None else [])
+    results = {}
+    for name, use_numpy in modes:
+        started = time.perf_counter()
+        results[name] = bmfont_to_hytale(bmfont, baseline_offset=0.05, use_numpy=use_numpy)
+        elapsed = time.perf_counter() - started
+        print(f"   {name:<7} {count}자 {elapsed * 1000:.0f}ms ({count / elapsed:,.0f} glyphs/s)")
+    if np is None:
+        print("   (NumPy 없음: 순수 파이썬 경로만 측정)")
+    elif results["numpy"] != results["python"]:
+        print("❌ NumPy와 순수 파이썬 결과가 다릅니다")
+        return 1
+    else:
+        print("   ✓ NumPy와 순수 파이썬 결과 동일")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the BMFont -> Hytale glyph converter")
+    parser.add_argument("--glyphs", type=int, default=50000)
+    args = parser.parse_args()
+    sys.exit(bench(args.glyphs))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+ko-KR lang 파일에 쓰인 모든 글자가 폰트(Fonts/WantedSans.json)에 글리프로 있는지 검사합니다.
+
+모든 lang 파일을 한 번씩 읽어 값(키 제외)에 쓰인 코드포인트 집합을 만들고
+폰트 JSON의 글리프 표와 비교해, 빠진 글자를 파일/키별로 출력합니다.
+used_chars.txt에는 새로 쓰이기 시작한 글자만 추가합니다 (--prune이면 쓰이지 않는 글자도 제거).
+빠진 글리프가 있으면 종료 코드 1로 끝납니다.
+
+사용법:
+  python3 scripts/glyph_coverage.py [--font 폰트.json] [--no-update] [--prune]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+import lang_file
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_JSON = os.path.join(PROJECT_DIR, "Fonts", "WantedSans.json")
+USED_CHARS_FILE = os.path.join(PROJECT_DIR, "used_chars.txt")
+# 글리프 표만 필요하므로 JSON 전체를 파싱하지 않고 코드포인트만 뽑음 (kerning의 unicode1/2는 제외됨)
+UNICODE_RE = re.compile(r'"unicode"\s*:\s*(\d+)')
+LANG_GLOBS = (
+    "Language/ko-KR/*.lang",
+    "Assets/**/ko-KR/**/*.lang",
+)
+
+
+def lang_paths(root=PROJECT_DIR):
+    paths = set()
+    for pattern in LANG_GLOBS:
+        paths.update(glob.glob(os.path.join(root, pattern), recursive=True))
+    return sorted(paths)
+
+
+def font_codepoints(font_json=FONT_JSON):
+    with open(font_json, 'r', encoding='utf-8') as f:
+        return {int(code) for code in UNICODE_RE.findall(f.read())}
+
+
+def is_rendered(ch):
+    # 공백/제어 문자는 글리프가 필요 없음
+    return not ch.isspace() and ord(ch) >= 0x20
+
+
+def scan(paths, glyphs):
+    """
+    (쓰인 글자 집합, 빠진 글자 목록)을 반환합니다.
+    빠진 글자 목록은 [(파일, 키, 글자들)]입니다.
+    """
+    used = set()
+    missing = []
+    for path in paths:
+        values = lang_file.LangFile.load(path).values()
+        file_chars = set(''.join(values.values()))
+        used |= file_chars
+        # 파일 전체에 빠진 글자가 없으면 키 단위로 볼 필요 없음
+        if all(ord(ch) in glyphs or not is_rendered(ch) for ch in file_chars):
+            continue
+        for key, value in values.items():
+            gaps = sorted(ch for ch in set(value) if ord(ch) not in glyphs and is_rendered(ch))
+            if gaps:
+                missing.append((path, key, gaps))
+    return {ch for ch in used if is_rendered(ch)}, missing
+
+
+def update_used_chars(used, path=USED_CHARS_FILE, prune=False):
+    """used_chars.txt를 갱신하고 (추가된 수, 제거된 수)를 반환합니다. 바뀐 게 없으면 쓰지 않습니다."""
+    current = set()
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            current = set(f.read())
+    current.discard("\n")
+    result = set(used) if prune else current | used
+    added = len(result - current)
+    removed = len(current - result)
+    if added or removed:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(sorted(result)))
+        os.replace(tmp_path, path)
+    return added, removed
+
+
+def check(font_json=FONT_JSON, update=True, prune=False, root=PROJECT_DIR):
+    """검사 결과를 출력하고 빠진 글리프가 있는 항목 수를 반환합니다."""
+    started = time.perf_counter()
+    paths = lang_paths(root)
+    used, missing = scan(paths, font_codepoints(font_json))
+    for path, key, gaps in missing:
+        print(f"{os.path.relpath(path, root)}: {key}: "
+              f"{' '.join(f'{ch}(U+{ord(ch):04X})' for ch in gaps)}")
+
+    if update:
+        added, removed = update_used_chars(used, os.path.join(root, "used_chars.txt"), prune)
+        if added or removed:
+            print(f"   used_chars.txt 갱신: +{added} -{removed}")
+
+    elapsed = time.perf_counter() - started
+    absent = {ch for _, _, gaps in missing for ch in gaps}
+    if missing:
+        print(f"❌ 글리프 없음: {len(absent)}자, {len(missing)}개 항목 "
+              f"({len(paths)}개 파일, {len(used)}자 사용, {elapsed * 1000:.0f}ms)")
+    else:
+        print(f"   ✓ 글리프 누락 없음 ({len(paths)}개 파일, {len(used)}자 사용, {elapsed * 1000:.0f}ms)")
+    return len(missing)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Check that every character in ko-KR lang files has a glyph")
+    parser.add_argument("--font", default=FONT_JSON)
+    parser.add_argument("--no-update", action="store_true", help="do not touch used_chars.txt")
+    parser.add_argument("--prune", action="store_true", help="also drop characters that are no longer used")
+    args = parser.parse_args(argv)
+    return 1 if check(args.font, not args.no_update, args.prune) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -6,8 +6,6 @@ Hytale 한글 패치 설치 스크립트 (Windows)
 import os
 import sys
 import shutil
-import subprocess
-import zipfile
 import json
 from pathlib import Path
 
@@ -15,6 +13,10 @@ from pathlib import Path
 # 환경 설정
 # ==========================================
 SCRIPT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPT_DIR / "scripts"))
+import binary_patch
+import merge_lang
+
 LOCAL_APPDATA = os.environ.get('LOCALAPPDATA', '')
 APPDATA = os.environ.get('APPDATA', '')
 
@@ -96,71 +98,19 @@ def patch_binary(game_dir: Path):
         shutil.copy2(exe_path, backup_path)
         print("   ✓ 원본 바이너리 백업됨")
 
-    # 바이너리 읽기
-    with open(exe_path, 'rb') as f:
-        data = bytearray(f.read())
-
-    # x86_64 패턴 패치
-    # 512 (0x200) 패턴들:
-    # - BA 00 02 00 00 = mov edx, 0x200
-    # - 41 B8 00 02 00 00 = mov r8d, 0x200
-    # - B9 00 02 00 00 = mov ecx, 0x200
-    # - 41 B9 00 02 00 00 = mov r9d, 0x200
-    #
-    # 8192 (0x2000)로 변경: 00 02 -> 00 20
-
-    patch_count = 0
-    i = 0
-    while i < len(data) - 11:
-        # 패턴 1: BA 00 02 00 00 41 B8 00 02 00 00 (mov edx, mov r8d)
-        if (data[i] == 0xBA and data[i+1] == 0x00 and data[i+2] == 0x02 and
-            data[i+3] == 0x00 and data[i+4] == 0x00 and
-            data[i+5] == 0x41 and data[i+6] == 0xB8 and
-            data[i+7] == 0x00 and data[i+8] == 0x02 and
-            data[i+9] == 0x00 and data[i+10] == 0x00):
-            # 512 -> 8192: 00 02 -> 00 20
-            data[i+2] = 0x20
-            data[i+8] = 0x20
-            patch_count += 1
-            i += 11
-            continue
-
-        # 패턴 2: B9 00 02 00 00 41 B9 00 02 00 00 (mov ecx, mov r9d)
-        if (data[i] == 0xB9 and data[i+1] == 0x00 and data[i+2] == 0x02 and
-            data[i+3] == 0x00 and data[i+4] == 0x00 and
-            data[i+5] == 0x41 and data[i+6] == 0xB9 and
-            data[i+7] == 0x00 and data[i+8] == 0x02 and
-            data[i+9] == 0x00 and data[i+10] == 0x00):
-            data[i+2] = 0x20
-            data[i+8] = 0x20
-            patch_count += 1
-            i += 11
-            continue
-
-        # 패턴 3: 41 B8 00 02 00 00 41 B9 00 02 00 00 (mov r8d, mov r9d)
-        if (data[i] == 0x41 and data[i+1] == 0xB8 and
-            data[i+2] == 0x00 and data[i+3] == 0x02 and
-            data[i+4] == 0x00 and data[i+5] == 0x00 and
-            data[i+6] == 0x41 and data[i+7] == 0xB9 and
-            data[i+8] == 0x00 and data[i+9] == 0x02 and
-            data[i+10] == 0x00 and data[i+11] == 0x00):
-            data[i+3] = 0x20
-            data[i+9] = 0x20
-            patch_count += 1
-            i += 12
-            continue
-
-        i += 1
+    # 512 (0x200) -> 8192 (0x2000) 패치 (패턴: src/patch/signatures.json)
+    # mmap으로 열어 코드 섹션만 스캔하고 바뀌는 바이트만 제자리에서 덮어씀
+    status, patch_count = binary_patch.ensure_patched(exe_path)
+
+    if status == "already":
+        print(f"   ✓ 이미 패치되어 있습니다 ({patch_count}개 패턴)")
+        return True
 
     if patch_count == 0:
         print("   ⚠️ 패치할 패턴을 찾지 못했습니다.")
         print("   이미 패치되었거나 게임 버전이 다를 수 있습니다.")
         return False
 
-    # 패치된 바이너리 저장
-    with open(exe_path, 'wb') as f:
-        f.write(data)
-
     print(f"   ✓ {patch_count}개 패턴 패치 완료 (512 -> 8192)")
     return True
 
@@ -196,74 +146,40 @@ def install_patch(game_dir: Path):
     if lang_dir.exists() and not lang_dir_backup.exists():
         shutil.copytree(lang_dir, lang_dir_backup)
 
-    temp_work = SCRIPT_DIR / "temp_work"
-    if temp_work.exists():
-        shutil.rmtree(temp_work)
-    temp_work.mkdir()
-
-    try:
-        # Assets.zip 찾기
-        assets_zip = None
-        current_path = game_dir
-        for _ in range(6):
-            check_path = current_path / "Assets.zip"
-            if check_path.exists():
-                assets_zip = check_path
-                break
-            current_path = current_path.parent
-
-        if assets_zip and assets_zip.exists():
-            with zipfile.ZipFile(assets_zip, 'r') as zf:
-                target_files = [f for f in zf.namelist()
-                               if f.startswith("Server/Languages/en-US/") or
-                                  f.startswith("Common/Languages/en-US/")]
-                zf.extractall(temp_work, members=target_files)
-
-        # Client base files
-        client_en_dir = game_dir / "Language/en-US"
-        if client_en_dir.exists():
-            dest = temp_work / "Client"
-            dest.mkdir(parents=True, exist_ok=True)
-            for f in client_en_dir.glob("*.lang"):
-                shutil.copy2(f, dest)
-
-        lang_dir.mkdir(parents=True, exist_ok=True)
-        (lang_dir / "avatarCustomization").mkdir(parents=True, exist_ok=True)
-
-        merge_script = SCRIPT_DIR / "scripts/merge_lang.py"
-
-        def run_merge(base, patch, out):
-            if not base.exists():
-                base.parent.mkdir(parents=True, exist_ok=True)
-                base.touch()
-            subprocess.run([sys.executable, str(merge_script), str(base), str(patch), str(out)], check=True)
-
-        # Client
-        run_merge(temp_work / "Client/client.lang",
-                  SCRIPT_DIR / "Language/ko-KR/client.lang",
-                  lang_dir / "client.lang")
-
-        shutil.copy2(SCRIPT_DIR / "Language/ko-KR/meta.lang", lang_dir / "meta.lang")
-
-        # Server
-        server_base = temp_work / "Server/Languages/en-US"
-        server_patch = SCRIPT_DIR / "Assets/Server/Languages/ko-KR"
-        for f in ["server.lang", "wordlists.lang"]:
-            run_merge(server_base / f, server_patch / f, lang_dir / f)
-
-        # Avatar
-        avatar_base = temp_work / "Common/Languages/en-US/avatarCustomization"
-        avatar_patch = SCRIPT_DIR / "Assets/Common/Languages/ko-KR/avatarCustomization"
-        if avatar_patch.exists():
-            for patch_file in avatar_patch.glob("*.lang"):
-                base_file = avatar_base / patch_file.name
-                run_merge(base_file, patch_file, lang_dir / "avatarCustomization" / patch_file.name)
-
-        print("   ✓ 언어 파일 설치 완료")
-
-    finally:
-        if temp_work.exists():
-            shutil.rmtree(temp_work)
+    # Assets.zip 찾기
+    assets_zip = None
+    current_path = game_dir
+    for _ in range(6):
+        check_path = current_path / "Assets.zip"
+        if check_path.exists():
+            assets_zip = check_path
+            break
+        current_path = current_path.parent
+
+    lang_dir.mkdir(parents=True, exist_ok=True)
+    (lang_dir / "avatarCustomization").mkdir(parents=True, exist_ok=True)
+
+    # Client는 게임 폴더의 원본을, Server/Avatar는 Assets.zip 멤버를 임시 폴더 없이 메모리로 읽어
+    # 한 프로세스에서 병합
+    server_patch = SCRIPT_DIR / "Assets/Server/Languages/ko-KR"
+    avatar_patch = SCRIPT_DIR / "Assets/Common/Languages/ko-KR/avatarCustomization"
+
+    pairs = [(game_dir / "Language/en-US/client.lang",
+              SCRIPT_DIR / "Language/ko-KR/client.lang",
+              lang_dir / "client.lang")]
+    pairs += merge_lang.collect_zip_pairs(assets_zip, [
+        ("Server/Languages/en-US/", server_patch, lang_dir),
+        ("Common/Languages/en-US/avatarCustomization/", avatar_patch, lang_dir / "avatarCustomization"),
+    ])
+    results = merge_lang.merge_pairs(pairs)
+    merge_lang.print_stats(results)
+    failed = [stats["output"] for stats in results if "error" in stats]
+    if failed:
+        raise RuntimeError(f"언어 파일 병합 실패: {', '.join(failed)}")
+
+    merge_lang.write_if_changed(lang_dir / "meta.lang", (SCRIPT_DIR / "Language/ko-KR/meta.lang").read_bytes())
+
+    print("   ✓ 언어 파일 설치 완료")
 
 
 def main():
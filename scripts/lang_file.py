@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+.lang 파일 공용 파서.
+
+파일을 한 번만 읽어 원본 줄 목록(개행 문자 포함)과 함께 키 인덱스를 만듭니다.
+- entries: 파일 순서대로의 Entry 목록
+- index: {키: Entry}
+- comments: 주석 줄 번호, todo_lines: TODO 마커가 붙은 줄 번호
+lines를 그대로 이어 붙이면 원본과 바이트 단위로 같은 파일이 됩니다.
+
+규칙:
+- `#`로 시작하거나 빈 줄은 주석/공백
+- `키 = 값` (또는 `키=값`) 줄이 항목의 시작
+- 줄 끝(TODO 마커 제외)이 `\\`이면 다음 줄이 같은 값에 이어짐
+- ` # TODO: Translate`(키 줄), ` # TODO: TranslateLine`(이어지는 줄)은 번역 대기 표시
+
+사용법 (파싱 시간 측정 및 왕복 검사):
+  python3 scripts/lang_file.py <file.lang> [...]
+"""
+import io
+import os
+import sys
+import time
+
+TODO_KEY = " # TODO: Translate"
+TODO_LINE = " # TODO: TranslateLine"
+
+
+def split_newline(line):
+    """줄을 (본문, 개행 문자)로 나눕니다."""
+    if line.endswith('\r\n'):
+        return line[:-2], '\r\n'
+    if line.endswith('\n'):
+        return line[:-1], '\n'
+    if line.endswith('\r'):
+        return line[:-1], '\r'
+    return line, ''
+
+
+def normalize_newline(line):
+    """줄 끝의 개행(\\r\\n, \\r)을 \\n으로 바꿉니다 (개행 없는 마지막 줄은 그대로)."""
+    text, newline = split_newline(line)
+    return text + '\n' if newline else text
+
+
+def strip_marker(text):
+    """
+    개행이 제거된 줄에서 TODO 마커를 떼어 (본문, 마커)를 반환합니다.
+    마커는 줄 끝 또는 끝의 `\\` 바로 앞에 올 수 있습니다.
+    """
+    for marker in (TODO_LINE, TODO_KEY):
+        pos = text.find(marker)
+        if pos == -1:
+            continue
+        rest = text[pos + len(marker):]
+        if rest.strip() in ("", "\\"):
+            return text[:pos] + rest.strip(), marker
+    return text, None
+
+
+def is_continued(content):
+    return content.rstrip().endswith('\\')
+
+
+class Entry:
+    __slots__ = ("key", "key_part", "sep", "start", "end", "todo")
+
+    def __init__(self, key, key_part, sep, start, end, todo):
+        self.key = key
+        self.key_part = key_part
+        self.sep = sep
+        self.start = start
+        self.end = end
+        self.todo = todo
+
+    @property
+    def span(self):
+        return range(self.start, self.end)
+
+    @property
+    def multiline(self):
+        return self.end - self.start > 1
+
+
+class LangFile:
+    def __init__(self, lines, path=None):
+        self.path = path
+        self.lines = lines
+        self.entries = []
+        self.index = {}
+        self.comments = []
+        self.todo_lines = []
+        self._parse()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return cls(f.readlines(), path)
+
+    @classmethod
+    def from_text(cls, text, path=None):
+        # 파일에서 newline=''로 읽은 것과 같은 줄 단위로 나눔 (splitlines는 \x0b, \u2028 등에서도 끊음)
+        return cls(io.StringIO(text, newline='').readlines(), path)
+
+    def _parse(self):
+        lines = self.lines
+        i = 0
+        total = len(lines)
+        while i < total:
+            text, _ = split_newline(lines[i])
+            content, marker = strip_marker(text)
+            stripped = content.strip()
+            if not stripped or stripped.startswith('#') or '=' not in content:
+                if stripped.startswith('#') and marker is None:
+                    self.comments.append(i)
+                elif marker is not None:
+                    self.todo_lines.append(i)
+                i += 1
+                continue
+
+            sep = ' = ' if ' = ' in content else '='
+            key_part = content.split(sep, 1)[0]
+            start = i
+            if marker is not None:
+                self.todo_lines.append(i)
+            while is_continued(content) and i + 1 < total:
+                i += 1
+                text, _ = split_newline(lines[i])
+                content, cont_marker = strip_marker(text)
+                if cont_marker is not None:
+                    self.todo_lines.append(i)
+            i += 1
+            entry = Entry(key_part.strip(), key_part, sep, start, i, marker == TODO_KEY)
+            self.entries.append(entry)
+            self.index[entry.key] = entry
+
+    def content(self, line_no):
+        """마커와 개행을 뗀 줄 본문"""
+        return strip_marker(split_newline(self.lines[line_no])[0])[0]
+
+    def value_lines(self, entry):
+        """
+        항목 값의 각 줄 본문 (첫 줄은 `키 = ` 뒤 부분, 끝의 `\\`는 유지) 목록
+        """
+        first = self.content(entry.start).split(entry.sep, 1)[1]
+        return [first] + [self.content(i) for i in range(entry.start + 1, entry.end)]
+
+    def value(self, key):
+        """여러 줄 값은 줄바꿈으로 합친 전체 값 (이어짐 표시 `\\` 제거)"""
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        parts = []
+        for part in self.value_lines(entry):
+            part = part.rstrip()
+            parts.append(part[:-1] if part.endswith('\\') else part)
+        return "\n".join(parts)
+
+    def values(self):
+        return {entry.key: self.value(entry.key) for entry in self.entries}
+
+    def block(self, key):
+        """항목이 차지하는 원본 줄 목록"""
+        entry = self.index[key]
+        return self.lines[entry.start:entry.end]
+
+    def serialize(self):
+        return ''.join(self.lines)
+
+    def save(self, path=None):
+        """임시 파일에 쓴 뒤 교체하여 원자적으로 저장합니다."""
+        path = path or self.path
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(self.serialize())
+        os.replace(tmp_path, path)
+
+
+def main(paths):
+    failed = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        started = time.perf_counter()
+        parsed = LangFile.from_text(raw.decode('utf-8'), path)
+        elapsed = time.perf_counter() - started
+        round_trip = parsed.serialize().encode('utf-8') == raw
+        failed += not round_trip
+        print(f"{path}: {len(parsed.lines)} lines, {len(parsed.entries)} entries, "
+              f"{len(parsed.todo_lines)} TODO, parsed in {elapsed * 1000:.1f}ms, "
+              f"round-trip {'ok' if round_trip else 'MISMATCH'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 lang_file.py <file.lang> [...]")
+        sys.exit(1)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+번역문이 원문의 플레이스홀더/마크업을 그대로 유지하는지 검사합니다.
+
+원문과 번역문에서 `{0}`, `{name}`, ICU plural/select 블록, `<color=...>` 같은 태그,
+`[TMP]`, `\\n`, `%s` 등을 뽑아 "시그니처"를 만들고 두 시그니처를 비교합니다.
+번역 파이프라인에서는 통과하지 못한 항목을 다시 번역 큐에 넣고,
+단독으로 실행하면 기존 ko-KR 파일 전체를 검사하는 린터로 동작합니다.
+
+사용법:
+  python3 scripts/lang_validate.py <en-US 파일/폴더> <ko-KR 파일/폴더>
+"""
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+import lang_file
+
+TAG_RE = re.compile(r'</?[A-Za-z][A-Za-z0-9_-]*(?:\s*=\s*[^<>]*)?>')
+BRACKET_RE = re.compile(r'\[[A-Z][A-Z0-9_]*\]')
+ESCAPE_RE = re.compile(r'\\[nrt]')
+PRINTF_RE = re.compile(r'%(?:\d+\$)?[-+ 0#]*\d*(?:\.\d+)?[sdfx%]')
+# 단순 인자({0}, {name}, {count, number})와 ICU 블록 시작({count, plural, ...) 구분용
+ARG_HEAD_RE = re.compile(r'\s*([A-Za-z0-9_.]+)\s*(?:,\s*([A-Za-z]+)\s*)?(?:,|})')
+SELECTOR_RE = re.compile(r'\s*(offset:\d+\s*)?(=?[A-Za-z0-9_]+)\s*{')
+ICU_BLOCK_TYPES = ("plural", "select", "selectordinal")
+
+
+class IcuError(ValueError):
+    """kind는 위치가 빠진 오류 종류 (원문과 번역문의 시그니처 비교용)"""
+
+    def __init__(self, kind, pos=None):
+        super().__init__(kind if pos is None else f"{kind} at {pos}")
+        self.kind = kind
+
+
+def _parse_icu(text, pos, tokens, prefix):
+    """
+    text[pos]가 '{'인 위치부터 인자 하나를 읽고 닫는 '}' 다음 위치를 반환합니다.
+    ICU 블록이면 선택자 목록과 각 분기 안의 토큰을 prefix를 붙여 tokens에 추가합니다.
+    """
+    match = ARG_HEAD_RE.match(text, pos + 1)
+    if not match:
+        # JSON 예시처럼 ICU 인자가 아닌 중괄호는 짝만 맞춰 건너뜀
+        depth = 0
+        for end in range(pos, len(text)):
+            if text[end] == '{':
+                depth += 1
+            elif text[end] == '}':
+                depth -= 1
+                if depth == 0:
+                    return end + 1
+        raise IcuError("unbalanced '{'", pos)
+
+    name, arg_type = match.group(1), (match.group(2) or "").lower()
+    if arg_type not in ICU_BLOCK_TYPES:
+        end = text.find('}', pos)
+        if end == -1:
+            raise IcuError("unbalanced '{'", pos)
+        tokens.append(f"{prefix}{{{name}{',' + arg_type if arg_type else ''}}}")
+        return end + 1
+
+    pos = match.end()
+    selectors = []
+    while True:
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos >= len(text):
+            raise IcuError("unterminated ICU block")
+        if text[pos] == '}':
+            pos += 1
+            break
+        selector = SELECTOR_RE.match(text, pos)
+        if not selector:
+            raise IcuError("bad ICU selector", pos)
+        selectors.append(selector.group(2))
+        pos = _scan_message(text, selector.end(), tokens, f"{prefix}{name}.{selector.group(2)}>", '}')
+    tokens.append(f"{prefix}{{{name},{arg_type}:{'|'.join(sorted(selectors))}}}")
+    return pos
+
+
+def _scan_message(text, pos, tokens, prefix, closing=None):
+    """closing 문자('}')를 만날 때까지 메시지 본문을 읽으며 인자 토큰을 모읍니다."""
+    while pos < len(text):
+        ch = text[pos]
+        if ch == '{':
+            pos = _parse_icu(text, pos, tokens, prefix)
+            continue
+        if ch == '}':
+            if closing:
+                return pos + 1
+            raise IcuError("unbalanced '}'", pos)
+        if ch == '#' and prefix:
+            tokens.append(f"{prefix}#")
+        pos += 1
+    if closing:
+        raise IcuError("unterminated ICU branch")
+    return pos
+
+
+def signature(text):
+    """텍스트의 플레이스홀더/마크업 토큰을 순서와 무관한 Counter로 반환합니다."""
+    tokens = []
+    if '{' in text or '}' in text:
+        try:
+            _scan_message(text, 0, tokens, "")
+        except IcuError as e:
+            # 위치는 번역문마다 다르므로 종류만 비교
+            tokens.append(f"!{e.kind}")
+    if '<' in text:
+        tokens.extend(tag.lower().replace(" ", "") for tag in TAG_RE.findall(text))
+    if '[' in text:
+        tokens.extend(BRACKET_RE.findall(text))
+    if '\\' in text:
+        tokens.extend(ESCAPE_RE.findall(text))
+    if '%' in text:
+        tokens.extend(PRINTF_RE.findall(text))
+    return Counter(tokens)
+
+
+def compare(source, translation):
+    """
+    원문과 번역문의 시그니처 차이를 (빠진 토큰, 추가된 토큰) 리스트로 반환합니다.
+    둘 다 비어 있으면 통과입니다.
+    """
+    expected = signature(source)
+    actual = signature(translation)
+    if expected == actual:
+        return [], []
+    missing = sorted((expected - actual).elements())
+    extra = sorted((actual - expected).elements())
+    return missing, extra
+
+
+def is_valid(source, translation):
+    missing, extra = compare(source, translation)
+    return not missing and not extra
+
+
+def load_values(path):
+    """키 = 값 쌍을 읽고 '\\'로 이어지는 여러 줄 값은 줄바꿈으로 합쳐 반환합니다."""
+    return lang_file.LangFile.load(path).values()
+
+
+def _pair_files(en_path, ko_path):
+    if os.path.isfile(en_path):
+        return [(en_path, ko_path, os.path.basename(ko_path))]
+    pairs = []
+    for root, _, files in os.walk(ko_path):
+        for name in sorted(files):
+            if not name.endswith('.lang'):
+                continue
+            ko_file = os.path.join(root, name)
+            rel = os.path.relpath(ko_file, ko_path)
+            en_file = os.path.join(en_path, rel)
+            if os.path.exists(en_file):
+                pairs.append((en_file, ko_file, rel))
+    return pairs
+
+
+def lint(en_path, ko_path):
+    """en/ko 파일(또는 폴더)을 비교해 문제 목록을 출력하고 문제 개수를 반환합니다."""
+    started = time.perf_counter()
+    checked = 0
+    problems = 0
+    for en_file, ko_file, rel in _pair_files(en_path, ko_path):
+        en_values = load_values(en_file)
+        for key, translation in load_values(ko_file).items():
+            source = en_values.get(key)
+            if source is None:
+                continue
+            checked += 1
+            missing, extra = compare(source, translation)
+            if missing or extra:
+                problems += 1
+                detail = []
+                if missing:
+                    detail.append(f"missing {' '.join(missing)}")
+                if extra:
+                    detail.append(f"extra {' '.join(extra)}")
+                print(f"{rel}: {key}: {'; '.join(detail)}")
+    elapsed = time.perf_counter() - started
+    rate = checked / elapsed if elapsed > 0 else 0
+    print(f"Checked {checked} strings in {elapsed:.2f}s ({rate:.0f}/s), {problems} problems")
+    return problems
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python3 lang_validate.py <en-US file/dir> <ko-KR file/dir>")
+        sys.exit(1)
+    sys.exit(1 if lint(sys.argv[1], sys.argv[2]) else 0)
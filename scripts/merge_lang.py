@@ -1,86 +1,314 @@
 #!/usr/bin/env python3
+"""
+원본(en-US) .lang 파일에 한국어 번역을 덮어써 설치용 ko-KR 파일을 만듭니다.
+
+여러 파일을 한 프로세스에서 병합할 수 있습니다 (파일마다 인터프리터를 새로 띄우지 않음).
+
+사용법:
+  python3 merge_lang.py <base_en_US> <patch_ko_KR> <output_ko_KR>
+  python3 merge_lang.py [--jobs N] [--json] \\
+      [--pair <base> <patch> <output>]... [--dir <base_dir> <patch_dir> <output_dir>]... \\
+      [--zip-dir <zip> <member_prefix> <patch_dir> <output_dir>]... [--manifest <pairs.json>]
+
+--dir은 patch_dir의 *.lang 중 base_dir에 원본이 있는 파일만 병합합니다.
+--zip-dir은 원본을 zip(Assets.zip) 안의 member_prefix 아래에서 찾아 임시 폴더에 풀지 않고
+메모리로 바로 읽습니다 (여러 스레드에서 동시에 압축 해제). zip이 없으면 건너뜁니다.
+--manifest는 [{"base": ..., "patch": ..., "output": ...}, ...] 형식의 JSON 파일입니다.
+병합 결과는 (원본 해시, 번역 파일 해시, MERGER_VERSION)을 키로 .cache/merged에 캐시되고
+(이번 실행에서 쓰지 않은 항목은 실행이 끝날 때 지움), 설치된 파일이 이미 같은 내용이면
+다시 쓰지 않습니다 (쓸 때는 임시 파일 교체로 원자적).
+"""
+import argparse
+import hashlib
+import json
 import sys
 import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import lang_file
+
+# 병합 규칙이 바뀌면 올려서 캐시된 결과를 무효화
+MERGER_VERSION = 3
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.getenv("MERGE_CACHE_DIR", os.path.join(PROJECT_DIR, ".cache", "merged"))
+# zip 멤버 압축 해제 스레드 수 (zlib은 GIL을 풀고 동작)
+ZIP_THREADS = int(os.getenv("MERGE_ZIP_THREADS", str(min(8, os.cpu_count() or 1))))
 
 def load_translations(patch_file):
     """
-    번역 파일(patch_file)을 읽어서 {key: value} 딕셔너리로 반환합니다.
-    주석이나 빈 줄은 무시합니다.
+    번역 파일(patch_file)을 읽어서 {key: 번역된 줄 목록} 딕셔너리로 반환합니다.
+    여러 줄 값은 이어지는 줄까지 함께 담기며, 아직 TODO인 키는 제외합니다.
     """
     translations = {}
     if not os.path.exists(patch_file):
         return translations
 
     try:
-        with open(patch_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    translations[key.strip()] = value.strip()
+        patch = lang_file.LangFile.load(patch_file)
+        for entry in patch.entries:
+            if entry.todo:
+                continue
+            translations[entry.key] = [patch.content(i) + "\n" for i in entry.span]
     except Exception as e:
         print(f"⚠️  번역 파일 읽기 오류 ({patch_file}): {e}", file=sys.stderr)
-    
+
     return translations
 
-def merge_lang_files(base_file, patch_file, output_file):
+def render(base_file, patch_file):
     """
     base_file(원본 영어)을 한 줄씩 읽으면서,
-    patch_file(한국어)에 해당 키가 있다면 값을 교체하여
-    output_file에 씁니다.
+    patch_file(한국어)에 해당 키가 있다면 값을 교체한 내용을
+    (텍스트, 교체된 키 수, 전체 키 수)로 반환합니다.
+    base_file은 경로 또는 이미 읽은 내용(bytes)이며, 원본 파일이 없으면 빈 파일로 취급합니다.
     """
     translations = load_translations(patch_file)
     replaced_count = 0
     total_count = 0
 
+    if isinstance(base_file, bytes):
+        base = lang_file.LangFile.from_text(base_file.decode('utf-8'))
+    elif os.path.exists(base_file):
+        base = lang_file.LangFile.load(base_file)
+    else:
+        base = lang_file.LangFile([], base_file)
+    starts = {entry.start: entry for entry in base.entries}
+
+    out = []
+    i = 0
+    while i < len(base.lines):
+        entry = starts.get(i)
+
+        # 주석, 빈 줄, 알 수 없는 줄은 그대로 복사 (개행은 번역 줄과 같게 \n으로)
+        if entry is None:
+            out.append(lang_file.normalize_newline(base.lines[i]))
+            i += 1
+            continue
+
+        # 키-값 쌍인 경우: 번역이 있으면 (이어지는 줄 포함) 블록째 교체
+        total_count += 1
+        if entry.key in translations:
+            out.extend(translations[entry.key])
+            replaced_count += 1
+        else:
+            # 번역 없으면 원본(영어) 유지
+            out.extend(lang_file.normalize_newline(line) for line in base.lines[entry.start:entry.end])
+        i = entry.end
+
+    return ''.join(out), replaced_count, total_count
+
+def file_digest(path):
+    """파일 내용의 sha256 (없는 파일은 빈 내용으로 취급, bytes는 그 내용의 해시)"""
+    if isinstance(path, bytes):
+        return hashlib.sha256(path).hexdigest()
+    digest = hashlib.sha256()
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def cache_key(base_file, patch_file):
+    raw = f"{file_digest(base_file)}:{file_digest(patch_file)}:{MERGER_VERSION}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def write_if_changed(path, data):
+    """설치된 파일이 이미 같은 내용이면 건드리지 않고 False를 반환합니다 (mtime 유지)."""
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    write_atomic(path, data)
+    return True
+
+def merge(base_file, patch_file, output_file, cache_dir=None):
+    """
+    base_file에 patch_file 번역을 덮어써 output_file에 쓰고
+    {"output", "replaced", "total", "cached", "written"}(캐시를 쓰면 "cache_key"도)을 반환합니다.
+    병합 결과는 (원본 해시, 번역 파일 해시, MERGER_VERSION)을 키로 cache_dir에 저장해 재사용합니다.
+    """
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    key = cache_key(base_file, patch_file) if cache_dir else None
+    data_path = os.path.join(cache_dir, key + ".lang") if key else None
+    stats_path = os.path.join(cache_dir, key + ".json") if key else None
+
+    stats = None
+    if key and os.path.exists(data_path) and os.path.exists(stats_path):
+        try:
+            with open(stats_path, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+            with open(data_path, 'rb') as f:
+                data = f.read()
+        except (OSError, ValueError):
+            stats = None
+    cached = stats is not None
+    if not cached:
+        text, replaced_count, total_count = render(base_file, patch_file)
+        data = text.encode('utf-8')
+        stats = {"replaced": replaced_count, "total": total_count}
+        if key:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_atomic(data_path, data)
+            write_atomic(stats_path, json.dumps(stats).encode('utf-8'))
+
     # 출력 디렉토리 생성
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    written = write_if_changed(output_file, data)
+    result = {"output": str(output_file), "replaced": stats["replaced"], "total": stats["total"],
+              "cached": cached, "written": written}
+    if key:
+        result["cache_key"] = key
+    return result
 
-    try:
-        with open(base_file, 'r', encoding='utf-8') as f_in, \
-             open(output_file, 'w', encoding='utf-8') as f_out:
-            
-            for line in f_in:
-                stripped = line.strip()
-                
-                # 주석이나 빈 줄은 그대로 복사
-                if not stripped or stripped.startswith('#'):
-                    f_out.write(line)
-                    continue
-
-                # 키-값 쌍인 경우 처리
-                if '=' in stripped:
-                    total_count += 1
-                    key, original_val = stripped.split('=', 1)
-                    key = key.strip()
-                    
-                    if key in translations:
-                        # 번역이 있으면 교체 (줄바꿈 유지 등을 위해 포맷팅 주의)
-                        # 원본 라인의 앞 공백(들여쓰기) 등은 유지하기 어려우므로 표준 포맷으로 작성
-                        # Hytale은 보통 "key=value" 또는 "key = value" 사용
-                        # 여기서는 깔끔하게 "key = value"로 통일하거나 원본 스타일 유지 가능
-                        # 안전하게 새로 작성:
-                        new_value = translations[key]
-                        f_out.write(f"{key} = {new_value}\n")
-                        replaced_count += 1
-                    else:
-                        # 번역 없으면 원본(영어) 유지
-                        f_out.write(line)
-                else:
-                    # 포맷을 알 수 없는 줄은 그대로 복사
-                    f_out.write(line)
-
-        print(f"   ✓ 병합 완료: {os.path.basename(output_file)} (번역률: {replaced_count}/{total_count})")
+def prune_cache(cache_dir, keep):
+    """cache_dir에서 캐시 키가 keep에 없는 병합 결과를 지우고 지운 항목 수를 반환합니다."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    removed = set()
+    for name in os.listdir(cache_dir):
+        key, ext = os.path.splitext(name)
+        if ext in (".lang", ".json") and key not in keep:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                continue
+            removed.add(key)
+    return len(removed)
 
+def merge_lang_files(base_file, patch_file, output_file):
+    """파일 하나를 병합하고 결과를 출력합니다 (실패 시 종료 코드 1)."""
+    try:
+        stats = merge(base_file, patch_file, output_file)
     except Exception as e:
         print(f"❌ 병합 실패: {e}", file=sys.stderr)
         sys.exit(1)
+    print_stats([stats])
+    return stats
+
+def _merge_pair(pair, cache_dir=None):
+    base_file, patch_file, output_file = (path if isinstance(path, bytes) else str(path) for path in pair)
+    try:
+        return merge(base_file, patch_file, output_file, cache_dir)
+    except Exception as e:
+        return {"output": output_file, "replaced": 0, "total": 0, "error": str(e)}
+
+def collect_pairs(base_dir, patch_dir, output_dir):
+    """patch_dir의 *.lang 중 base_dir에 같은 이름의 원본이 있는 (base, patch, output) 목록"""
+    if not os.path.isdir(base_dir) or not os.path.isdir(patch_dir):
+        return []
+    pairs = []
+    for name in sorted(os.listdir(patch_dir)):
+        base_file = os.path.join(base_dir, name)
+        if name.endswith('.lang') and os.path.isfile(base_file):
+            pairs.append((base_file, os.path.join(patch_dir, name), os.path.join(output_dir, name)))
+    return pairs
+
+def read_zip_members(zf, members, threads=None):
+    """zip 멤버들을 스레드 풀에서 동시에 압축 해제해 {멤버: bytes}로 반환합니다."""
+    threads = min(threads or ZIP_THREADS, len(members))
+    if threads <= 1:
+        return {member: zf.read(member) for member in members}
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return dict(zip(members, executor.map(zf.read, members)))
+
+def collect_zip_pairs(zip_path, dirs, threads=None):
+    """
+    dirs의 (member_prefix, patch_dir, output_dir)마다 patch_dir의 *.lang 중
+    zip 안에 같은 이름의 원본이 있는 것을 골라 (원본 bytes, patch, output) 목록을 반환합니다.
+    디스크에는 아무것도 풀지 않습니다. zip이 없으면 빈 목록입니다.
+    """
+    if not zip_path or not os.path.isfile(zip_path):
+        return []
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        names = set(zf.namelist())
+        wanted = []
+        for prefix, patch_dir, output_dir in dirs:
+            if not os.path.isdir(patch_dir):
+                continue
+            prefix = prefix.rstrip('/') + '/'
+            for name in sorted(os.listdir(patch_dir)):
+                if name.endswith('.lang') and prefix + name in names:
+                    wanted.append((prefix + name, os.path.join(patch_dir, name), os.path.join(output_dir, name)))
+        data = read_zip_members(zf, [member for member, _, _ in wanted], threads)
+    return [(data[member], patch_file, output_file) for member, patch_file, output_file in wanted]
+
+def load_manifest(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(item["base"], item["patch"], item["output"]) for item in json.load(f)]
+
+def merge_pairs(pairs, jobs=1, cache_dir=None):
+    """
+    (base, patch, output) 목록을 한 프로세스에서 병합하고 파일별 통계를 입력 순서대로 반환합니다.
+    jobs > 1이면 프로세스 풀로 나눠 처리합니다. 실패한 파일은 "error" 항목을 가집니다.
+    cache_dir을 ""로 주면 병합 결과 캐시를 쓰지 않습니다. 게임 업데이트나 번역 수정으로 더 이상 쓰이지 않는
+    캐시 항목이 쌓이지 않도록, 이번에 병합한 파일들이 쓰지 않은 항목은 끝날 때 지웁니다.
+    """
+    pairs = list(pairs)
+    jobs = min(jobs, len(pairs))
+    if jobs <= 1:
+        results = [_merge_pair(pair, cache_dir) for pair in pairs]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_merge_pair, pairs, [cache_dir] * len(pairs)))
+    if results and cache_dir != "":
+        prune_cache(CACHE_DIR if cache_dir is None else cache_dir,
+                    {stats["cache_key"] for stats in results if "cache_key" in stats})
+    return results
+
+def print_stats(results):
+    for stats in results:
+        name = os.path.basename(stats["output"])
+        if "error" in stats:
+            print(f"❌ 병합 실패: {name}: {stats['error']}", file=sys.stderr)
+        else:
+            unchanged = "" if stats.get("written", True) else ", 변경 없음"
+            print(f"   ✓ 병합 완료: {name} (번역률: {stats['replaced']}/{stats['total']}{unchanged})")
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Merge ko-KR translations into en-US .lang files")
+    parser.add_argument("--pair", nargs=3, action="append", default=[], metavar=("BASE", "PATCH", "OUTPUT"))
+    parser.add_argument("--dir", nargs=3, action="append", default=[], metavar=("BASE_DIR", "PATCH_DIR", "OUTPUT_DIR"))
+    parser.add_argument("--zip-dir", nargs=4, action="append", default=[],
+                        metavar=("ZIP", "MEMBER_PREFIX", "PATCH_DIR", "OUTPUT_DIR"))
+    parser.add_argument("--manifest", action="append", default=[])
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes (0 = CPU count)")
+    parser.add_argument("--json", action="store_true", help="print per-file stats as JSON")
+    parser.add_argument("--cache-dir", default=None, help=f"merged output cache (default {CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    pairs = [tuple(pair) for pair in args.pair]
+    for base_dir, patch_dir, output_dir in args.dir:
+        pairs.extend(collect_pairs(base_dir, patch_dir, output_dir))
+    zip_dirs = {}
+    for zip_path, prefix, patch_dir, output_dir in args.zip_dir:
+        zip_dirs.setdefault(zip_path, []).append((prefix, patch_dir, output_dir))
+    for zip_path, dirs in zip_dirs.items():
+        pairs.extend(collect_zip_pairs(zip_path, dirs))
+    for manifest in args.manifest:
+        pairs.extend(load_manifest(manifest))
+
+    cache_dir = "" if args.no_cache else args.cache_dir
+    results = merge_pairs(pairs, args.jobs or os.cpu_count() or 1, cache_dir)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_stats(results)
+    return 1 if any("error" in stats for stats in results) else 0
 
 if __name__ == "__main__":
-    if len(sys.argv) < 4:
+    if len(sys.argv) == 4 and not sys.argv[1].startswith("--"):
+        merge_lang_files(sys.argv[1], sys.argv[2], sys.argv[3])
+        sys.exit(0)
+    if len(sys.argv) < 2:
         print("Usage: python3 merge_lang.py <base_en_US> <patch_ko_KR> <output_ko_KR>")
+        print("       python3 merge_lang.py [--jobs N] [--json] [--pair B P O]... [--dir B P O]... "
+              "[--zip-dir ZIP PREFIX P O]... [--manifest F]")
         sys.exit(1)
-    
-    merge_lang_files(sys.argv[1], sys.argv[2], sys.argv[3])
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+번역 파이프라인 처리량 벤치마크.
+
+로컬 스텁 서버를 띄우고 합성 .lang 파일에 대해 process_translation을 끝까지 실행한 뒤
+초당 문자열 수, 배치 지연 시간(p50/p99), 재시도 횟수를 출력합니다. API 할당량을 쓰지 않습니다.
+
+사용법:
+  python3 scripts/translate_bench.py [--strings 2000] [--latency 0.5] [--error-rate 0.05] \\
+      [--drop-rate 0.02] [--concurrency 4] [--budget 6000]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import translate_gemini
+import translation_backends
+import translation_stub
+
+
+def write_synthetic_lang(path, count):
+    """플레이스홀더, 태그, 여러 줄 값이 섞인 번역 대상 파일을 만듭니다."""
+    lines = ["# === bench ===\n"]
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            lines.append(f"bench.item{i}.name = Ancient relic number {i} # TODO: Translate\n")
+        elif kind == 1:
+            lines.append(f"bench.item{i}.desc = <i>A sword forged for hero {i}.</i> # TODO: Translate\n")
+        elif kind == 2:
+            lines.append(f"bench.msg{i} = Player {{name}} found {{count}} items in zone {i} # TODO: Translate\n")
+        elif kind == 3:
+            lines.append(f"bench.plural{i} = {{count, plural, one {{# block {i}}} other {{# blocks {i}}}}} # TODO: Translate\n")
+        else:
+            lines.append(f"bench.multi{i} = First line of entry {i}\\ # TODO: Translate\n")
+            lines.append(f"second line of entry {i} # TODO: TranslateLine\n")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translation pipeline benchmark against a local stub")
+    parser.add_argument("--strings", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=translate_gemini.MAX_CONCURRENCY)
+    parser.add_argument("--budget", type=int, default=translate_gemini.TOKEN_BUDGET)
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute (0 = unlimited)")
+    args = parser.parse_args()
+
+    config = translation_stub.StubConfig(args.latency, args.jitter, args.error_rate, args.drop_rate, seed=1)
+    server, url = translation_stub.start_server(config)
+
+    translate_gemini.USE_TRANSLATION_MEMORY = False
+    translate_gemini.USE_CONTEXT_CACHE = False
+    translate_gemini.MAX_CONCURRENCY = args.concurrency
+    translate_gemini.TOKEN_BUDGET = args.budget
+    translate_gemini.REQUESTS_PER_MINUTE = args.rpm
+
+    work_dir = tempfile.mkdtemp(prefix="translate_bench_")
+    try:
+        lang_path = os.path.join(work_dir, "bench.lang")
+        write_synthetic_lang(lang_path, args.strings)
+        backend = translation_backends.StubBackend(url)
+
+        started = time.perf_counter()
+        batcher = translate_gemini.process_translation(lang_path, api_key=None, backend=backend)
+        elapsed = time.perf_counter() - started
+
+        with open(lang_path, 'r', encoding='utf-8') as f:
+            remaining = sum(1 for line in f if "# TODO: Translate" in line)
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    stats = batcher.stats if batcher else []
+    latencies = [stat["latency"] for stat in stats]
+    requested = sum(stat["size"] for stat in stats)
+    translated = len(batcher.to_translate) - len(batcher.failed) if batcher else 0
+
+    print("")
+    print("=== Benchmark ===")
+    print(f"   strings:     {len(batcher.to_translate) if batcher else 0} "
+          f"(concurrency {args.concurrency}, budget {args.budget} tokens)")
+    print(f"   elapsed:     {elapsed:.2f}s")
+    print(f"   throughput:  {translated / elapsed if elapsed else 0:.1f} strings/s")
+    print(f"   batches:     {len(stats)} (stub requests {config.requests}, errors {config.errors})")
+    print(f"   latency:     p50 {percentile(latencies, 0.5):.2f}s, p99 {percentile(latencies, 0.99):.2f}s")
+    print(f"   retries:     {requested - (len(batcher.to_translate) if batcher else 0)} strings re-requested")
+    print(f"   unfinished:  {remaining} lines still marked TODO")
+
+
+if __name__ == "__main__":
+    main()
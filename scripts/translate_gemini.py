@@ -1,49 +1,45 @@
 import os
-from google import genai
+import hashlib
 import re
 from dotenv import load_dotenv
 
+import batch_planner
+import glossary
+import lang_file
+import lang_validate
+import translation_backends
+import translation_engine
+import translation_memory
+from translation_journal import TranslationJournal
+from translation_memory import TranslationMemory
+
 load_dotenv()
 
 MODEL_ID = os.getenv("GEMINI_MODEL_ID", "gemini-3-pro-preview")
+# 한 요청의 토큰 예산과 최대 문자열 수, 동시 요청 수, 분당 요청 수
+TOKEN_BUDGET = int(os.getenv("GEMINI_TOKEN_BUDGET", "6000"))
+CHUNK_SIZE = int(os.getenv("GEMINI_CHUNK_SIZE", "200"))
+MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+# 누락되거나 잘린 문자열을 다시 요청하는 최대 횟수
+MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+# "0"이면 번역 메모리를 사용하지 않음
+USE_TRANSLATION_MEMORY = os.getenv("TRANSLATION_MEMORY", "1") != "0"
+# "1"이면 이전 실행의 저널에서 이어서 번역
+RESUME = os.getenv("TRANSLATE_RESUME", "0") == "1"
+# "0"이면 프롬프트 접두사를 캐시된 컨텍스트로 보내지 않음
+USE_CONTEXT_CACHE = os.getenv("GEMINI_CONTEXT_CACHE", "1") != "0"
+CONTEXT_CACHE_TTL = os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600s")
 
 
-def translate_batch(texts, api_key):
-    if not texts:
-        return {}
-    
-    client = genai.Client(api_key=api_key)
-    
-    prompt_prefix = """**당신은 "AAA급 샌드박스 RPG 게임 전문 로컬라이제이션 디렉터"입니다.**
+PROMPT_PREFIX = """**당신은 "AAA급 샌드박스 RPG 게임 전문 로컬라이제이션 디렉터"입니다.**
 당신의 임무는 제공된 영어 리소스 파일(`key = value` 형식)을 **완벽하고 자연스러운 한국어**로 번역하는 것입니다. 이 게임은 모험(Adventure), 건축(Creative), 모딩 툴(Asset Editor)이 결합된 게임(Hytale 스타일)입니다.
 
 다음 가이드라인을 철저히 준수하십시오.
 
 #### 1. 용어 및 고유명사 통일 (Glossary)
 아래의 용어집을 최우선으로 적용하십시오.
-*   **게임 모드:** Adventure Mode → 모험 모드, Creative Mode → 크리에이티브 모드
-*   **종족/세력:**
-    *   Kweebec → 퀴벡 (숲의 종족)
-    *   Trork → 트로크 (오크/트롤 유사 종족)
-    *   Feran → 페란 (여우/늑대 수인)
-    *   Outlander → 아웃랜더 (적대 세력)
-    *   Gaia → 가이아 / Orbis → 오르비스 (세계관 명칭)
-    *   Void → 공허 / Scaraks → 스카락 (곤충형 적)
-*   **시스템/툴 용어:**
-    *   Prefab → 프리팹 (건축물 덩어리)
-    *   Chunk → 청크 (맵 데이터 단위)
-    *   Asset → 에셋
-    *   Entity → 엔티티 (기술적 문맥) / 개체 (인게임 생물 문맥)
-    *   Hitbox → 히트박스
-    *   Spawn → 소환 (능동적) / 생성 (자동/수동적)
-    *   Auth/Authentication → 인증
-*   **아이템/장비 (중요 - 동음이의어 주의):**
-    *   **Chest (보관함/가구) → 상자**
-    *   **Chest (방어구 슬롯) → 흉갑 / 가슴**
-    *   **Back (UI 버튼) → 뒤로**
-    *   **Back (장비 슬롯/망토) → 등**
-    *   Legs (방어구) → 하의 / 다리
-    *   Hands (방어구) → 장갑 / 손
+""" + glossary.render_prompt() + """
 
 #### 2. 어조 및 톤 (Tone & Manner)
 *   **UI/시스템 (간결함):** 명사형 종결을 선호합니다. (예: "Connecting..." → "연결 중...", "Settings" → "설정")
@@ -77,46 +73,88 @@ def translate_batch(texts, api_key):
 
 [작업 대상]
 """
+# 용어집 섹션은 src/glossary/glossary.json에서 생성 (로컬 사전 번역과 같은 데이터)
+# 프롬프트(용어집 포함)가 바뀌면 번역 메모리도 새로 쌓이도록 버전을 해시로 관리
+PROMPT_VERSION = hashlib.sha256(PROMPT_PREFIX.encode('utf-8')).hexdigest()[:12]
+
+
+def create_prefix_cache(backend):
+    """
+    PROMPT_PREFIX를 캐시된 컨텍스트로 등록하고 캐시 이름을 반환합니다.
+    백엔드/모델이 캐시를 지원하지 않거나 접두사가 최소 토큰 수보다 작으면 None을 반환합니다.
+    """
+    if not USE_CONTEXT_CACHE or not backend.supports_cache:
+        return None
+    return backend.create_cache(PROMPT_PREFIX, CONTEXT_CACHE_TTL)
+
+
+def translate_batch(texts, backend, cached_content=None, on_result=None):
+    """
+    응답을 스트림으로 받아 `[index] text` 줄이 완성될 때마다 on_result(key, text)를 호출합니다.
+    요청이 실패하면 그때까지 받은 결과를 담은 translation_engine.BatchError를 냅니다.
+    """
+    if not texts:
+        return {}
     
     content_to_translate = ""
     for i, (key, text) in enumerate(texts.items()):
         content_to_translate += f"[{i}] {text}\n"
     
-    full_prompt = prompt_prefix + content_to_translate + "\n\nRespond only with the translations in the following format:\n[index] translated_text"
+    instruction = "\n\nRespond only with the translations in the following format:\n[index] translated_text"
     
+    results = {}
+    translated_lines = []
+    keys_list = list(texts.keys())
+
+    def handle_line(line):
+        line = line.strip()
+        if not line:
+            return
+        translated_lines.append(line)
+        match = re.match(r'\[(\d+)\]\s*(.*)', line)
+        if match:
+            idx = int(match.group(1))
+            if idx < len(keys_list):
+                key = keys_list[idx]
+                results[key] = match.group(2).strip()
+                if on_result:
+                    on_result(key, results[key])
+
     try:
-        response = client.models.generate_content(model=MODEL_ID, contents=full_prompt)
-        results = {}
-        translated_lines = [line.strip() for line in response.text.splitlines() if line.strip()]
-        
-        keys_list = list(texts.keys())
-        for line in translated_lines:
-            match = re.match(r'\[(\d+)\]\s*(.*)', line)
-            if match:
-                idx = int(match.group(1))
-                if idx < len(keys_list):
-                    results[keys_list[idx]] = match.group(2).strip()
-        if results:
-            return results
-
-        if len(translated_lines) == len(keys_list):
-            for idx, line in enumerate(translated_lines):
-                cleaned = re.sub(r'^\[\d+\]\s*', '', line).strip()
-                results[keys_list[idx]] = cleaned
-        return results
+        if cached_content:
+            stream = backend.stream(content_to_translate + instruction, cached_content)
+        else:
+            stream = backend.stream(PROMPT_PREFIX + content_to_translate + instruction)
+
+        buffer = ""
+        for text in stream:
+            buffer += text
+            *complete, buffer = buffer.split("\n")
+            for line in complete:
+                handle_line(line)
+        handle_line(buffer)
     except Exception as e:
-        print(f"Gemini translation error: {e}")
-        return {}
+        # 엔진이 오류로 처리해 배치 크기를 줄이도록 예외로 넘기되, 이미 받은 번역은 함께 전달
+        raise translation_engine.BatchError(f"{backend.name} translation error: {e}", results) from e
+
+    if results:
+        return results
 
-def process_translation(file_path, api_key):
-    if not os.path.exists(file_path):
-        return
+    if len(translated_lines) == len(keys_list):
+        for idx, line in enumerate(translated_lines):
+            cleaned = re.sub(r'^\[\d+\]\s*', '', line).strip()
+            results[keys_list[idx]] = cleaned
+    return results
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
 
+def collect_pending(lines):
+    """
+    TODO 마커가 붙은 줄을 찾아 번역 대상({줄 번호: 원문})과
+    적용 정보({줄 번호: 메타데이터})를 반환합니다.
+    """
     to_translate = {}
     updates = {}
+    parsed = lang_file.LangFile(lines)
 
     def is_escape_only(text):
         stripped = text.strip()
@@ -137,74 +175,45 @@ def process_translation(file_path, api_key):
             and not re.search(r'[가-힣]', text)
         )
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if '# TODO: TranslateLine' in line and ' = ' not in line:
-            raw = line.split(' # TODO: TranslateLine', 1)[0].rstrip('\n')
-            trimmed = raw.rstrip()
-            suffix = "\\" if trimmed.endswith('\\') else ""
-            content = trimmed[:-1] if suffix else trimmed
-            content = content.rstrip()
-            if needs_translation(content):
-                indent = raw[:len(raw) - len(raw.lstrip())]
-                to_translate[str(i)] = content
-                updates[str(i)] = {
-                    "type": "line",
-                    "indent": indent,
-                    "suffix": suffix,
-                }
-            i += 1
-            continue
-        if '# TODO: Translate' in line and ' = ' in line:
-            parts = line.split(' = ', 1)
-            if len(parts) == 2:
-                key_part = parts[0]
-                raw_value = parts[1].split(' # TODO: Translate', 1)[0]
-                raw_value = raw_value.rstrip('\n')
-                line_suffix = "\\" if raw_value.rstrip().endswith('\\') else ""
-                value = raw_value.rstrip().rstrip('\\').rstrip()
-                to_translate[str(i)] = value
-                updates[str(i)] = {
-                    "type": "key",
-                    "key_part": key_part,
-                    "suffix": line_suffix,
-                }
-
-                if line_suffix:
-                    j = i + 1
-                    while j < len(lines):
-                        cont_line = lines[j]
-                        cont_no_nl = cont_line.rstrip('\n')
-                        if ' = ' in cont_no_nl and not cont_no_nl.lstrip().startswith('#'):
-                            break
-                        cont_trimmed = cont_no_nl.rstrip()
-                        cont_suffix = "\\" if cont_trimmed.endswith('\\') else ""
-                        cont_content = cont_trimmed[:-1] if cont_suffix else cont_trimmed
-                        cont_content = cont_content.rstrip()
-                        if needs_translation(cont_content):
-                            indent = cont_no_nl[:len(cont_no_nl) - len(cont_no_nl.lstrip())]
-                            to_translate[str(j)] = cont_content
-                            updates[str(j)] = {
-                                "type": "cont",
-                                "indent": indent,
-                                "suffix": cont_suffix,
-                            }
-                        if not cont_suffix:
-                            j += 1
-                            break
-                        j += 1
-                    i = j
-                    continue
-        i += 1
-
-    if not to_translate:
-        print(f"No new strings to translate in {os.path.basename(file_path)}")
-        return
-
-    print(f"Translating {len(to_translate)} strings in {os.path.basename(file_path)} via Gemini...")
-    translated_map = translate_batch(to_translate, api_key)
+    def add_line(i, meta):
+        raw = parsed.content(i)
+        trimmed = raw.rstrip()
+        suffix = "\\" if trimmed.endswith('\\') else ""
+        content = (trimmed[:-1] if suffix else trimmed).rstrip()
+        if needs_translation(content):
+            to_translate[str(i)] = content
+            updates[str(i)] = dict(meta, indent=raw[:len(raw) - len(raw.lstrip())], suffix=suffix)
+
+    todo_lines = set(parsed.todo_lines)
+    covered = set()
+    for entry in parsed.entries:
+        covered.update(entry.span)
+        if entry.todo:
+            raw_value = parsed.value_lines(entry)[0]
+            line_suffix = "\\" if raw_value.rstrip().endswith('\\') else ""
+            to_translate[str(entry.start)] = raw_value.rstrip().rstrip('\\').rstrip()
+            updates[str(entry.start)] = {
+                "type": "key",
+                "key_part": entry.key_part,
+                "suffix": line_suffix,
+            }
+        for i in range(entry.start + 1, entry.end):
+            if entry.todo:
+                add_line(i, {"type": "cont", "parent": str(entry.start)})
+            elif i in todo_lines:
+                add_line(i, {"type": "line"})
+
+    # 항목에 속하지 않은 TranslateLine 줄
+    for i in parsed.todo_lines:
+        if i not in covered:
+            add_line(i, {"type": "line"})
 
+    return to_translate, updates
+
+
+def apply_translations(lines, updates, translated_map):
+    """번역 결과를 lines에 반영하고 반영된 줄 수를 반환합니다."""
+    applied = 0
     for idx_str, meta in updates.items():
         if idx_str not in translated_map:
             continue
@@ -222,7 +231,171 @@ def process_translation(file_path, api_key):
                 lines[idx] = f"{meta['indent']}{translated}\\\n"
             else:
                 lines[idx] = f"{meta['indent']}{translated}\n"
+        applied += 1
+    return applied
+
+
+def process_translation(file_path, api_key, resume=None, backend=None):
+    """
+    resume이 True면 이전 실행의 저널(<파일>.journal)에 남은 번역을 먼저 적용하고 이어서 진행합니다.
+    """
+    return process_translations([file_path], api_key, resume, backend)
+
+
+def dedupe_pending(pending_by_file):
+    """
+    파일별 {줄 번호: 원문}을 정규화된 원문 기준으로 합칩니다.
+    고유 문자열 {uid: 원문}, uid별 메타데이터, uid → [(파일 번호, 줄 번호)] 매핑을 반환합니다.
+    """
+    unique = {}
+    unique_updates = {}
+    occurrences = {}
+    uid_by_text = {}
+    uid_by_line = {}
+    for file_no, (to_translate, updates) in enumerate(pending_by_file):
+        for idx, text in to_translate.items():
+            normalized = translation_memory.normalize(text)
+            uid = uid_by_text.get(normalized)
+            if uid is None:
+                uid = str(len(unique))
+                uid_by_text[normalized] = uid
+                unique[uid] = text
+                meta = {"type": updates[idx]["type"]}
+                parent = uid_by_line.get((file_no, updates[idx].get("parent")))
+                if meta["type"] == "cont" and parent is not None:
+                    meta["parent"] = parent
+                unique_updates[uid] = meta
+            uid_by_line[(file_no, idx)] = uid
+            occurrences.setdefault(uid, []).append((file_no, idx))
+    return unique, unique_updates, occurrences
+
+
+_pretranslator = None
+
+
+def pretranslate(to_translate, updates, journal):
+    """
+    용어집의 용어와 정확히 일치하거나 플레이스홀더만 있는 문자열을
+    API 없이 번역해 journal에 기록하고, 처리한 개수를 반환합니다.
+    """
+    global _pretranslator
+    if _pretranslator is None:
+        _pretranslator = glossary.Pretranslator()
+    resolved = 0
+    for idx, text in to_translate.items():
+        meta = updates[idx]
+        if idx in journal.applied or meta["type"] != "key" or meta["suffix"]:
+            continue
+        translated = _pretranslator.translate(text, meta["key_part"].strip())
+        if translated is not None:
+            journal.record(idx, translated)
+            resolved += 1
+    return resolved
+
+
+def process_translations(file_paths, api_key, resume=None, backend=None):
+    """
+    여러 .lang 파일의 번역 대상을 한 번에 모아 같은 원문은 한 번만 번역하고
+    결과를 해당 문자열이 필요한 모든 파일/줄에 적용합니다.
+    API로 번역한 경우 배치 통계를 담은 AdaptiveBatcher를 반환합니다.
+    """
+    if resume is None:
+        resume = RESUME
+
+    journals = []
+    pending_by_file = []
+    for file_path in file_paths:
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        to_translate, updates = collect_pending(lines)
+        if not to_translate:
+            print(f"No new strings to translate in {os.path.basename(file_path)}")
+            continue
+        journal = TranslationJournal(file_path, lines, updates, to_translate, apply_translations, resume=resume)
+        if journal.applied:
+            print(f"Resumed {len(journal.applied)} strings from {os.path.basename(file_path)} journal")
+        resolved = pretranslate(to_translate, updates, journal)
+        if resolved:
+            print(f"Resolved {resolved} strings in {os.path.basename(file_path)} locally from glossary")
+        journals.append(journal)
+        pending_by_file.append((
+            {idx: text for idx, text in to_translate.items() if idx not in journal.applied},
+            updates,
+        ))
+
+    if not journals:
+        return None
+
+    unique, unique_updates, occurrences = dedupe_pending(pending_by_file)
+    total = sum(len(to_translate) for to_translate, _ in pending_by_file)
+    if len(journals) > 1 or total != len(unique):
+        print(f"Deduplicated {total} pending strings across {len(journals)} files "
+              f"into {len(unique)} unique strings ({total - len(unique)} translations avoided)")
+
+    def record(uid, text):
+        for file_no, idx in occurrences[uid]:
+            journals[file_no].record(idx, text)
+
+    def applied_text(uid):
+        file_no, idx = occurrences[uid][0]
+        return journals[file_no].applied.get(idx)
+
+    memory = None
+    if USE_TRANSLATION_MEMORY:
+        memory = TranslationMemory(prompt_version=PROMPT_VERSION, model_id=MODEL_ID)
+        remembered = memory.lookup(unique)
+        for uid, text in remembered.items():
+            record(uid, text)
+        if remembered:
+            print(f"Reused {len(remembered)} strings from translation memory")
+    else:
+        remembered = {}
+
+    pending = {uid: text for uid, text in unique.items() if uid not in remembered}
+    batcher = None
+    if pending:
+        names = ", ".join(os.path.basename(journal.file_path) for journal in journals)
+        backend = backend or translation_backends.get_backend(api_key, MODEL_ID)
+        print(f"Translating {len(pending)} strings in {names} via {backend.name}...")
+        cached_content = create_prefix_cache(backend)
+        plan = batch_planner.plan_batches(
+            pending, unique_updates, TOKEN_BUDGET, CHUNK_SIZE,
+            prefix=PROMPT_PREFIX, cached_prefix=cached_content is not None,
+        )
+        print(plan.report())
+        naive_batches = sum(
+            len(batch_planner.plan_batches(to_translate, updates, TOKEN_BUDGET, CHUNK_SIZE).batches)
+            for to_translate, updates in pending_by_file
+        )
+        if naive_batches > len(plan.batches):
+            print(f"   {naive_batches - len(plan.batches)} requests avoided by cross-file deduplication "
+                  f"and translation memory")
+        batcher = translation_engine.AdaptiveBatcher(plan, unique_updates, max_attempts=MAX_ATTEMPTS)
+
+        def record_valid(uid, text):
+            # 플레이스홀더/태그가 깨진 번역은 기록하지 않고 엔진이 다시 요청하도록 둠
+            if lang_validate.is_valid(pending[uid], text):
+                record(uid, text)
+
+        fresh = translation_engine.translate_adaptive(
+            batcher,
+            lambda chunk: translate_batch(chunk, backend, cached_content, on_result=record_valid),
+            max_concurrency=MAX_CONCURRENCY,
+            per_minute=REQUESTS_PER_MINUTE,
+            validate=lang_validate.is_valid,
+        )
+        for uid, text in fresh.items():
+            record(uid, text)
+        if memory:
+            # 같은 번호가 두 번 오면 저널은 처음 번역을 적용하므로 파일에 실제로 들어간 번역을 저장
+            memory.store((pending[uid], text) for uid, text in
+                         ((uid, applied_text(uid)) for uid in pending) if text is not None)
+    if memory:
+        memory.close()
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.writelines(lines)
-    print(f"Successfully translated and updated {os.path.basename(file_path)}")
+    for journal in journals:
+        journal.close()
+        print(f"Successfully translated and updated {os.path.basename(journal.file_path)}")
+    return batcher
@@ -0,0 +1,89 @@
+"""
+번역 백엔드.
+
+translate_batch는 백엔드의 stream(prompt)로 응답 텍스트 조각을 받아 처리합니다.
+supports_cache가 True인 백엔드만 create_cache(prefix, ttl)를 가집니다.
+- GeminiBackend: google-genai 클라이언트를 API 키별로 하나만 만들어 재사용
+- StubBackend: 로컬 HTTP 스텁 서버(translation_stub.py)로 요청 (오프라인 벤치마크용)
+
+TRANSLATION_BACKEND=stub, TRANSLATION_STUB_URL=http://127.0.0.1:8765 로 스텁을 선택할 수 있습니다.
+"""
+import os
+import threading
+import urllib.request
+
+_backends = {}
+_lock = threading.Lock()
+
+
+class GeminiBackend:
+    name = "Gemini"
+    supports_cache = True
+
+    def __init__(self, api_key, model_id):
+        from google import genai
+        from google.genai import errors, types
+
+        self.model_id = model_id
+        self.types = types
+        self.errors = errors
+        self.client = genai.Client(api_key=api_key)
+
+    def create_cache(self, prefix, ttl):
+        """캐시 이름을 반환합니다. 모델이 캐시를 지원하지 않거나 접두사가 최소 토큰 수보다 작으면 None."""
+        try:
+            cache = self.client.caches.create(
+                model=self.model_id,
+                config=self.types.CreateCachedContentConfig(contents=[prefix], ttl=ttl),
+            )
+        except self.errors.APIError as e:
+            print(f"Context cache unavailable, sending prompt inline: {e}")
+            return None
+        return cache.name
+
+    def stream(self, prompt, cached_content=None):
+        if cached_content:
+            response = self.client.models.generate_content_stream(
+                model=self.model_id,
+                contents=prompt,
+                config=self.types.GenerateContentConfig(cached_content=cached_content),
+            )
+        else:
+            response = self.client.models.generate_content_stream(model=self.model_id, contents=prompt)
+        for chunk in response:
+            yield chunk.text or ""
+
+
+class StubBackend:
+    name = "stub"
+    # 컨텍스트 캐시가 없으므로 항상 프롬프트 전체를 보냄
+    supports_cache = False
+
+    def __init__(self, url, timeout=60):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def stream(self, prompt, cached_content=None):
+        request = urllib.request.Request(
+            self.url + "/generate",
+            data=prompt.encode('utf-8'),
+            headers={"Content-Type": "text/plain; charset=utf-8"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            for line in response:
+                yield line.decode('utf-8')
+
+
+def get_backend(api_key, model_id):
+    """설정에 맞는 백엔드를 반환합니다. 같은 설정이면 같은 인스턴스(클라이언트)를 재사용합니다."""
+    kind = os.getenv("TRANSLATION_BACKEND", "gemini")
+    if kind == "stub":
+        key = (kind, os.getenv("TRANSLATION_STUB_URL", "http://127.0.0.1:8765"))
+    else:
+        key = (kind, api_key, model_id)
+    with _lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = StubBackend(key[1]) if kind == "stub" else GeminiBackend(api_key, model_id)
+            _backends[key] = backend
+        return backend
@@ -0,0 +1,219 @@
+"""
+번역 요청을 배치 단위로 동시에 처리하는 asyncio 엔진.
+
+translate_batch 같은 동기 번역 함수를 스레드에서 실행하면서
+동시 실행 개수(in-flight)와 분당 요청 수(RPM)를 제한합니다.
+배치는 batch_planner의 계획대로 보내고, 크기는 AIMD 방식으로 조절합니다:
+누락/오류가 생기면 예산을 절반으로 줄여 남은 계획 배치를 나눠 보내고 빠진 항목만 다시 큐에 넣으며,
+응답이 깨끗하면 계획의 예산까지 조금씩 늘립니다.
+"""
+import asyncio
+import time
+from collections import deque
+
+import batch_planner
+
+
+class BatchError(Exception):
+    """번역 요청이 중간에 실패한 경우. results에는 실패 전까지 받은 번역이 들어 있습니다."""
+
+    def __init__(self, message, results=None):
+        super().__init__(message)
+        self.results = results or {}
+
+
+class RateLimiter:
+    """최근 60초 동안의 요청 수를 제한하는 슬라이딩 윈도우 리미터"""
+
+    def __init__(self, per_minute, period=60.0):
+        self.per_minute = per_minute
+        self.period = period
+        self._stamps = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.per_minute or self.per_minute <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._stamps and now - self._stamps[0] >= self.period:
+                    self._stamps.popleft()
+                if len(self._stamps) < self.per_minute:
+                    self._stamps.append(now)
+                    return
+                await asyncio.sleep(self.period - (now - self._stamps[0]))
+
+
+class AdaptiveBatcher:
+    """
+    배치 계획(batch_planner.BatchPlan)의 배치를 순서대로 내줍니다.
+    오류/누락으로 토큰 예산이 계획보다 줄어 있으면 계획된 배치를 예산만큼 나눠 내주고,
+    다시 보낼 항목은 모아 두었다가 계획을 다 보낸 뒤 예산만큼 묶어 보냅니다. 예산은 계획의 예산까지만 회복합니다.
+    """
+
+    def __init__(self, plan, updates, min_budget=500, increase=500, decrease=0.5, max_attempts=3):
+        self.plan = plan
+        self.to_translate = {idx: text for batch in plan.batches for idx, text in batch.items()}
+        self.updates = updates
+        # 예산이 없는 계획(0 이하)이면 가장 큰 계획 배치를 상한으로 봄
+        self.max_budget = plan.token_budget if plan.token_budget > 0 else max(plan.tokens, default=0)
+        self.budget = self.max_budget
+        self.min_budget = min(min_budget, self.max_budget)
+        self.max_items = plan.max_items
+        self.increase = increase
+        self.decrease = decrease
+        self.max_attempts = max_attempts
+        self.queue = deque(batch_planner.group_items(batch, updates) for batch in plan.batches)
+        self.attempts = {}
+        self.failed = {}
+        self.retries = deque()
+        self.stats = []
+        self.splits = 0
+
+    def next_batch(self):
+        # 계획된 배치를 다 보낸 뒤에는 다시 보낼 항목들을 예산만큼 묶음
+        planned = bool(self.queue)
+        if planned:
+            groups = self.queue.popleft()
+        elif self.retries:
+            groups = list(self.retries)
+            self.retries.clear()
+        else:
+            return {}
+        batch = {}
+        tokens = 0
+        for taken, group in enumerate(groups):
+            group_tokens = sum(batch_planner.estimate_tokens(text) for text in group.values())
+            over_budget = tokens + group_tokens > self.budget
+            over_count = self.max_items > 0 and len(batch) + len(group) > self.max_items
+            if batch and (over_budget or over_count):
+                # 나머지는 순서를 유지해 다음 배치로
+                if planned:
+                    self.queue.appendleft(groups[taken:])
+                    self.splits += 1
+                else:
+                    self.retries.extendleft(reversed(groups[taken:]))
+                break
+            batch.update(group)
+            tokens += group_tokens
+        for idx in batch:
+            self.attempts[idx] = self.attempts.get(idx, 0) + 1
+        return batch
+
+    def complete(self, batch, result, latency, error=None, rejected=0):
+        """
+        배치 결과를 반영합니다. 빠진 항목은 시도 횟수가 남아 있으면 다시 큐에 넣고,
+        누락/오류 여부에 따라 다음 배치의 토큰 예산을 조절합니다.
+        """
+        missing = {idx: text for idx, text in batch.items() if idx not in result}
+        self.stats.append({
+            "size": len(batch),
+            "returned": len(batch) - len(missing),
+            "latency": latency,
+            "budget": self.budget,
+            "rejected": rejected,
+            "error": error,
+        })
+
+        # 검증 실패는 배치 크기와 무관하므로 응답에서 빠진 항목만 예산 축소 사유로 봄
+        if error or len(missing) > rejected:
+            self.budget = max(self.min_budget, int(self.budget * self.decrease))
+        else:
+            self.budget = min(self.max_budget, self.budget + self.increase)
+
+        retry = {}
+        for idx, text in missing.items():
+            if self.attempts.get(idx, 0) < self.max_attempts:
+                retry[idx] = text
+            else:
+                self.failed[idx] = text
+        if retry:
+            self.retries.extend(batch_planner.group_items(retry, self.updates))
+        return len(retry)
+
+    def report(self):
+        if not self.stats:
+            return "No batches sent"
+        latencies = sorted(stat["latency"] for stat in self.stats)
+        requested = sum(stat["size"] for stat in self.stats)
+        returned = sum(stat["returned"] for stat in self.stats)
+        retried = requested - len(self.to_translate)
+        rejected = sum(stat["rejected"] for stat in self.stats)
+        return (
+            f"Sent {len(self.stats)} batches ({len(self.plan.batches)} planned, {self.splits} split): "
+            f"yield {returned}/{requested} "
+            f"({returned / requested:.0%}), latency avg {sum(latencies) / len(latencies):.1f}s "
+            f"max {latencies[-1]:.1f}s, rejected {rejected}, retried {max(retried, 0)} strings, "
+            f"gave up on {len(self.failed)}, final budget {self.budget} tokens"
+        )
+
+
+async def translate_batches(batcher, translate_fn, max_concurrency=4, per_minute=60, validate=None):
+    """
+    batcher에서 배치를 꺼내 translate_fn(batch)로 번역하고 결과를 하나의 딕셔너리로 합칩니다.
+    translate_fn은 동기 함수이며 별도 스레드에서 실행됩니다.
+    translate_fn이 예외를 내면 배치 오류로 보고 예산을 줄입니다 (BatchError면 results는 그대로 씀).
+    validate(원문, 번역)가 False인 항목은 누락으로 취급되어 다시 큐에 들어갑니다.
+    """
+    limiter = RateLimiter(per_minute)
+    loop = asyncio.get_running_loop()
+    merged = {}
+    in_flight = 0
+    changed = asyncio.Condition()
+    counter = 0
+
+    async def worker():
+        nonlocal in_flight, counter
+        while True:
+            async with changed:
+                batch = batcher.next_batch()
+                while not batch:
+                    if in_flight == 0:
+                        changed.notify_all()
+                        return
+                    await changed.wait()
+                    batch = batcher.next_batch()
+                in_flight += 1
+                counter += 1
+                number = counter
+
+            await limiter.acquire()
+            started = time.monotonic()
+            error = None
+            try:
+                # asyncio.to_thread는 3.9부터라 기본 스레드 풀 실행기를 직접 씀 (3.8 지원)
+                result = await loop.run_in_executor(None, translate_fn, batch) or {}
+            except Exception as e:
+                # 오류(429 등)는 누락과 달리 예산 축소 사유로 기록하고, 받은 만큼은 살림
+                result = e.results if isinstance(e, BatchError) else {}
+                error = str(e)
+            elapsed = time.monotonic() - started
+
+            async with changed:
+                in_flight -= 1
+                result = {idx: text for idx, text in result.items() if idx in batch}
+                rejected = 0
+                if validate:
+                    accepted = {idx: text for idx, text in result.items() if validate(batch[idx], text)}
+                    rejected = len(result) - len(accepted)
+                    result = accepted
+                merged.update(result)
+                retried = batcher.complete(batch, result, elapsed, error, rejected)
+                status = f", rejected {rejected}" if rejected else ""
+                status += f", requeued {retried}" if retried else ""
+                status += f", error: {error}" if error else ""
+                print(f"   [{number}] {len(result)}/{len(batch)} strings ({elapsed:.1f}s{status})")
+                changed.notify_all()
+
+    await asyncio.gather(*(worker() for _ in range(max(1, max_concurrency))))
+    return merged
+
+
+def translate_adaptive(batcher, translate_fn, max_concurrency=4, per_minute=60, validate=None):
+    """동기 코드에서 호출하기 위한 진입점"""
+    if not batcher.queue:
+        return {}
+    merged = asyncio.run(translate_batches(batcher, translate_fn, max_concurrency, per_minute, validate))
+    print(batcher.report())
+    return merged
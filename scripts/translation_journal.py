@@ -0,0 +1,113 @@
+"""
+번역 진행 상황 체크포인트.
+
+스트리밍으로 도착한 번역을 사이드카 저널(<파일>.journal)에 한 줄씩 기록하고,
+일정 간격마다 .lang 파일을 원자적으로(임시 파일 + os.replace) 갱신합니다.
+중단된 작업은 resume 모드에서 저널에 남은 결과를 다시 적용해 이어서 진행합니다.
+"""
+import json
+import os
+import threading
+import time
+
+FLUSH_INTERVAL = float(os.getenv("TRANSLATE_FLUSH_INTERVAL", "10"))
+
+
+def journal_path(file_path):
+    return file_path + ".journal"
+
+
+def write_atomic(path, lines):
+    """
+    임시 파일에 먼저 쓴 뒤 교체하여 중간에 끊겨도 파일이 깨지지 않도록 합니다.
+    줄의 개행은 변환 없이 그대로 씁니다 (Windows에서 \\r\\r\\n이 되지 않도록).
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(lines)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_journal(file_path, to_translate):
+    """
+    저널에서 현재 원문과 일치하는 항목만 {줄 번호: 번역}으로 읽어옵니다.
+    마지막 줄이 기록 도중 끊긴 경우 무시합니다.
+    """
+    path = journal_path(file_path)
+    restored = {}
+    if not os.path.exists(path):
+        return restored
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            idx = entry.get("line")
+            if idx in to_translate and to_translate[idx] == entry.get("source"):
+                restored[idx] = entry["text"]
+    return restored
+
+
+class TranslationJournal:
+    def __init__(self, file_path, lines, updates, to_translate, apply_fn, resume=False):
+        self.file_path = file_path
+        self.lines = lines
+        self.updates = updates
+        self.to_translate = to_translate
+        self.apply_fn = apply_fn
+        self.applied = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+        if resume:
+            restored = load_journal(file_path, to_translate)
+            if restored:
+                self.apply_fn(self.lines, self.updates, restored)
+                self.applied.update(restored)
+                self._dirty = True
+        elif os.path.exists(journal_path(file_path)):
+            os.remove(journal_path(file_path))
+
+        self._journal = open(journal_path(file_path), 'a', encoding='utf-8')
+        if self.applied:
+            for idx, text in self.applied.items():
+                self._write_entry(idx, text)
+            self._journal.flush()
+
+    def _write_entry(self, idx, text):
+        entry = {"line": idx, "source": self.to_translate.get(idx), "text": text}
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def record(self, idx, text):
+        """번역 한 줄을 저널에 남기고 lines에 바로 반영합니다 (스레드 안전)."""
+        with self._lock:
+            if idx not in self.updates or idx in self.applied:
+                return
+            self._write_entry(idx, text)
+            self._journal.flush()
+            self.apply_fn(self.lines, self.updates, {idx: text})
+            self.applied[idx] = text
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._dirty:
+            write_atomic(self.file_path, self.lines)
+            self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """마지막으로 파일을 기록하고 저널을 삭제합니다."""
+        with self._lock:
+            self._flush_locked()
+            self._journal.close()
+            os.remove(journal_path(self.file_path))
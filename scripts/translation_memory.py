@@ -0,0 +1,90 @@
+"""
+SQLite 기반 번역 메모리(TM).
+
+(정규화된 영어 원문, 프롬프트/용어집 버전, 모델 ID)를 키로 번역 결과를 저장해
+파일이나 키가 달라도 같은 문장은 다시 API로 보내지 않도록 합니다.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(PROJECT_DIR, ".cache", "translation_memory.sqlite")
+
+
+def normalize(text):
+    """앞뒤 공백을 제거하고 연속된 공백을 하나로 합칩니다."""
+    return re.sub(r'\s+', ' ', text.strip())
+
+
+def text_hash(text):
+    return hashlib.sha256(normalize(text).encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    def __init__(self, path=None, prompt_version="", model_id=""):
+        self.path = path or os.getenv("TRANSLATION_MEMORY_PATH", DEFAULT_PATH)
+        self.prompt_version = prompt_version
+        self.model_id = model_id
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS memory (
+                source_hash TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source_hash, prompt_version, model_id)
+            )"""
+        )
+        self._conn.commit()
+
+    def lookup(self, texts):
+        """
+        {index: 원문} 중 메모리에 있는 항목을 {index: 번역}으로 반환합니다.
+        """
+        by_hash = {}
+        for idx, text in texts.items():
+            by_hash.setdefault(text_hash(text), []).append(idx)
+
+        found = {}
+        hashes = list(by_hash)
+        with self._lock:
+            # SQLite 변수 개수 제한(999)을 넘지 않도록 나눠서 조회
+            for start in range(0, len(hashes), 500):
+                part = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT source_hash, target FROM memory "
+                    f"WHERE prompt_version = ? AND model_id = ? AND source_hash IN ({placeholders})",
+                    [self.prompt_version, self.model_id, *part],
+                ).fetchall()
+                for source_hash, target in rows:
+                    for idx in by_hash[source_hash]:
+                        found[idx] = target
+        return found
+
+    def store(self, pairs):
+        """(원문, 번역) 쌍들을 저장합니다."""
+        now = time.time()
+        rows = [
+            (text_hash(source), self.prompt_version, self.model_id, normalize(source), target, now)
+            for source, target in pairs
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
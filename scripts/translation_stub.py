@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+번역 파이프라인 벤치마크용 로컬 HTTP 스텁 서버.
+
+POST /generate 로 프롬프트를 받으면 `[index] text` 줄마다 `[index] 번역 text`를
+한 줄씩 스트리밍합니다. 지연 시간, 오류율, 줄 누락률을 설정할 수 있습니다.
+
+사용법:
+  python3 scripts/translation_stub.py [--port 8765] [--latency 0.5] [--error-rate 0.05] [--drop-rate 0.02]
+"""
+import argparse
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ITEM_RE = re.compile(r'^\[(\d+)\] (.*)$', re.M)
+TARGET_MARKER = "[작업 대상]"
+
+
+class StubConfig:
+    def __init__(self, latency=0.5, jitter=0.2, error_rate=0.0, drop_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def roll(self):
+        with self.lock:
+            return self.random.random()
+
+
+def make_handler(config):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            prompt = self.rfile.read(length).decode('utf-8')
+            with config.lock:
+                config.requests += 1
+
+            delay = max(0.0, config.latency + (config.roll() * 2 - 1) * config.jitter)
+            time.sleep(delay)
+            if config.roll() < config.error_rate:
+                with config.lock:
+                    config.errors += 1
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            body = prompt.split(TARGET_MARKER)[-1]
+            lines = []
+            for match in ITEM_RE.finditer(body):
+                if config.roll() < config.drop_rate:
+                    continue
+                lines.append(f"[{match.group(1)}] 번역 {match.group(2)}\n")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for line in lines:
+                data = line.encode('utf-8')
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def start_server(config, host="127.0.0.1", port=0):
+    """백그라운드 스레드에서 서버를 띄우고 (server, url)을 반환합니다."""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local translation stub server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency, args.jitter, args.error_rate, args.drop_rate)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(config))
+    print(f"Stub translation server on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
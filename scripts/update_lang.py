@@ -2,7 +2,16 @@ import os
 import sys
 import platform
 import re
+import io
+import json
+import hashlib
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import glyph_coverage
+import lang_file
 import translate_gemini
+import translation_journal
 
 def get_hytale_path():
     system = platform.system()
@@ -20,119 +29,274 @@ def get_hytale_path():
 
 LANG_FILES = ["client.lang", "meta.lang"]
 OUTPUT_DIR = "Language/ko-KR"
+# Assets.zip 기반 번역 파일(server, wordlists, avatarCustomization)
+ASSETS_LANG_DIRS = ["Assets/Server/Languages/ko-KR", "Assets/Common/Languages/ko-KR"]
+# Assets.zip 안의 en-US 경로 -> 저장소 ko-KR 경로
+ASSETS_EN_PREFIXES = {
+    "Server/Languages/en-US/": ASSETS_LANG_DIRS[0],
+    "Common/Languages/en-US/": ASSETS_LANG_DIRS[1],
+}
+# 원본 파일/키별 해시 기록 (변경된 파일·키만 다시 동기화)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_PATH = os.getenv("SYNC_MANIFEST_PATH", os.path.join(PROJECT_DIR, ".cache", "sync_manifest.json"))
+MANIFEST_VERSION = 1
+# 동기화 프로세스 수 (기본: CPU 코어 수)
+SYNC_WORKERS = int(os.getenv("SYNC_WORKERS", "0")) or os.cpu_count() or 1
 
-def update():
-    local_path = get_hytale_path()
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    gemini_key = os.environ.get("GEMINI_API_KEY")
 
-    for lang_file in LANG_FILES:
-        src_path = os.path.join(local_path, lang_file)
-        target_path = os.path.join(OUTPUT_DIR, lang_file)
-        if not os.path.exists(src_path): continue
+def translation_targets():
+    """번역 대상이 될 수 있는 모든 ko-KR .lang 파일 경로 (정렬된 순서)"""
+    targets = [os.path.join(OUTPUT_DIR, name) for name in LANG_FILES]
+    for base in ASSETS_LANG_DIRS:
+        for root, _, files in os.walk(base):
+            targets.extend(os.path.join(root, name) for name in sorted(files) if name.endswith('.lang'))
+    return targets
+
+
+def source_hash(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return source_hash(f.read())
+
+
+def load_manifest(path=None):
+    """
+    {파일 이름 또는 Assets.zip 멤버: {"hash"|"crc": 원본 해시, "keys": {키: 원문 해시}}}
+    (없거나 버전이 다르면 빈 dict)
+    """
+    path = path or MANIFEST_PATH
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(files, path=None):
+    path = path or MANIFEST_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = {"version": MANIFEST_VERSION, "files": files}
+    translation_journal.write_atomic(path, [json.dumps(data, ensure_ascii=False, sort_keys=True)])
+
 
-        # 1. 원본(영어) 및 기존(한국어) 읽기
-        with open(src_path, 'r', encoding='utf-8') as f:
-            en_lines = f.readlines()
-        
-        ko_data = {}
-        ko_lines = []
-        if os.path.exists(target_path):
-            with open(target_path, 'r', encoding='utf-8') as f:
-                ko_lines = f.readlines()
-                # 줄 수와 상관없이 Key = Value 쌍만 긁어모음 (정규식 지양, 단순 분할)
-                for line in ko_lines:
-                    if ' = ' in line:
-                        parts = line.split(' = ', 1)
-                        ko_data[parts[0].strip()] = parts[1].split(' # TODO:')[0].strip()
-
-        def strip_todo_marker(raw_line):
-            return raw_line.replace(" # TODO: Translate", "")
-
-        def is_identifier_example(text):
-            stripped = text.strip()
-            if not stripped:
-                return False
-            if "_" not in stripped:
-                return False
-            return re.fullmatch(r"[A-Za-z0-9_,\s]+", stripped) is not None
-
-        ko_blocks = {}
-        current_key = None
-        current_lines = []
-        for line in ko_lines:
-            if ' = ' in line:
-                if current_key is not None:
-                    ko_blocks[current_key] = current_lines
-                current_key = line.split(' = ', 1)[0].strip()
-                current_lines = []
+def fingerprint(en):
+    """키별 영어 원문 해시"""
+    return {entry.key: source_hash(en.value(entry.key)) for entry in en.entries}
+
+
+def changed_keys(old_keys, new_keys):
+    """이전 동기화 이후 영어 원문이 바뀐 키 (새로 추가된 키는 제외)"""
+    return {key for key, digest in new_keys.items() if key in old_keys and old_keys[key] != digest}
+
+
+def is_identifier_example(text):
+    stripped = text.strip()
+    if not stripped:
+        return False
+    if "_" not in stripped:
+        return False
+    return re.fullmatch(r"[A-Za-z0-9_,\s]+", stripped) is not None
+
+
+def sync_lines(en, ko, changed=()):
+    """
+    원본(영어) 구조를 100% 복제하면서 (줄 수 불변) 기존 번역을 채워 넣은 줄 목록을 반환합니다.
+    번역이 없거나 아직 TODO인 키, 영어 원문이 바뀐 키(changed)는 영어 원문에 TODO 마커를 붙입니다.
+    원본 줄의 개행(CRLF 포함)은 새로 만드는 줄과 같게 \\n으로 맞춥니다.
+    """
+    final_lines = []
+    starts = {entry.start: entry for entry in en.entries}
+    i = 0
+    while i < len(en.lines):
+        entry = starts.get(i)
+        if entry is None:
+            final_lines.append(lang_file.normalize_newline(en.lines[i]))
+            i += 1
+            continue
+
+        ko_entry = ko.index.get(entry.key) if ko and entry.key not in changed else None
+        is_multiline = en.value_lines(entry)[0].strip().endswith('\\')
+
+        if ko_entry is not None and not ko_entry.todo:
+            value = ko.value_lines(ko_entry)[0].strip()
+            value = value.rstrip('\\').rstrip()
+            if is_multiline:
+                final_lines.append(f"{entry.key_part} = {value}\\\n")
             else:
-                if current_key is not None:
-                    current_lines.append(strip_todo_marker(line))
-        if current_key is not None:
-            ko_blocks[current_key] = current_lines
-
-        # 2. 원본 구조 100% 복제 (줄 수 불변)
-        final_lines = []
-        i = 0
-        while i < len(en_lines):
-            line = en_lines[i]
-            if ' = ' in line:
-                parts = line.split(' = ', 1)
-                key_part = parts[0]
-                key = key_part.strip()
-                en_val = parts[1].strip()
-                is_multiline = en_val.endswith('\\')
-
-                if key in ko_data:
-                    value = ko_data[key].rstrip()
-                    value = value.rstrip('\\').rstrip()
-                    if is_multiline:
-                        final_lines.append(f"{key_part} = {value}\\\n")
-                    else:
-                        final_lines.append(f"{key_part} = {value}\n")
-                else:
-                    final_lines.append(line.rstrip() + " # TODO: Translate\n")
-
-                if is_multiline:
-                    i += 1
-                    en_cont_lines = []
-                    while i < len(en_lines):
-                        cont_line = en_lines[i]
-                        en_cont_lines.append(cont_line)
-                        if not cont_line.rstrip().endswith('\\'):
-                            break
-                        i += 1
-                    ko_cont_lines = ko_blocks.get(key, [])
-                    for idx, cont_line in enumerate(en_cont_lines):
-                        if idx < len(ko_cont_lines):
-                            final_lines.append(ko_cont_lines[idx])
-                            continue
-
-                        raw_cont = cont_line.rstrip('\n')
-                        if is_identifier_example(raw_cont.rstrip()):
-                            final_lines.append(cont_line)
-                            continue
-                        if raw_cont.rstrip().endswith('\\'):
-                            raw_no_backslash = raw_cont.rstrip()[:-1].rstrip()
-                            final_lines.append(f"{raw_no_backslash} # TODO: TranslateLine\\\n")
-                        else:
-                            final_lines.append(f"{raw_cont} # TODO: TranslateLine\n")
-                    i += 1
+                final_lines.append(f"{entry.key_part} = {value}\n")
+        else:
+            final_lines.append(en.lines[i].rstrip() + " # TODO: Translate\n")
+
+        if is_multiline:
+            ko_cont_lines = ko.lines[ko_entry.start + 1:ko_entry.end] if ko_entry is not None else []
+            for idx, cont_line in enumerate(en.lines[entry.start + 1:entry.end]):
+                if idx < len(ko_cont_lines):
+                    final_lines.append(lang_file.normalize_newline(ko_cont_lines[idx]))
                     continue
 
-                i += 1
+                raw_cont = cont_line.rstrip('\r\n')
+                if is_identifier_example(raw_cont.rstrip()):
+                    final_lines.append(lang_file.normalize_newline(cont_line))
+                    continue
+                if raw_cont.rstrip().endswith('\\'):
+                    raw_no_backslash = raw_cont.rstrip()[:-1].rstrip()
+                    final_lines.append(f"{raw_no_backslash} # TODO: TranslateLine\\\n")
+                else:
+                    final_lines.append(f"{raw_cont} # TODO: TranslateLine\n")
+        i = entry.end
+    return final_lines
+
+
+def sync_target(en, target_path, previous):
+    """
+    en(LangFile)을 기준으로 target_path를 다시 맞추고
+    (키별 원문 해시, 새 키 수, 원문이 바뀐 키 수)를 반환합니다.
+    """
+    ko = lang_file.LangFile.load(target_path) if os.path.exists(target_path) else None
+    keys = fingerprint(en)
+    changed = changed_keys(previous.get("keys", {}), keys)
+    added = sum(1 for key in keys if ko is None or key not in ko.index)
+    final_lines = sync_lines(en, ko, changed)
+
+    os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+    translation_journal.write_atomic(target_path, final_lines)
+    return keys, added, len(changed)
+
+
+def sync_job(job):
+    """
+    프로세스 풀 작업 하나를 실행합니다.
+    job = (이름, 원본 경로 또는 (Assets.zip 경로, 멤버 이름), 대상 경로, 이전 manifest 항목, 새 manifest 항목)
+    """
+    name, source, target_path, previous, entry = job
+    started = time.perf_counter()
+    if isinstance(source, tuple):
+        # 디스크에 풀지 않고 메모리에서 바로 파싱
+        zip_path, member = source
+        with zipfile.ZipFile(zip_path, 'r') as zf, zf.open(member) as f:
+            text = io.TextIOWrapper(f, encoding='utf-8', newline='').read()
+        en = lang_file.LangFile.from_text(text, member)
+    else:
+        en = lang_file.LangFile.load(source)
+    keys, added, changed = sync_target(en, target_path, previous)
+    return name, dict(entry, keys=keys), added, changed, time.perf_counter() - started
+
+
+def find_assets_zip(lang_path):
+    """클라이언트 언어 폴더에서 상위로 올라가며 Assets.zip을 찾습니다 (HYTALE_ASSETS_ZIP로 지정 가능)."""
+    override = os.getenv("HYTALE_ASSETS_ZIP")
+    if override:
+        return override if os.path.exists(override) else None
+    current = lang_path
+    for _ in range(8):
+        check_path = os.path.join(current, "Assets.zip")
+        if os.path.exists(check_path):
+            return check_path
+        current = os.path.dirname(current)
+    return None
+
+
+def assets_target(member):
+    """Assets.zip 멤버 경로를 저장소의 ko-KR 경로로 바꿉니다 (대상이 아니면 None)."""
+    if not member.endswith('.lang'):
+        return None
+    for prefix, target_dir in ASSETS_EN_PREFIXES.items():
+        if member.startswith(prefix):
+            return os.path.join(target_dir, member[len(prefix):])
+    return None
+
+
+def collect_jobs(local_path, manifest):
+    """
+    다시 동기화할 파일의 작업 목록과 건너뛴 파일 이름 목록을 반환합니다.
+    원본 파일 해시(클라이언트) 또는 중앙 디렉터리 CRC32(Assets.zip)가 지난 동기화 때와 같으면 건너뜁니다.
+    """
+    jobs = []
+    skipped = []
+    for name in LANG_FILES:
+        src_path = os.path.join(local_path, name)
+        target_path = os.path.join(OUTPUT_DIR, name)
+        if not os.path.exists(src_path): continue
+
+        src_hash = file_hash(src_path)
+        previous = manifest.get(name, {})
+        if previous.get("hash") == src_hash and os.path.exists(target_path):
+            skipped.append(name)
+            continue
+        jobs.append((name, src_path, target_path, previous, {"hash": src_hash}))
+
+    # server, wordlists, avatarCustomization은 Assets.zip에서 바로 읽음
+    assets_zip = find_assets_zip(local_path)
+    if not assets_zip:
+        print("⚠️ Assets.zip not found, skipping server/avatarCustomization files")
+        return jobs, skipped
+    with zipfile.ZipFile(assets_zip, 'r') as zf:
+        for info in zf.infolist():
+            target_path = assets_target(info.filename)
+            if target_path is None or info.is_dir():
                 continue
+            previous = manifest.get(info.filename, {})
+            if previous.get("crc") == info.CRC and os.path.exists(target_path):
+                skipped.append(info.filename)
+                continue
+            jobs.append((info.filename, (assets_zip, info.filename), target_path, previous, {"crc": info.CRC}))
+    return jobs, skipped
 
-            final_lines.append(line)
-            i += 1
 
-        with open(target_path, 'w', encoding='utf-8') as f:
-            f.writelines(final_lines)
-        
-        print(f"✅ Re-synchronized {lang_file} strictly following original line structure")
-        if gemini_key:
-            translate_gemini.process_translation(target_path, gemini_key)
+def run_jobs(jobs, workers=None):
+    """작업을 프로세스 풀에 나눠 실행하고 결과를 작업 순서대로 반환합니다."""
+    workers = min(workers or SYNC_WORKERS, len(jobs))
+    if workers <= 1:
+        return [sync_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(sync_job, jobs))
+
+
+def print_summary(results, skipped, elapsed, workers):
+    if skipped:
+        print(f"⏭️ {len(skipped)} files unchanged since last sync, skipped")
+    if not results:
+        return
+    width = max(len(name) for name, *_ in results)
+    print(f"✅ Re-synchronized {len(results)} files strictly following original line structure "
+          f"({workers} workers, {elapsed:.2f}s)")
+    print(f"   {'file':<{width}}  {'new':>6}  {'changed':>7}  {'time':>8}")
+    for name, _, added, changed, seconds in results:
+        print(f"   {name:<{width}}  {added:>6}  {changed:>7}  {seconds * 1000:>6.1f}ms")
+
+
+def update():
+    """동기화/번역 후 폰트에 글리프가 없는 항목 수를 반환합니다."""
+    local_path = get_hytale_path()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    gemini_key = os.environ.get("GEMINI_API_KEY")
+    manifest = load_manifest()
+
+    # 1. 바뀐 파일만 골라 프로세스 풀에서 동기화 (결과는 항상 같은 순서로 반영)
+    started = time.perf_counter()
+    jobs, skipped = collect_jobs(local_path, manifest)
+    results = run_jobs(jobs)
+    for name, entry, *_ in results:
+        manifest[name] = entry
+    if results:
+        save_manifest(manifest)
+    print_summary(results, skipped, time.perf_counter() - started, min(SYNC_WORKERS, len(jobs)))
+
+    # 2. 모든 파일의 번역 대상을 한 번에 모아 중복 없이 번역
+    if gemini_key:
+        translate_gemini.process_translations(translation_targets(), gemini_key)
+
+    # 3. 번역문에 폰트에 없는 글자가 들어왔는지 확인하고 used_chars.txt 갱신
+    return glyph_coverage.check()
 
 if __name__ == "__main__":
-    update()
+    # 글리프가 빠진 항목이 있으면 종료 코드 2 (동기화 자체의 오류와 구분)
+    sys.exit(2 if update() else 0)
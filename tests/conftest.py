@@ -0,0 +1,5 @@
+import os
+import sys
+
+# scripts/의 모듈은 패키지가 아니라 `import x`로 서로 불러오므로 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import struct
+
+import pytest
+
+import binary_patch
+from test_executable_sections import _put, build_macho64
+
+PATTERN = bytes.fromhex("BA 00 02 00 00 41 B8 00 02 00 00")
+PATCHED = bytes.fromhex("BA 00 20 00 00 41 B8 00 20 00 00")
+
+
+def test_every_match_is_patched(tmp_path):
+    # 시그니처에 매치 수 상한이 없으므로 사이트가 많아도 모두 패치
+    path = tmp_path / "game.bin"
+    path.write_bytes((b"\x90" * 5 + PATTERN) * 200)
+    matches = binary_patch.patch_file(str(path), sections=False)
+    assert len(matches) == 200
+    data = path.read_bytes()
+    assert data.count(PATCHED) == 200
+    assert PATTERN not in data
+
+
+def write(path, data, mtime_ns):
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def no_scan(*args, **kwargs):
+    raise AssertionError("상태 기록으로 처리되어야 함")
+
+
+def test_state_patched_already_restored_repatched(tmp_path, monkeypatch):
+    path = tmp_path / "game.bin"
+    original = b"\x90" * 100 + PATTERN + b"\x90" * 50 + PATTERN + b"\xCC" * 30
+    patched = original.replace(PATTERN, PATCHED)
+    write(path, original, 1_000_000_000)
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("patched", 2)
+    assert path.read_bytes() == patched
+    assert os.path.exists(binary_patch.state_path(path))
+
+    monkeypatch.setattr(binary_patch, "scan_code", no_scan)
+    # 크기/mtime이 같으면 기록된 오프셋만 확인
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("already", 2)
+    # 게임 복구로 원본이 돌아오면 해시로 알아보고 기록된 오프셋에 바로 패치
+    write(path, original, 2_000_000_000)
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("patched", 2)
+    assert path.read_bytes() == patched
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("already", 2)
+
+
+def test_state_accepts_codesigned_patched_binary(tmp_path, monkeypatch):
+    path = tmp_path / "game.bin"
+    original = b"\x90" * 100 + PATTERN + b"\xCC" * 30
+    write(path, original, 1_000_000_000)
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("patched", 1)
+    monkeypatch.setattr(binary_patch, "scan_code", no_scan)
+    # 코드 서명처럼 패치 위치 밖이 바뀌면 오프셋을 확인하고 새 해시를 기록
+    signed = path.read_bytes() + b"signature"
+    write(path, signed, 2_000_000_000)
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("already", 1)
+    assert binary_patch.load_state(path)["patched_sha256"] == hashlib.sha256(signed).hexdigest()
+    write(path, signed, 3_000_000_000)
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("already", 1)
+
+
+def test_state_changed_binary_is_rescanned(tmp_path):
+    path = tmp_path / "game.bin"
+    write(path, b"\x90" * 100 + PATTERN, 1_000_000_000)
+    binary_patch.ensure_patched(str(path), sections=False)
+    # 게임 업데이트로 위치가 바뀌면 기록이 맞지 않으므로 다시 스캔
+    update = b"\x90" * 40 + PATTERN + b"\x90" * 60
+    write(path, update, 2_000_000_000)
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("patched", 1)
+    assert path.read_bytes() == update.replace(PATTERN, PATCHED)
+
+
+def test_no_state_but_already_patched(tmp_path):
+    path = tmp_path / "game.bin"
+    original = b"\x90" * 100 + PATTERN + b"\xCC" * 30
+    write(path, original.replace(PATTERN, PATCHED), 1_000_000_000)
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("already", 1)
+    state = binary_patch.load_state(path)
+    assert state["original_sha256"] is None
+    assert [patch["offset"] for patch in state["patches"]] == [100]
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("already", 1)
+    # 원본 해시를 모르므로 원본으로 돌아오면 다시 스캔해서 패치
+    write(path, original, 2_000_000_000)
+    assert binary_patch.ensure_patched(str(path), sections=False) == ("patched", 1)
+    assert path.read_bytes() == original.replace(PATTERN, PATCHED)
+
+
+def movz(rd, imm16):
+    """movz wN, #imm16 (리틀 엔디언 명령어 워드)"""
+    return struct.pack("<I", 0x52800000 | (imm16 << 5) | rd)
+
+
+@pytest.mark.parametrize("min_anchor", [binary_patch.Matcher.MIN_ANCHOR, 99])
+def test_arm64_movz_mask_and_alignment(monkeypatch, min_anchor):
+    # 앵커 검색과 (앵커가 없을 때의) 전체 정규식 검색 모두 확인
+    monkeypatch.setattr(binary_patch.Matcher, "MIN_ANCHOR", min_anchor)
+    monkeypatch.setattr(binary_patch, "_matchers", {})
+    buf = build_macho64(cputype=0x0100000C)
+    text = 0x400  # __TEXT,__text
+    _put(buf, text, movz(1, 0x200) + movz(2, 0x200))
+    _put(buf, text + 0x12, movz(3, 0x200) + movz(4, 0x200))  # 4바이트 경계가 아님
+    _put(buf, text + 0x20, movz(5, 0x201) + movz(6, 0x200))  # imm16 최하위 비트가 1
+    _put(buf, text + 0x30, movz(7, 0x200) + movz(8, 0x280))  # 두 번째 imm16이 다름
+    _put(buf, text + 0x40, movz(30, 0x200) + movz(9, 0x200))
+    _put(buf, 0x810, movz(1, 0x200) + movz(2, 0x200))  # __DATA
+    before = bytes(buf)
+
+    matches = binary_patch.scan_code(buf)
+    assert [pos for pos, _, _ in matches] == [text, text + 0x40]
+    binary_patch.apply(buf, matches)
+    assert buf[text:text + 8] == movz(1, 0x2000) + movz(2, 0x2000)
+    assert buf[text + 0x40:text + 0x48] == movz(30, 0x2000) + movz(9, 0x2000)
+    changed = [i for i in range(len(buf)) if buf[i] != before[i]]
+    assert changed == [text + 1, text + 2, text + 5, text + 6, text + 0x41, text + 0x42, text + 0x45, text + 0x46]
+    # 패치된 바이트 검색도 같은 위치만 찾음
+    assert [pos for pos, _, _ in binary_patch.scan_code(buf, patched=True)] == [text, text + 0x40]
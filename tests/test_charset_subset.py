@@ -0,0 +1,23 @@
+import charset_subset
+
+
+def test_plan_accounts_for_generator_padding():
+    # 62px 타일 64개: 1px 간격이면 512에 8x8로 들어가지만 4px 간격이면 한 줄에 7개뿐
+    chars = [chr(0xAC00 + i) for i in range(64)]
+    tiles = {ord(c): (62, 62) for c in chars}
+    assert charset_subset.plan(chars, tiles, padding=1) == 512
+    assert charset_subset.plan(chars, tiles, padding=4) == 1024
+
+
+def test_unknown_glyphs_use_average_hangul_size():
+    tiles = {0xAC00: (40, 40), 0xAC01: (60, 60)}
+    chars = [chr(0xAC00), chr(0xAC01)] + [chr(0xB000 + i) for i in range(200)]
+    # 평균 50x50 (한 줄에 10자): 512에는 90자 남짓
+    assert charset_subset.plan(chars, tiles) == 1024
+    assert charset_subset.plan(chars[:80], tiles) == 512
+
+
+def test_shelf_pack_keeps_input_order():
+    positions = charset_subset.shelf_pack([(10, 5), (10, 20), (10, 10)], 64, padding=2)
+    assert positions == [(24, 0), (0, 0), (12, 0)]
+    assert charset_subset.shelf_pack([(70, 10)], 64) is None
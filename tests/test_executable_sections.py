@@ -0,0 +1,144 @@
+import struct
+
+import binary_patch
+import executable_sections as es
+
+PATTERN = bytes.fromhex("BA 00 02 00 00 41 B8 00 02 00 00")
+
+
+def _put(buf, offset, data):
+    buf[offset:offset + len(data)] = data
+
+
+def build_pe(machine=0x8664):
+    """MZ + PE32+ 헤더, .text(코드) / .rdata(데이터) 섹션 두 개"""
+    buf = bytearray(0x800)
+    buf[:2] = b"MZ"
+    _put(buf, 0x3C, struct.pack("<I", 0x80))
+    _put(buf, 0x80, b"PE\0\0")
+    opt_size = 240
+    _put(buf, 0x84, struct.pack("<HHIIIHH", machine, 2, 0, 0, 0, opt_size, 0x22))
+    opt = 0x98
+    _put(buf, opt, struct.pack("<H", 0x20B))
+    _put(buf, opt + 24, struct.pack("<Q", 0x140000000))
+    table = opt + opt_size
+    text_flags = es.IMAGE_SCN_CNT_CODE | es.IMAGE_SCN_MEM_EXECUTE
+    _put(buf, table, struct.pack("<8sIIIIIIHHI", b".text", 0x180, 0x1000, 0x200, 0x400, 0, 0, 0, 0, text_flags))
+    _put(buf, table + 40, struct.pack("<8sIIIIIIHHI", b".rdata", 0x100, 0x2000, 0x200, 0x600, 0, 0, 0, 0,
+                                      0x40000040))
+    return buf
+
+
+def build_elf64(with_sections=True):
+    """x86_64 ELF64: .text(실행) / .data / .shstrtab 섹션, 실행 가능한 PT_LOAD 하나"""
+    buf = bytearray(0x1000)
+    names = b"\0.text\0.data\0.shstrtab\0"
+    phoff, shoff = 64, 0x800
+    shnum = 4 if with_sections else 0
+    _put(buf, 0, b"\x7fELF" + bytes([2, 1, 1]))
+    _put(buf, 16, struct.pack("<HHIQQQIHHHHHH", 3, 62, 1, 0x1040, phoff, shoff if with_sections else 0,
+                              0, 64, 56, 1, 64, shnum, 3))
+    _put(buf, phoff, struct.pack("<IIQQQQQQ", es.PT_LOAD, es.PF_X | 0x4, 0x200, 0x401200, 0x401200,
+                                 0x300, 0x300, 0x1000))
+    _put(buf, 0x700, names)
+    if with_sections:
+        sections = [
+            (0, 0, 0, 0, 0, 0),
+            (1, 1, es.SHF_EXECINSTR | 0x2, 0x401240, 0x240, 0x120),
+            (7, 1, 0x3, 0x402000, 0x600, 0x80),
+            (13, 3, 0, 0, 0x700, len(names)),
+        ]
+        for i, (name, sh_type, flags, addr, offset, size) in enumerate(sections):
+            _put(buf, shoff + i * 64, struct.pack("<IIQQQQIIQQ", name, sh_type, flags, addr, offset, size,
+                                                  0, 0, 16, 0))
+    return buf
+
+
+def build_macho64(cputype=0x01000007, size=0x1000):
+    """64비트 Mach-O: __TEXT,__text(명령어) 섹션이 있는 __TEXT와 __DATA 세그먼트"""
+    buf = bytearray(size)
+    text_cmd = 72 + 80
+    data_cmd = 72
+    _put(buf, 0, struct.pack("<IiiIIII", es.MH_MAGIC_64, cputype, 3, 2, 2, text_cmd + data_cmd, 0))
+    cmd = 32
+    _put(buf, cmd, struct.pack("<II16sQQQQiiII", es.LC_SEGMENT_64, text_cmd, b"__TEXT",
+                               0x100000000, 0x1000, 0, 0x800, 5, 5, 1, 0))
+    _put(buf, cmd + 72, struct.pack("<16s16sQQIIIIII", b"__text", b"__TEXT", 0x100000400, 0x200, 0x400,
+                                    4, 0, 0, es.S_ATTR_PURE_INSTRUCTIONS | es.S_ATTR_SOME_INSTRUCTIONS, 0))
+    cmd += text_cmd
+    _put(buf, cmd, struct.pack("<II16sQQQQiiII", es.LC_SEGMENT_64, data_cmd, b"__DATA",
+                               0x100001000, 0x1000, 0x800, 0x400, 3, 3, 0, 0))
+    return buf
+
+
+def build_fat():
+    """x86_64 / arm64 슬라이스 두 개를 담은 fat Mach-O"""
+    slices = [(0x01000007, 0x1000), (0x0100000C, 0x2000)]
+    buf = bytearray(0x3000)
+    _put(buf, 0, struct.pack(">II", es.FAT_MAGIC, len(slices)))
+    for i, (cputype, offset) in enumerate(slices):
+        _put(buf, 8 + i * 20, struct.pack(">iiIII", cputype, 3, offset, 0x1000, 12))
+        _put(buf, offset, build_macho64(cputype))
+    return buf
+
+
+def spans(regions):
+    return [(r.name, r.arch, r.offset, r.size, r.vaddr) for r in regions]
+
+
+def test_pe():
+    regions = es.code_regions(build_pe())
+    # 가상 크기(0x180)가 원시 크기(0x200)보다 작으면 가상 크기까지만
+    assert spans(regions) == [(".text", "x86_64", 0x400, 0x180, 0x140001000)]
+    assert regions[0].to_vaddr(0x410) == 0x140001010
+
+
+def test_pe_arm64():
+    assert es.code_regions(build_pe(machine=0xAA64))[0].arch == "arm64"
+
+
+def test_elf64_sections():
+    regions = es.code_regions(build_elf64())
+    assert spans(regions) == [(".text", "x86_64", 0x240, 0x120, 0x401240)]
+    assert regions[0].to_vaddr(0x250) == 0x401250
+
+
+def test_elf64_program_headers_without_sections():
+    regions = es.code_regions(build_elf64(with_sections=False))
+    assert spans(regions) == [("LOAD0", "x86_64", 0x200, 0x300, 0x401200)]
+
+
+def test_macho64():
+    regions = es.code_regions(build_macho64())
+    assert spans(regions) == [("__TEXT,__text", "x86_64", 0x400, 0x200, 0x100000400)]
+
+
+def test_fat_offsets_are_file_relative():
+    regions = es.code_regions(build_fat())
+    assert spans(regions) == [
+        ("__TEXT,__text", "x86_64", 0x1400, 0x200, 0x100000400),
+        ("__TEXT,__text", "arm64", 0x2400, 0x200, 0x100000400),
+    ]
+    assert regions[1].to_vaddr(0x2410) == 0x100000410
+
+
+def test_regions_are_clipped_to_file():
+    regions = es.code_regions(build_macho64(size=0x500))
+    assert spans(regions) == [("__TEXT,__text", "x86_64", 0x400, 0x100, 0x100000400)]
+
+
+def test_unknown_or_truncated():
+    assert es.code_regions(b"") is None
+    assert es.code_regions(b"hello world") is None
+    assert es.code_regions(build_pe()[:0x90]) is None
+    # Java 클래스 파일 (0xCAFEBABE + 큰 버전 번호)
+    assert es.code_regions(struct.pack(">II", es.FAT_MAGIC, 0x34) + bytes(64)) is None
+
+
+def test_scan_only_touches_code():
+    buf = build_elf64()
+    _put(buf, 0x260, PATTERN)
+    _put(buf, 0x610, PATTERN)  # .data
+    matches = binary_patch.scan_code(buf)
+    assert [(pos, region.name) for pos, _, region in matches] == [(0x260, ".text")]
+    assert len(binary_patch.scan_code(buf, sections=False)) == 2
@@ -0,0 +1,37 @@
+import glossary
+
+pretranslator = glossary.Pretranslator()
+
+
+def test_exact_terms_keep_tokens_and_punctuation():
+    assert pretranslator.translate("Kweebec") == "퀴벡"
+    assert pretranslator.translate("<b>kweebec</b>:") == "<b>퀴벡</b>:"
+    assert pretranslator.translate("Auth") == "인증"
+    assert pretranslator.translate("{0} {count}") == "{0} {count}"
+    # 용어가 문장 일부이면 API로 보냄
+    assert pretranslator.translate("Kweebec Village") is None
+    assert pretranslator.translate("A Kweebec") is None
+
+
+def test_homonyms_need_matching_key():
+    assert pretranslator.translate("Chest", "inventory.chest.title") == "상자"
+    assert pretranslator.translate("Chest", "benchCategories.armor") == "흉갑"
+    assert pretranslator.translate("Back", "ui.button.back") == "뒤로"
+    assert pretranslator.translate("Back", "player.slotName.back") == "등"
+    assert pretranslator.translate("Chest", "ui.misc.label") is None
+    assert pretranslator.translate("Back") is None
+
+
+def test_ambiguous_or_unknown_terms_are_not_guessed():
+    # 문맥 설명만 있는 두 뜻, 두 번역을 나열한 뜻, 용어집에 없는 UI 단어
+    assert pretranslator.translate("Spawn", "ui.button.spawn") is None
+    assert pretranslator.translate("Legs", "player.slotName.legs") is None
+    assert pretranslator.translate("Close", "ui.button.close") is None
+    assert pretranslator.translate("Settings") is None
+
+
+def test_prompt_lists_every_term():
+    prompt = glossary.render_prompt()
+    assert "**Chest (보관함/가구) → 상자**" in prompt
+    assert "Auth/Authentication → 인증" in prompt
+    assert "UI 라벨" not in prompt
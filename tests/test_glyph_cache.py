@@ -0,0 +1,125 @@
+import json
+import math
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+import glyph_cache
+import glyph_converter
+
+# 생성기처럼 함께 렌더링한 글자끼리의 쌍만 내주는 커닝 표
+KERNING = {("A", "V"): -3, ("V", "A"): -3, ("T", "o"): -2, ("가", "A"): -1, ("나", "T"): 2}
+rendered_chars = []
+# fixture가 바꾸기 전의 실제 kern/GPOS 조회 함수
+font_kerning_partners = glyph_cache.font_kerning_partners
+
+
+@pytest.fixture(autouse=True)
+def fake_font_kerning(monkeypatch):
+    """폰트의 kern/GPOS 표 대신 KERNING에서 쌍을 찾음"""
+    def partners(font_path, codes):
+        return {ord(c) for pair in KERNING for c in pair
+                if any(ord(other) in codes for other in pair if other != c)}
+    monkeypatch.setattr(glyph_cache, "font_kerning_partners", partners)
+    rendered_chars.clear()
+
+
+def render(chars, work_dir):
+    """글자마다 고유한 색으로 칠한 셀을 한 줄로 배치한 BMFont 출력을 흉내 냄"""
+    rendered_chars.append(list(chars))
+    bm_chars = []
+    x = 0
+    for c in chars:
+        width = 10 + ord(c) % 7
+        bm_chars.append({"id": ord(c), "x": x, "y": 0, "width": width, "height": 20,
+                         "xoffset": 1, "yoffset": 3, "xadvance": 16})
+        x += width + 4
+    page = Image.new("RGB", (max(x, 1), 20))
+    for ch in bm_chars:
+        page.paste(color(ch["id"]), (ch["x"], 0, ch["x"] + ch["width"], 20))
+    path = os.path.join(work_dir, "page.png")
+    page.save(path)
+    rendered = set(chars)
+    bmfont = {"info": {"size": 48}, "common": {"scaleW": 256, "scaleH": 256, "base": 38}, "chars": bm_chars,
+              "kernings": [{"first": ord(a), "second": ord(b), "amount": amount}
+                           for (a, b), amount in KERNING.items() if a in rendered and b in rendered]}
+    return {"font": glyph_converter.bmfont_to_hytale(bmfont), "pages": [path]}
+
+
+def color(code):
+    return ((code * 7) % 256, (code * 13) % 256, (code * 31) % 256)
+
+
+def build(tmp_path, chars, name, cache="cache", padding=4):
+    font = tmp_path / "font.ttf"
+    font.write_bytes(b"font")
+    output_json, output_png = tmp_path / f"{name}.json", tmp_path / f"{name}.png"
+    size = glyph_cache.build(str(font), chars, {"size": 48}, render, str(output_json), str(output_png),
+                             cache_dir=str(tmp_path / cache), padding=padding)
+    with open(output_json, 'r', encoding='utf-8') as f:
+        return size, json.load(f), output_png
+
+
+def kerning(font):
+    return {(k["unicode1"], k["unicode2"]): k["advance"] for k in font["kerning"]}
+
+
+def test_incremental_kerning_matches_full_build(tmp_path):
+    first = list("ATo가")
+    build(tmp_path, first, "first")
+    _, incremental, _ = build(tmp_path, first + list("V나"), "incremental")
+    _, full, _ = build(tmp_path, first + list("V나"), "full", cache="fresh")
+    assert kerning(incremental) == kerning(full)
+    assert len(kerning(full)) == len(KERNING)
+
+
+def test_incremental_build_renders_only_font_partners(tmp_path):
+    # 커닝 쌍이 있는 캐시 글자가 많아도 새 글자와 쌍을 이루는 글자만 다시 렌더링
+    first = list("ATo가") + [chr(code) for code in range(0xB2E4, 0xB2E4 + 50)]
+    build(tmp_path, first, "first")
+    build(tmp_path, first + ["V"], "second")
+    assert sorted(rendered_chars[-1]) == ["A", "V"]
+    build(tmp_path, first + ["V", "B"], "third")
+    assert rendered_chars[-1] == ["B"]
+    build(tmp_path, first + ["V", "B"], "fourth")
+    assert len(rendered_chars) == 3
+
+
+def test_font_kerning_partners_reads_gpos(tmp_path):
+    pytest.importorskip("fontTools.feaLib.builder")
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    names = [".notdef", "A", "V", "T", "o", "x"]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(names)
+    builder.setupCharacterMap({ord(name): name for name in names[1:]})
+    builder.setupGlyf({name: TTGlyphPen(None).glyph() for name in names})
+    builder.setupHorizontalMetrics({name: (500, 0) for name in names})
+    builder.setupHorizontalHeader()
+    builder.setupNameTable({"familyName": "Kern", "styleName": "Regular"})
+    builder.setupOS2()
+    builder.setupPost()
+    addOpenTypeFeaturesFromString(builder.font, """
+        @LEFT = [T V];
+        feature kern { pos A V -80; pos @LEFT o -40; pos x o 0; } kern;
+    """)
+    path = tmp_path / "kern.ttf"
+    builder.save(str(path))
+    assert font_kerning_partners(str(path), {ord("V")}) == {ord("A"), ord("o")}
+    assert font_kerning_partners(str(path), {ord("o")}) == {ord("T"), ord("V")}
+    assert font_kerning_partners(str(path), {ord("x")}) == set()
+
+
+def test_tiles_are_placed_with_padding(tmp_path):
+    _, font, png = build(tmp_path, list("ABCDEFG"), "atlas", padding=4)
+    boxes = sorted((math.floor(g["atlasBounds"]["left"]), math.ceil(g["atlasBounds"]["right"]), g["unicode"])
+                   for g in font["glyphs"])
+    with Image.open(png) as atlas:
+        atlas = atlas.convert("RGB")
+        for (left, right, code), (next_left, _, _) in zip(boxes, boxes[1:]):
+            assert next_left - right == 4
+            assert atlas.getpixel((left + 1, 5)) == color(code)
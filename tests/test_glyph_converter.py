@@ -0,0 +1,42 @@
+import pytest
+
+import glyph_converter
+
+
+def test_bmfont_glyph_values():
+    bmfont = {"info": {"size": 48}, "common": {"scaleW": 512, "scaleH": 512, "base": 38},
+              "chars": [{"id": 0xAC00, "x": 10, "y": 20, "width": 40, "height": 44,
+                         "xoffset": 2, "yoffset": 4, "xadvance": 45}],
+              "kernings": [{"first": 0xAC00, "second": 0xAC00, "amount": -3}]}
+    font = glyph_converter.bmfont_to_hytale(bmfont, baseline_offset=0.0, use_numpy=False)
+    glyph = font["glyphs"][0]
+    assert glyph["advance"] == 45 / 48
+    assert glyph["planeBounds"] == {"left": 2 / 48, "top": -34 / 48, "right": 42 / 48, "bottom": 10 / 48}
+    assert glyph["atlasBounds"] == {"left": 10.5, "top": 20.5, "right": 49.5, "bottom": 63.5}
+    assert font["kerning"] == [{"unicode1": 0xAC00, "unicode2": 0xAC00, "advance": -3 / 48}]
+    assert (font["atlas"]["width"], font["atlas"]["height"]) == (512, 512)
+
+
+def test_bmfont_numpy_matches_python():
+    pytest.importorskip("numpy")
+    bmfont = glyph_converter.synthetic_bmfont(2000)
+    python = glyph_converter.bmfont_to_hytale(bmfont, baseline_offset=0.05, use_numpy=False)
+    numpy = glyph_converter.bmfont_to_hytale(bmfont, baseline_offset=0.05, use_numpy=True)
+    assert numpy == python
+    assert repr(numpy) == repr(python)
+
+
+def test_msdf_atlas_flips_plane_bounds():
+    atlas = {"atlas": {"size": 48, "width": 1024, "height": 1024},
+             "glyphs": [{"unicode": 0x20, "advance": 0.25},
+                        {"unicode": 0x41, "advance": 0.6,
+                         "planeBounds": {"left": 0.0, "bottom": 0.0, "right": 0.5, "top": 0.7},
+                         "atlasBounds": {"left": 1.5, "bottom": 40.5, "right": 25.5, "top": 4.5}}]}
+    font = glyph_converter.msdf_atlas_to_hytale(atlas)
+    space, glyph = font["glyphs"]
+    assert space == {"unicode": 0x20, "advance": 0.25}
+    assert glyph["planeBounds"] == {"left": 0.0, "top": -0.7, "right": 0.5, "bottom": 0.0}
+    # -0.0이 남지 않아야 함 (압축 JSON에 "-0.0"으로 나옴)
+    assert repr(glyph["planeBounds"]["bottom"]) == "0.0"
+    assert glyph["atlasBounds"] == {"left": 1.5, "top": 4.5, "right": 25.5, "bottom": 40.5}
+    assert (font["atlas"]["width"], font["atlas"]["distanceRange"]) == (1024, 8)
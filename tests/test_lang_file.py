@@ -0,0 +1,39 @@
+import lang_file
+
+TEXT = (
+    "# header\r\n"
+    "\r\n"
+    "a = Hello\r\n"
+    "b = First \\\r\n"
+    "second line # TODO: TranslateLine\r\n"
+    "c = World # TODO: Translate\n"
+    "d=x"
+)
+
+
+def test_round_trip_keeps_bytes(tmp_path):
+    parsed = lang_file.LangFile.from_text(TEXT)
+    assert parsed.serialize() == TEXT
+    path = tmp_path / "en.lang"
+    path.write_bytes(TEXT.encode('utf-8'))
+    loaded = lang_file.LangFile.load(str(path))
+    loaded.save()
+    assert path.read_bytes() == TEXT.encode('utf-8')
+
+
+def test_index_and_values():
+    parsed = lang_file.LangFile.from_text(TEXT)
+    assert [entry.key for entry in parsed.entries] == ["a", "b", "c", "d"]
+    assert parsed.comments == [0]
+    assert parsed.todo_lines == [4, 5]
+    assert parsed.values() == {"a": "Hello", "b": "First \nsecond line", "c": "World", "d": "x"}
+    assert parsed.index["b"].multiline
+    assert parsed.index["c"].todo and not parsed.index["b"].todo
+    assert parsed.block("b") == ["b = First \\\r\n", "second line # TODO: TranslateLine\r\n"]
+
+
+def test_normalize_newline():
+    assert lang_file.normalize_newline("a\r\n") == "a\n"
+    assert lang_file.normalize_newline("a\r") == "a\n"
+    assert lang_file.normalize_newline("a\n") == "a\n"
+    assert lang_file.normalize_newline("a") == "a"
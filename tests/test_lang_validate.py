@@ -0,0 +1,31 @@
+import lang_validate
+
+
+def test_placeholders_must_match():
+    assert lang_validate.is_valid("Hello {name}, <b>{0}</b>", "<b>{0}</b>, {name}님 안녕하세요")
+    missing, extra = lang_validate.compare("{count} items", "아이템 {amount}개")
+    assert missing == ["{count}"]
+    assert extra == ["{amount}"]
+
+
+def test_icu_branches():
+    source = "{count, plural, one {# item} other {# items}}"
+    assert lang_validate.is_valid(source, "{count, plural, one {아이템 #개} other {아이템 #개}}")
+    assert not lang_validate.is_valid(source, "{count, plural, other {아이템 #개}}")
+
+
+def test_unbalanced_icu_ignores_position():
+    # 여러 줄 ICU 값의 이어지는 줄은 짝이 맞지 않지만, 위치가 달라도 같은 구조면 통과해야 함
+    assert lang_validate.is_valid("You gained {count, plural, one {# item}", "{count, plural, one {아이템 #개}")
+    assert lang_validate.is_valid("other {# items}}", "other {아이템 #개}}")
+    assert not lang_validate.is_valid("other {# items}}", "other {아이템 #개}")
+
+
+def test_icu_error_kind():
+    try:
+        lang_validate.signature("abc {x")
+    except lang_validate.IcuError:
+        raise AssertionError("signature must not raise")
+    error = lang_validate.IcuError("unbalanced '{'", 4)
+    assert error.kind == "unbalanced '{'"
+    assert str(error) == "unbalanced '{' at 4"
@@ -0,0 +1,51 @@
+import os
+
+import merge_lang
+
+BASE = "# header\na = Open\nb = Close\n"
+
+
+def setup(tmp_path, patch="a = 열기\n"):
+    (tmp_path / "en.lang").write_text(BASE, encoding='utf-8')
+    (tmp_path / "ko.lang").write_text(patch, encoding='utf-8')
+    return [(str(tmp_path / "en.lang"), str(tmp_path / "ko.lang"), str(tmp_path / "out" / "ko.lang"))]
+
+
+def cache_files(tmp_path):
+    return sorted(os.listdir(tmp_path / "cache"))
+
+
+def test_cache_hit_and_unchanged_output(tmp_path, monkeypatch):
+    pairs = setup(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    first = merge_lang.merge_pairs(pairs, cache_dir=cache_dir)[0]
+    assert (first["cached"], first["written"], first["replaced"], first["total"]) == (False, True, 1, 2)
+    output = tmp_path / "out" / "ko.lang"
+    assert output.read_text(encoding='utf-8') == "# header\na = 열기\nb = Close\n"
+    os.utime(output, ns=(1_000_000_000, 1_000_000_000))
+
+    def no_render(*args):
+        raise AssertionError("캐시에서 읽어야 함")
+
+    monkeypatch.setattr(merge_lang, "render", no_render)
+    second = merge_lang.merge_pairs(pairs, cache_dir=cache_dir)[0]
+    assert (second["cached"], second["written"], second["replaced"]) == (True, False, 1)
+    # 같은 내용이면 설치된 파일을 다시 쓰지 않아 mtime이 그대로
+    assert os.stat(output).st_mtime_ns == 1_000_000_000
+
+
+def test_unused_cache_entries_are_pruned(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = merge_lang.merge_pairs(setup(tmp_path), cache_dir=cache_dir)[0]
+    assert cache_files(tmp_path) == [first["cache_key"] + ".json", first["cache_key"] + ".lang"]
+    # 번역 파일이 바뀌면 새 결과만 남음
+    second = merge_lang.merge_pairs(setup(tmp_path, "a = 열기\nb = 닫기\n"), cache_dir=cache_dir)[0]
+    assert second["cache_key"] != first["cache_key"]
+    assert cache_files(tmp_path) == [second["cache_key"] + ".json", second["cache_key"] + ".lang"]
+    assert (tmp_path / "out" / "ko.lang").read_text(encoding='utf-8') == "# header\na = 열기\nb = 닫기\n"
+
+
+def test_no_cache(tmp_path):
+    result = merge_lang.merge_pairs(setup(tmp_path), cache_dir="")[0]
+    assert "cache_key" not in result and not result["cached"]
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,154 @@
+import re
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+import translate_gemini
+import translation_backends
+import translation_journal
+import translation_stub
+from translation_memory import TranslationMemory
+
+ITEM_RE = re.compile(r'^\[(\d+)\] (.*)$', re.M)
+
+
+class Interrupted(BaseException):
+    """Ctrl+C처럼 엔진이 잡지 않고 실행을 멈추는 중단"""
+
+
+class ScriptedBackend:
+    """프롬프트의 `[index] text` 줄마다 reply(index, text)가 돌려준 줄들을 스트리밍"""
+    name = "scripted"
+    supports_cache = False
+
+    def __init__(self, reply=None):
+        self.reply = reply or (lambda index, text: [f"[{index}] 번역 {text}"])
+        self.requests = []
+
+    def stream(self, prompt, cached_content=None):
+        items = ITEM_RE.findall(prompt.split("[작업 대상]")[-1])
+        self.requests.append([text for _, text in items])
+        for index, text in items:
+            for line in self.reply(index, text):
+                yield line + "\n"
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(translate_gemini, "USE_TRANSLATION_MEMORY", True)
+    monkeypatch.setattr(translate_gemini, "REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(translate_gemini, "MAX_CONCURRENCY", 1)
+    monkeypatch.setenv("TRANSLATION_MEMORY_PATH", str(tmp_path / "tm.sqlite"))
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def remembered(tmp_path, texts):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite"), translate_gemini.PROMPT_VERSION,
+                               translate_gemini.MODEL_ID)
+    try:
+        return memory.lookup(texts)
+    finally:
+        memory.close()
+
+
+def test_memory_stores_the_applied_translation(tmp_path):
+    # 같은 번호가 두 번 오면 파일에는 처음 받은 번역이 들어가므로 메모리도 같아야 함
+    backend = ScriptedBackend(lambda index, text: [f"[{index}] 첫 번역", f"[{index}] 두 번째 번역"])
+    path = write(tmp_path, "a.lang", "a.title = Open the door # TODO: Translate\n")
+    translate_gemini.process_translations([path], None, backend=backend)
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == "a.title = 첫 번역\n"
+    assert remembered(tmp_path, {"a": "Open the door"}) == {"a": "첫 번역"}
+
+
+def test_memory_hit_skips_the_request(tmp_path):
+    backend = ScriptedBackend()
+    translate_gemini.process_translations([write(tmp_path, "a.lang", "a = Open the door # TODO: Translate\n")],
+                                          None, backend=backend)
+    path = write(tmp_path, "b.lang", "b = Open  the door # TODO: Translate\nc = Close # TODO: Translate\n")
+    translate_gemini.process_translations([path], None, backend=backend)
+    assert backend.requests == [["Open the door"], ["Close"]]
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == "b = 번역 Open the door\nc = 번역 Close\n"
+
+
+def test_prompt_change_invalidates_memory(tmp_path, monkeypatch):
+    backend = ScriptedBackend()
+    translate_gemini.process_translations([write(tmp_path, "a.lang", "a = Open the door # TODO: Translate\n")],
+                                          None, backend=backend)
+    monkeypatch.setattr(translate_gemini, "PROMPT_VERSION", "changed")
+    translate_gemini.process_translations([write(tmp_path, "b.lang", "b = Open the door # TODO: Translate\n")],
+                                          None, backend=backend)
+    assert backend.requests == [["Open the door"], ["Open the door"]]
+
+
+PENDING = (
+    "# items\n"
+    "a = Open the door # TODO: Translate\n"
+    "b = First line \\ # TODO: Translate\n"
+    "second line # TODO: TranslateLine\n"
+    "c = Close the door # TODO: Translate\n"
+    "d = Light the torch # TODO: Translate\n"
+)
+
+
+def test_resume_after_interrupt_matches_uninterrupted_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(translate_gemini, "USE_TRANSLATION_MEMORY", False)
+    monkeypatch.setattr(translation_journal, "FLUSH_INTERVAL", 0)
+    full = write(tmp_path, "full.lang", PENDING)
+    translate_gemini.process_translations([full], None, backend=ScriptedBackend())
+
+    def interrupt_after_two(index, text):
+        if int(index) >= 2:
+            raise Interrupted()
+        return [f"[{index}] 번역 {text}"]
+
+    path = write(tmp_path, "a.lang", PENDING)
+    with pytest.raises(Interrupted):
+        translate_gemini.process_translations([path], None, backend=ScriptedBackend(interrupt_after_two))
+    assert len(translation_journal.load_journal(path, translate_gemini.collect_pending(
+        PENDING.splitlines(True))[0])) == 2
+    with open(path, encoding='utf-8') as f:
+        assert "a = 번역 Open the door\n" in f.read()
+
+    backend = ScriptedBackend()
+    translate_gemini.process_translations([path], None, resume=True, backend=backend)
+    assert backend.requests == [["second line", "Close the door", "Light the torch"]]
+    with open(path, encoding='utf-8') as f, open(full, encoding='utf-8') as g:
+        assert f.read() == g.read()
+    assert not (tmp_path / "a.lang.journal").exists()
+
+
+def test_identical_strings_across_files_are_translated_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(translate_gemini, "USE_TRANSLATION_MEMORY", False)
+    config = translation_stub.StubConfig(latency=0, jitter=0)
+    server, url = translation_stub.start_server(config)
+    a = write(tmp_path, "a.lang", (
+        "x = Open the door # TODO: Translate\n"
+        "m = First line \\\\ # TODO: Translate\n"
+        "second line # TODO: TranslateLine\n"
+    ))
+    b = write(tmp_path, "b.lang", (
+        "y = Open  the door # TODO: Translate\n"
+        "n = First line \\\\ # TODO: Translate\n"
+        "  second line # TODO: TranslateLine\n"
+        "z = Open the door # TODO: Translate\n"
+    ))
+    try:
+        batcher = translate_gemini.process_translations(
+            [a, b], None, backend=translation_backends.StubBackend(url))
+    finally:
+        server.shutdown()
+    assert config.requests == 1
+    assert sum(stat["size"] for stat in batcher.stats) == 3
+    with open(a, encoding='utf-8') as f:
+        assert f.read() == "x = 번역 Open the door\nm = 번역 First line\\\n번역 second line\n"
+    with open(b, encoding='utf-8') as f:
+        assert f.read() == ("y = 번역 Open the door\nn = 번역 First line\\\n  번역 second line\n"
+                            "z = 번역 Open the door\n")
@@ -0,0 +1,77 @@
+import batch_planner
+import translation_engine
+
+
+def make_batcher(count=20, budget=1000, max_items=0, **kwargs):
+    # 한 줄에 string number N (약 8토큰)이므로 1000토큰 예산이면 한 배치에 모두 들어감
+    to_translate = {i: f"string number {i}" for i in range(count)}
+    updates = {i: {"type": "key"} for i in range(count)}
+    plan = batch_planner.plan_batches(to_translate, updates, budget, max_items)
+    return translation_engine.AdaptiveBatcher(plan, updates, **kwargs)
+
+
+def test_clean_run_follows_plan():
+    batcher = make_batcher(max_items=6)
+    sent = []
+
+    def translate(batch):
+        sent.append(list(batch))
+        return {idx: f"번역 {idx}" for idx in batch}
+
+    merged = translation_engine.translate_adaptive(batcher, translate, max_concurrency=1, per_minute=0)
+    assert len(merged) == 20
+    assert sent == [list(batch) for batch in batcher.plan.batches]
+    assert batcher.splits == 0
+    assert batcher.budget == 1000
+    assert not batcher.failed
+
+
+def test_shrunk_budget_splits_planned_batches():
+    batcher = make_batcher(count=60, budget=300, min_budget=100, max_attempts=2)
+    assert len(batcher.plan.batches) == 2
+    sizes = []
+
+    def translate(batch):
+        sizes.append(len(batch))
+        if len(sizes) == 1:
+            raise ConnectionError("reset")
+        return {idx: "번역" for idx in batch}
+
+    merged = translation_engine.translate_adaptive(batcher, translate, max_concurrency=1, per_minute=0)
+    assert len(merged) == 60
+    # 첫 배치 실패 후 예산이 절반이 되어 두 번째 계획 배치는 나뉘어 나감
+    assert sizes[0] == len(batcher.plan.batches[0])
+    assert sizes[1] < len(batcher.plan.batches[1])
+    assert batcher.splits > 0
+
+
+def test_errors_shrink_budget_and_keep_partial_results():
+    batcher = make_batcher(max_attempts=2)
+    calls = []
+
+    def translate(batch):
+        calls.append(dict(batch))
+        if len(calls) == 1:
+            first = next(iter(batch))
+            raise translation_engine.BatchError("429 Resource exhausted", {first: "번역"})
+        return {idx: "번역" for idx in batch}
+
+    merged = translation_engine.translate_adaptive(batcher, translate, max_concurrency=1, per_minute=0)
+    assert len(merged) == 20
+    assert batcher.stats[0]["error"] == "429 Resource exhausted"
+    assert batcher.stats[0]["returned"] == 1
+    assert batcher.stats[1]["budget"] == 500
+    # 받은 번역은 다시 요청하지 않음
+    assert sum(len(batch) for batch in calls) == 20 + 19
+
+
+def test_other_exceptions_count_as_errors():
+    batcher = make_batcher(max_attempts=1)
+
+    def translate(batch):
+        raise ConnectionError("reset")
+
+    merged = translation_engine.translate_adaptive(batcher, translate, max_concurrency=1, per_minute=0)
+    assert merged == {}
+    assert len(batcher.failed) == 20
+    assert batcher.stats[0]["error"] == "reset"
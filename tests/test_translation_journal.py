@@ -0,0 +1,60 @@
+import translation_journal
+from translation_journal import TranslationJournal
+
+
+def apply(lines, updates, translated):
+    for idx, text in translated.items():
+        lines[int(idx)] = f"{updates[idx]} = {text}\n"
+
+
+def make_journal(tmp_path, resume=False):
+    path = tmp_path / "a.lang"
+    if not path.exists():
+        path.write_text("a = A\nb = B\n", encoding='utf-8')
+    with open(path, encoding='utf-8') as f:
+        lines = f.readlines()
+    to_translate = {"0": "A", "1": "B"}
+    return str(path), TranslationJournal(str(path), lines, {"0": "a", "1": "b"}, to_translate, apply, resume=resume)
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_flush_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_journal, "FLUSH_INTERVAL", 3600)
+    path, journal = make_journal(tmp_path)
+    journal.record("0", "에이")
+    # 저널에는 바로 남고, 파일은 간격이 지나거나 닫을 때 갱신
+    assert read(path) == "a = A\nb = B\n"
+    assert translation_journal.load_journal(path, {"0": "A", "1": "B"}) == {"0": "에이"}
+    monkeypatch.setattr(translation_journal, "FLUSH_INTERVAL", 0)
+    journal.record("1", "비")
+    assert read(path) == "a = 에이\nb = 비\n"
+    journal.close()
+    assert not (tmp_path / "a.lang.journal").exists()
+
+
+def test_resume_reapplies_matching_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_journal, "FLUSH_INTERVAL", 3600)
+    path, journal = make_journal(tmp_path)
+    journal.record("0", "에이")
+    journal.record("0", "다른 번역")
+    journal._journal.close()
+    # 끝이 잘린 줄과 원문이 바뀐 항목은 무시
+    with open(path + ".journal", 'a', encoding='utf-8') as f:
+        f.write('{"line": "1", "source": "Old B", "text": "옛 비"}\n{"line": "1", "sou')
+    _, resumed = make_journal(tmp_path, resume=True)
+    assert resumed.applied == {"0": "에이"}
+    resumed.close()
+    assert read(path) == "a = 에이\nb = B\n"
+
+
+def test_without_resume_journal_is_discarded(tmp_path):
+    path, journal = make_journal(tmp_path)
+    journal.record("0", "에이")
+    journal._journal.close()
+    _, fresh = make_journal(tmp_path)
+    assert fresh.applied == {}
+    fresh.close()
@@ -0,0 +1,21 @@
+from translation_memory import TranslationMemory
+
+
+def test_hit_and_miss(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite"), prompt_version="p1", model_id="m1")
+    memory.store([("Open  the door ", "문을 여세요")])
+    # 공백만 다른 원문도 같은 문장으로 찾음
+    assert memory.lookup({"a": "Open the door", "b": "  Open the\tdoor", "c": "Close the door"}) == {
+        "a": "문을 여세요", "b": "문을 여세요"}
+    memory.close()
+
+
+def test_prompt_version_and_model_invalidate(tmp_path):
+    path = str(tmp_path / "tm.sqlite")
+    memory = TranslationMemory(path, prompt_version="p1", model_id="m1")
+    memory.store([("Open the door", "문을 여세요")])
+    memory.close()
+    for prompt_version, model_id, expected in (("p1", "m1", 1), ("p2", "m1", 0), ("p1", "m2", 0)):
+        memory = TranslationMemory(path, prompt_version=prompt_version, model_id=model_id)
+        assert len(memory.lookup({"a": "Open the door"})) == expected
+        memory.close()
@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("dotenv")
+
+import lang_file
+import update_lang
+
+
+def sync(tmp_path, en_text, ko_text=None, previous=None):
+    target = tmp_path / "ko.lang"
+    if ko_text is not None:
+        target.write_bytes(ko_text.encode('utf-8'))
+    en = lang_file.LangFile.from_text(en_text)
+    keys, added, changed = update_lang.sync_target(en, str(target), previous or {})
+    return target.read_bytes().decode('utf-8'), keys, added, changed
+
+
+def test_crlf_source_is_written_with_one_line_ending(tmp_path):
+    en = "# header\r\n\r\na = Hello\r\nb = World\r\nc = One \\\r\nTwo\r\n"
+    ko = "# header\r\n\r\na = 안녕\r\n"
+    text, _, added, _ = sync(tmp_path, en, ko)
+    assert "\r" not in text
+    assert text == ("# header\n\na = 안녕\nb = World # TODO: Translate\n"
+                    "c = One \\ # TODO: Translate\nTwo # TODO: TranslateLine\n")
+    assert added == 2
+
+
+def test_changed_source_is_marked_todo_again(tmp_path):
+    en_v1 = "a = Open\nb = Close\n"
+    _, keys, _, _ = sync(tmp_path, en_v1, "a = 열기\nb = 닫기\n")
+    text, _, added, changed = sync(tmp_path, "a = Open the door\nb = Close\n", previous={"keys": keys})
+    assert text == "a = Open the door # TODO: Translate\nb = 닫기\n"
+    assert (added, changed) == (0, 1)
+
+
+def test_first_run_without_manifest_keeps_existing_translations(tmp_path):
+    text, keys, added, changed = sync(tmp_path, "a = Open\nb = Close\n", "a = 열기\n")
+    assert text == "a = 열기\nb = Close # TODO: Translate\n"
+    assert (added, changed) == (1, 0)
+    assert set(keys) == {"a", "b"}
+
+
+def test_unchanged_source_is_skipped(tmp_path, monkeypatch):
+    source_dir = tmp_path / "en-US"
+    source_dir.mkdir()
+    (source_dir / "client.lang").write_text("a = Open\n", encoding='utf-8')
+    monkeypatch.setattr(update_lang, "OUTPUT_DIR", str(tmp_path / "ko-KR"))
+    monkeypatch.setattr(update_lang, "LANG_FILES", ["client.lang"])
+    monkeypatch.setenv("HYTALE_ASSETS_ZIP", str(tmp_path / "missing.zip"))
+
+    # manifest가 없으면 동기화, 같은 원본이면 건너뜀, 원본이 바뀌면 다시 동기화
+    jobs, skipped = update_lang.collect_jobs(str(source_dir), {})
+    assert [job[0] for job in jobs] == ["client.lang"] and skipped == []
+    name, entry, *_ = update_lang.run_jobs(jobs, workers=1)[0]
+    manifest = {name: entry}
+    assert entry["keys"].keys() == {"a"}
+    jobs, skipped = update_lang.collect_jobs(str(source_dir), manifest)
+    assert jobs == [] and skipped == ["client.lang"]
+    (source_dir / "client.lang").write_text("a = Open the door\n", encoding='utf-8')
+    jobs, skipped = update_lang.collect_jobs(str(source_dir), manifest)
+    assert [job[0] for job in jobs] == ["client.lang"]
+    assert update_lang.run_jobs(jobs, workers=1)[0][3] == 1
+
+
+def test_manifest_round_trip(tmp_path):
+    path = str(tmp_path / "cache" / "manifest.json")
+    assert update_lang.load_manifest(path) == {}
+    update_lang.save_manifest({"client.lang": {"hash": "x", "keys": {"a": "y"}}}, path)
+    assert update_lang.load_manifest(path) == {"client.lang": {"hash": "x", "keys": {"a": "y"}}}
@@ -69,6 +69,12 @@ if ($exePath -and (Test-Path $exePath)) {
         Write-Host "   - 게임 업데이트를 통해 원본으로 복원할 수 있습니다" -ForegroundColor Yellow
     }
 
+    # 바이너리 패치 상태 기록 제거
+    $patchState = "$exePath.patch_state.json"
+    if (Test-Path $patchState) {
+        Remove-Item -Path $patchState -Force
+    }
+
     # 이전 버전 DLL 제거 (호환성)
     $clientDir = Split-Path $exePath -Parent
     $versionDll = Join-Path $clientDir "version.dll"
@@ -71,6 +71,16 @@ else
     echo "   ⚠️ 복원할 기존 언어 폴더 백업(${LANG_DIR}_backup)이 없습니다."
 fi
 
+# 3. 바이너리 패치 상태 기록 제거
+CURRENT_PATH="$GAME_DIR"
+for i in {1..5}; do
+    if [ -f "$CURRENT_PATH/HytaleClient" ]; then
+        rm -f "$CURRENT_PATH/HytaleClient.patch_state.json"
+        break
+    fi
+    CURRENT_PATH="$(dirname "$CURRENT_PATH")"
+done
+
 echo ""
 echo "=== 제거 완료! ==="
 echo "Hytale이 초기 상태로 복구되었습니다."
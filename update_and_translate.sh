@@ -26,8 +26,12 @@ fi
 
 echo "🔍 로컬에 설치된 Hytale 데이터를 확인하고 비교하는 중..."
 python3 scripts/update_lang.py
+STATUS=$?
 
-if [ $? -eq 0 ]; then
+if [ $STATUS -eq 2 ]; then
+    echo "❌ 폰트에 없는 글자가 번역문에 있습니다. 위 목록을 확인하고 폰트를 다시 빌드해 주세요."
+    exit 2
+elif [ $STATUS -eq 0 ]; then
     echo "✅ 최신 파일 비교 및 병합 완료!"
     
     DIFF_COUNT=$(git status --porcelain Language/ko-KR | wc -l)